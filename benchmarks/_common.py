@@ -0,0 +1,26 @@
+"""Shared helpers for the micro-benchmarks.
+
+The benchmarks import `shome_client` as a top-level package so that the pure
+client modules can be measured without a Home Assistant install.
+"""
+import os
+import sys
+import timeit
+
+INTEGRATION_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                               "custom_components", "shome_ha_integration")
+if INTEGRATION_DIR not in sys.path:
+    sys.path.insert(0, INTEGRATION_DIR)
+
+
+def bench(label: str, func, number: int = 100_000, repeat: int = 5) -> float:
+    """Run `func` and print the best per-call time in microseconds."""
+    best = min(timeit.repeat(func, number=number, repeat=repeat)) / number * 1_000_000
+    print(f"{label:<48} {best:8.3f} us/call")
+    return best
+
+
+def compare(label: str, before, after, **kwargs):
+    before_us = bench(f"{label} (before)", before, **kwargs)
+    after_us = bench(f"{label} (after)", after, **kwargs)
+    print(f"{'':<48} {before_us / after_us:8.1f}x faster\n")
@@ -0,0 +1,139 @@
+"""Connection setups per refresh: HA's shared session vs. the integration's own pool.
+
+Runs refresh rounds (every device of the mock wallpad fetched concurrently, as the
+coordinators do) against `MockSHomeServer` and counts new and reused connections through
+aiohttp tracing. Like the load test this needs Home Assistant installed:
+
+    python benchmarks/bench_connection_reuse.py --rounds 10
+
+Time is scaled down 100x so the run takes seconds: the 15 s idle timeout of HA's shared
+connector becomes 0.15 s, the 60 s keep-alive of the SHome pool 0.6 s and the 30 s poll
+interval between rounds 0.3 s. The mock server speaks plain HTTP, so the saved TLS
+handshakes (the larger part of a connection setup against the real cloud) are not timed.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+import aiohttp
+
+from mock_shome_server import MockSHomeServer, add_config_arguments, config_from_args
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from homeassistant.core import HomeAssistant  # noqa: E402
+
+from custom_components.shome_ha_integration.const import DEFAULT_MAX_CONCURRENT_REQUESTS  # noqa: E402
+from custom_components.shome_ha_integration.shome_client.const import KEEPALIVE_TIMEOUT_SECONDS  # noqa: E402
+from custom_components.shome_ha_integration.shome_client.session import create_session  # noqa: E402
+from custom_components.shome_ha_integration.shome_client.shome_client import SHomeClient  # noqa: E402
+from custom_components.shome_ha_integration.shome_client.utils.device_type import get_device_type  # noqa: E402
+
+CREDENTIAL = {"username": "bench", "password": "bench", "device_id": "bench-device"}
+TIME_SCALE = 0.01
+# aiohttp's default idle timeout, which HA's shared connector keeps
+SHARED_KEEPALIVE_SECONDS = 15.0
+POLL_INTERVAL_SECONDS = 30.0
+# five coordinators, each with DEFAULT_MAX_CONCURRENT_REQUESTS in flight
+FAN_OUT = 5 * DEFAULT_MAX_CONCURRENT_REQUESTS
+
+FETCHERS = {
+    "light": "get_light_info",
+    "environment-sensor": "get_sensor_info",
+    "ventilator": "get_ventilation_info",
+    "aircon": "get_aircon_info",
+    "heater": "get_heater_info",
+}
+
+
+class ConnectionCounter:
+
+    def __init__(self):
+        self.created = 0
+        self.reused = 0
+        self.trace_config = aiohttp.TraceConfig()
+        self.trace_config.on_connection_create_end.append(self._on_create)
+        self.trace_config.on_connection_reuseconn.append(self._on_reuse)
+
+    async def _on_create(self, session, context, params):
+        self.created += 1
+
+    async def _on_reuse(self, session, context, params):
+        self.reused += 1
+
+
+def shared_session(counter: ConnectionCounter) -> aiohttp.ClientSession:
+    # what async_get_clientsession(hass) hands out: one connector for every integration
+    connector = aiohttp.TCPConnector(
+        limit=4096, limit_per_host=100, enable_cleanup_closed=True,
+        keepalive_timeout=SHARED_KEEPALIVE_SECONDS * TIME_SCALE,
+    )
+    return aiohttp.ClientSession(connector=connector, trace_configs=[counter.trace_config])
+
+
+def shome_session(counter: ConnectionCounter) -> aiohttp.ClientSession:
+    return create_session(keepalive_timeout=KEEPALIVE_TIMEOUT_SECONDS * TIME_SCALE,
+                          trace_configs=[counter.trace_config])
+
+
+async def refresh(client: SHomeClient, devices: list) -> None:
+    semaphore = asyncio.Semaphore(FAN_OUT)
+
+    async def fetch(device, method: str):
+        async with semaphore:
+            await getattr(client, method)(device.id)
+
+    await asyncio.gather(*(fetch(device, method) for device, method in devices))
+
+
+async def run(label: str, make_session, base_url: str, rounds: int):
+    counter = ConnectionCounter()
+    session = make_session(counter)
+    client = SHomeClient(HomeAssistant(), base_url=base_url, session=session)
+    client.set_credential(CREDENTIAL)
+    await client.login()
+    home_info = await client.get_devices()
+    devices = [(device, FETCHERS[device_type[1]]) for device in home_info.devices
+               if (device_type := get_device_type(device)) is not None and device_type[1] in FETCHERS]
+
+    created_per_round = []
+    latencies = []
+    for _ in range(rounds):
+        await asyncio.sleep(POLL_INTERVAL_SECONDS * TIME_SCALE)
+        created_before = counter.created
+        started = time.perf_counter()
+        await refresh(client, devices)
+        latencies.append((time.perf_counter() - started) * 1000)
+        created_per_round.append(counter.created - created_before)
+
+    print(f"{label:<28} {len(devices)} requests/refresh, "
+          f"new connections/refresh {statistics.mean(created_per_round):5.1f}, "
+          f"reused {counter.reused:5d}, refresh {statistics.mean(latencies):7.1f} ms")
+    await client.close()
+    await session.close()
+
+
+async def main_async(args: argparse.Namespace):
+    server = MockSHomeServer(config_from_args(args))
+    base_url = await server.start()
+    try:
+        await run("HA shared session", shared_session, base_url, args.rounds)
+        await run("SHome connection pool", shome_session, base_url, args.rounds)
+    finally:
+        await server.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=10)
+    add_config_arguments(parser)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""Response decoding: stdlib JSON + eager DTOs vs. orjson + lazy DTOs / one-pass state records.
+
+Uses large synthetic `deviceList` and `deviceInfoList` payloads.
+Run with `python benchmarks/bench_decoding.py`.
+"""
+import json
+from dataclasses import dataclass
+from datetime import datetime
+
+from _common import compare
+
+from coordinators.payload_records import climate_records, light_records
+from coordinators.state_store import ClimateState, LightGroup, LightState, records_by_id, sub_device_id
+from shome_client.dto.heater import SHomeHeaterInfo
+from shome_client.dto.home_info import SHomeInfo
+from shome_client.dto.light import SHomeLightInfo
+from shome_client.dto.pagination import Pagination
+from shome_client.json_decoder import json_loads
+
+DEVICES = 1000
+LIGHTS = 400
+ROOMS = 40
+HEATER_ZONES = 200
+
+
+@dataclass(frozen=True)
+class LegacySHomeDevice:
+    # SHomeDevice as it was before its rarely read fields were decoded lazily
+    id: str
+    root_id: str
+    model_id: str
+    model_name: str
+    model_type_name: str
+    model_type_id: str
+    unique_num: str
+    bad_edge_status: bool
+    status: bool
+    nick_name: str
+    battery: int
+    zigbee_signal_strength: int
+    auto_re_lock: bool
+    dummy_mode: bool
+    created_at: datetime
+    device_total_count: int
+
+    @staticmethod
+    def from_dict(data: dict) -> 'LegacySHomeDevice':
+        return LegacySHomeDevice(
+            id=data.get("thngId", ""),
+            root_id=data.get("rootThngId", ""),
+            model_id=data.get("thngModelId", ""),
+            model_name=data.get("thngModelName", ""),
+            model_type_id=data.get("thngModelTypeId", ""),
+            model_type_name=data.get("thngModelTypeName", ""),
+            unique_num=data.get("uniqueNum", ""),
+            bad_edge_status=data.get("badEdgeStatus", False),
+            status=data.get("status", False),
+            nick_name=data.get("nickname", ""),
+            battery=data.get("battery", 0),
+            zigbee_signal_strength=data.get("zigStrength", 0),
+            auto_re_lock=data.get("autoReLock", False),
+            dummy_mode=data.get("dummyMode", False),
+            created_at=datetime.fromisoformat(data.get("createdAt", "1970-01-01T00:00:00Z").replace('Z', '+00:00')),
+            device_total_count=data.get("deviceTotalCount", 0)
+        )
+
+
+def device_list_body() -> bytes:
+    return json.dumps({
+        "pagination": {"offset": 0, "limit": DEVICES, "total": DEVICES},
+        "deviceList": [{
+            "thngId": f"TH{n:014d}", "rootThngId": "WP00000000000001", "thngModelId": "TM00000069",
+            "thngModelName": "light", "thngModelTypeId": "TD00000069", "thngModelTypeName": "light",
+            "uniqueNum": f"UN{n:014d}", "badEdgeStatus": False, "status": True, "nickname": f"Device {n}",
+            "battery": 100, "zigStrength": -60, "autoReLock": False, "dummyMode": False,
+            "createdAt": "2024-01-01T12:34:56Z", "deviceTotalCount": DEVICES,
+        } for n in range(DEVICES)],
+    }).encode()
+
+
+def light_info_body() -> bytes:
+    return json.dumps({
+        "groupInfo": [{"groupId": room + 1, "nickname": f"Room {room + 1}", "groupStatus": 1,
+                       "deviceList": list(range(room + 1, LIGHTS + 1, ROOMS))} for room in range(ROOMS)],
+        "deviceInfoList": [{"deviceId": n, "nickname": f"Light {n}", "deviceStatus": n % 2}
+                           for n in range(1, LIGHTS + 1)],
+    }).encode()
+
+
+def heater_info_body() -> bytes:
+    return json.dumps({
+        "deviceInfoList": [{"deviceId": n, "nickname": f"Zone {n}", "deviceStatus": 1, "currentTemp": 22,
+                            "setTemp": 24, "windSpeedMode": 0, "operationMode": 0}
+                           for n in range(1, HEATER_ZONES + 1)],
+    }).encode()
+
+
+def legacy_device_list(body: bytes):
+    data = json.loads(body)
+    return Pagination.from_dict(data["pagination"]), [LegacySHomeDevice.from_dict(d) for d in data.get("deviceList", [])]
+
+
+def legacy_light_records(body: bytes):
+    # stdlib decode, SHomeLightInfo DTOs, then LightsCoordinator._init_data over the DTOs
+    light_info = SHomeLightInfo.from_dict(json.loads(body))
+    lights = records_by_id(LightState(sub_id=sub_device_id(light.id), name=light.nick_name, on=light.on)
+                           for light in light_info.devices)
+    groups = {str(group.group_id): LightGroup(group_id=str(group.group_id), name=group.nick_name,
+                                              members=tuple(sub_device_id(light_id) for light_id in group.devices))
+              for group in light_info.groups}
+    return lights, groups
+
+
+def legacy_climate_records(body: bytes):
+    return records_by_id(
+        ClimateState(sub_id=sub_device_id(zone.sub_device_num), name=zone.sub_device_name, on=zone.on,
+                     current_temperature=zone.current_temp, target_temperature=zone.set_temp)
+        for zone in SHomeHeaterInfo.from_dict(json.loads(body))
+    )
+
+
+def main():
+    print(f"JSON decoder: {json_loads.__module__}\n")
+
+    devices = device_list_body()
+    compare(f"deviceList ({DEVICES} devices, {len(devices) // 1024} KiB)",
+            lambda: legacy_device_list(devices),
+            lambda: SHomeInfo.from_dict(json_loads(devices)),
+            number=100)
+
+    lights = light_info_body()
+    assert legacy_light_records(lights) == light_records(json_loads(lights))
+    compare(f"light deviceInfoList ({LIGHTS} lights, {ROOMS} rooms) -> records",
+            lambda: legacy_light_records(lights),
+            lambda: light_records(json_loads(lights)),
+            number=200)
+
+    heaters = heater_info_body()
+    assert legacy_climate_records(heaters) == climate_records(json_loads(heaters))
+    compare(f"heater deviceInfoList ({HEATER_ZONES} zones) -> records",
+            lambda: legacy_climate_records(heaters),
+            lambda: climate_records(json_loads(heaters)),
+            number=200)
+
+
+if __name__ == "__main__":
+    main()
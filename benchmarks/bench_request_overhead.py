@@ -0,0 +1,127 @@
+"""Per-request overhead of header and URL building in `_device_request`.
+
+Run with `python benchmarks/bench_request_overhead.py`.
+"""
+from typing import Tuple
+
+from _common import compare
+
+from shome_client.dto.cookie import Cookie
+from shome_client.dto.login import Login
+from shome_client.metrics import RequestMetrics
+from shome_client.shome_header_maker import SHomeHeaderMaker
+from shome_client.shome_url_maker import SHomeUrlMaker
+
+
+def legacy_device_header(header_maker: SHomeHeaderMaker, cookie: Cookie, login: Login) -> dict:
+    # header building as it was before the header set was cached per login
+    default_headers = header_maker._build_default_headers()
+    default_headers["Authorization"] = f"Bearer {login.access_token}"
+    default_headers["Cookie"] = f"JSESSIONID={cookie.JSESSIONID}; WMONID={cookie.WMONID}"
+    return default_headers
+
+
+class LegacyUrlMaker:
+    """`SHomeClient._get_url` as it was before the route table, copied verbatim."""
+
+    def __init__(self, login: Login):
+        self._login = login
+
+    def _get_url(self, url_type: str, **kwargs) -> Tuple[str, str]:
+        if url_type == "check_app_version":
+            return "https://shome-api.samsung-ihp.com/v18/users/checkAppVersion", "GET"
+        elif url_type == "login":
+            return "https://shome-api.samsung-ihp.com/v18/users/login", "PUT"
+        elif url_type == "list_device":
+            return f"https://shome-api.samsung-ihp.com/v16/settings/{self._login.wallpad_id}/devices/", "GET"
+        elif url_type == "get_light_info":
+            device_id = kwargs.get("device_id")
+            return f"https://shome-api.samsung-ihp.com/v18/settings/light/{device_id}", "GET"
+        elif url_type == "toggle_all_light":
+            device_id = kwargs.get("device_id")
+            return f"https://shome-api.samsung-ihp.com/v18/settings/light/{device_id}/0/on-off", "PUT"
+        elif url_type == "toggle_single_light":
+            device_id = kwargs.get("device_id")
+            light_id = kwargs.get("light_id")
+            return f"https://shome-api.samsung-ihp.com/v18/settings/light/{device_id}/{light_id}/on-off", "PUT"
+        elif url_type == "toggle_room_light":
+            device_id = kwargs.get("device_id")
+            room_id = kwargs.get("room_id")
+            return f"https://shome-api.samsung-ihp.com/v18/settings/light/{device_id}/rooms/{room_id}/on-off", "PUT"
+        elif url_type == "sensor_info":
+            device_id = kwargs.get("device_id")
+            return f"https://shome-api.samsung-ihp.com/v18/settings/environment-sensor/{device_id}", "GET"
+        elif url_type == "ventilation_info":
+            device_id = kwargs.get("device_id")
+            return f"https://shome-api.samsung-ihp.com/v18/settings/ventilator/{device_id}", "GET"
+        elif url_type == "toggle_ventilation":
+            device_id = kwargs.get("device_id")
+            sub_device_id = kwargs.get("sub_device_id")
+            return f"https://shome-api.samsung-ihp.com/v18/settings/ventilator/{device_id}/{sub_device_id}/on-off", "PUT"
+        elif url_type == "set_ventilation_speed":
+            device_id = kwargs.get("device_id")
+            sub_device_id = kwargs.get("sub_device_id")
+            return f"https://shome-api.samsung-ihp.com/v18/settings/ventilator/{device_id}/{sub_device_id}/windspeed", "PUT"
+        elif url_type == "aircon_info":
+            device_id = kwargs.get("device_id")
+            return f"https://shome-api.samsung-ihp.com/v18/settings/aircon/{device_id}", "GET"
+        elif url_type == "toggle_aircon":
+            device_id = kwargs.get("device_id")
+            sub_device_id = kwargs.get("sub_device_id")
+            return f"https://shome-api.samsung-ihp.com/v18/settings/aircon/{device_id}/{sub_device_id}/on-off", "PUT"
+        elif url_type == "set_aircon_temp":
+            device_id = kwargs.get("device_id")
+            sub_device_id = kwargs.get("sub_device_id")
+            return f"https://shome-api.samsung-ihp.com/v18/settings/aircon/{device_id}/{sub_device_id}/temperature", "PUT"
+        elif url_type == "heater_info":
+            device_id = kwargs.get("device_id")
+            return f"https://shome-api.samsung-ihp.com/v18/settings/heater/{device_id}", "GET"
+        elif url_type == "toggle_heater":
+            device_id = kwargs.get("device_id")
+            sub_device_id = kwargs.get("sub_device_id")
+            return f"https://shome-api.samsung-ihp.com/v18/settings/heater/{device_id}/{sub_device_id}/on-off", "PUT"
+        elif url_type == "set_heater_temp":
+            device_id = kwargs.get("device_id")
+            sub_device_id = kwargs.get("sub_device_id")
+            return f"https://shome-api.samsung-ihp.com/v18/settings/heater/{device_id}/{sub_device_id}/temperature", "PUT"
+        else:
+            raise ValueError(f"Unknown URL type: {url_type}")
+
+
+def main():
+    cookie = Cookie(JSESSIONID="A" * 32, WMONID="B" * 16)
+    login = Login.from_dict({"ihdId": "wallpad", "accessToken": "T" * 64})
+    header_maker = SHomeHeaderMaker()
+    url_maker = SHomeUrlMaker()
+    legacy_url_maker = LegacyUrlMaker(login)
+    url_params = {"device_id": "TH00000000000001", "sub_device_id": "3"}
+
+    compare("device_header",
+            lambda: legacy_device_header(header_maker, cookie, login),
+            lambda: header_maker.device_header(cookie, login))
+    compare("get_url(toggle_heater)",
+            lambda: legacy_url_maker._get_url("toggle_heater", **url_params),
+            lambda: url_maker.get_url("toggle_heater", url_params))
+    compare("header + url per request",
+            lambda: (legacy_device_header(header_maker, cookie, login), legacy_url_maker._get_url("toggle_heater", **url_params)),
+            lambda: (header_maker.device_header(cookie, login), url_maker.get_url("toggle_heater", url_params)))
+
+    # the request metrics are always on, so their cost adds to every request
+    metrics = RequestMetrics()
+
+    def timed_request():
+        endpoint = metrics.endpoint("toggle_heater")
+        started = endpoint.start()
+        try:
+            header_maker.device_header(cookie, login)
+            url_maker.get_url("toggle_heater", url_params)
+        finally:
+            endpoint.finish(started, 200, 512)
+
+    compare("header + url without -> with request metrics",
+            lambda: (header_maker.device_header(cookie, login), url_maker.get_url("toggle_heater", url_params)),
+            timed_request)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Command latency under a poll backlog: one shared semaphore vs. the priority scheduler.
+
+Simulates one account whose coordinators queue a burst of polls while commands arrive
+every few hundred milliseconds. Each request holds its slot for a fixed simulated server
+latency. Run with `python benchmarks/bench_request_scheduling.py`.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from _common import INTEGRATION_DIR  # noqa: F401  (puts shome_client on sys.path)
+from shome_client.const import SCHEDULER_MAX_IN_FLIGHT
+from shome_client.scheduler import RequestExpiredError, RequestPriority, RequestScheduler
+
+
+class SemaphoreSlots:
+    """Every request races for the same slots in arrival order, as before the scheduler."""
+
+    def __init__(self, max_in_flight: int):
+        self._semaphore = asyncio.Semaphore(max_in_flight)
+
+    def slot(self, priority: RequestPriority):
+        return self._semaphore
+
+
+async def run(label: str, slots, args: argparse.Namespace):
+    command_latencies: list[float] = []
+    poll_latencies: list[float] = []
+    expired = 0
+
+    async def request(priority: RequestPriority, latencies: list[float]):
+        nonlocal expired
+        started = time.perf_counter()
+        try:
+            async with slots.slot(priority):
+                await asyncio.sleep(args.latency_ms / 1000)
+        except RequestExpiredError:
+            expired += 1
+            return
+        latencies.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    tasks = [asyncio.create_task(request(RequestPriority.POLL, poll_latencies)) for _ in range(args.polls)]
+    for _ in range(args.commands):
+        await asyncio.sleep(args.command_interval_ms / 1000)
+        tasks.append(asyncio.create_task(request(RequestPriority.INTERACTIVE, command_latencies)))
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - started
+
+    print(f"{label:<20} commands p50 {statistics.median(command_latencies):7.1f} ms  "
+          f"max {max(command_latencies):7.1f} ms | polls p50 {statistics.median(poll_latencies):7.1f} ms  "
+          f"max {max(poll_latencies):7.1f} ms, expired {expired} | {elapsed:.1f} s")
+    return slots
+
+
+async def main_async(args: argparse.Namespace):
+    print(f"{args.polls} polls queued at once, a command every {args.command_interval_ms:.0f} ms, "
+          f"{args.latency_ms:.0f} ms per request, {SCHEDULER_MAX_IN_FLIGHT} in flight\n")
+    await run("shared semaphore", SemaphoreSlots(SCHEDULER_MAX_IN_FLIGHT), args)
+    scheduler = await run("priority scheduler", RequestScheduler(SCHEDULER_MAX_IN_FLIGHT), args)
+    queues = scheduler.as_dict()["queues"]
+    print(f"\nscheduler queue wait: commands mean {queues['interactive']['mean_wait_ms']} ms, "
+          f"polls mean {queues['poll']['mean_wait_ms']} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--polls", type=int, default=400)
+    parser.add_argument("--commands", type=int, default=10)
+    parser.add_argument("--command-interval-ms", type=float, default=200.0)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
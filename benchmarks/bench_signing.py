@@ -0,0 +1,51 @@
+"""Per-call cost of the createDate/hashData signature in SHomeParamMaker.
+
+Run with `python benchmarks/bench_signing.py`.
+"""
+import hashlib
+import itertools
+from datetime import datetime, timezone
+
+from _common import compare
+
+from shome_client.shome_param_maker import SHomeParamMaker
+from shome_client.shome_signer import SHomeSigner
+
+
+def legacy_basic_params(device_id: str) -> dict:
+    # parameter building as it was before SHomeSigner
+    current_date = datetime.now(tz=timezone.utc).strftime("%Y%m%d%H%M%S")
+    msg = f"IHRESTAPI{''.join([device_id, current_date])}".encode("utf-8")
+    return {
+        "createDate": current_date,
+        "hashData": hashlib.sha512(msg).hexdigest()
+    }
+
+
+def main():
+    param_maker = SHomeParamMaker()
+    signer = SHomeSigner()
+    device_id = "TH00000000000001"
+
+    compare("createDate",
+            lambda: datetime.now(tz=timezone.utc).strftime("%Y%m%d%H%M%S"),
+            signer.create_date)
+    compare("hashData (prefix state copy, no cache)",
+            lambda: hashlib.sha512(f"IHRESTAPI{device_id}20250101000000".encode("utf-8")).hexdigest(),
+            lambda: signer._sign((device_id, "20250101000000")))
+
+    # same device within one second: retries, duplicate refreshes, fan-out bursts
+    compare("basic_params, repeated device",
+            lambda: legacy_basic_params(device_id),
+            lambda: param_maker.basic_params(device_id))
+
+    # every call signs a different device, so the LRU never hits
+    legacy_ids = (f"TH{n:014d}" for n in itertools.count())
+    new_ids = (f"TH{n:014d}" for n in itertools.count())
+    compare("basic_params, distinct devices",
+            lambda: legacy_basic_params(next(legacy_ids)),
+            lambda: param_maker.basic_params(next(new_ids)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""Memory and read cost of the coordinator state: nested dicts vs. StateStore records.
+
+Run with `python benchmarks/bench_state_store.py`.
+"""
+import tracemalloc
+
+from _common import compare
+
+from coordinators.state_store import (
+    DeviceMeta, DeviceState, LightGroup, LightState, StateStore, records_by_id, sub_device_id
+)
+from shome_client.dto.device import SHomeDevice
+
+PANELS = 4
+LIGHTS_PER_PANEL = 40
+ROOMS_PER_PANEL = 8
+
+
+def make_devices() -> list[SHomeDevice]:
+    return [SHomeDevice.from_dict({
+        "thngId": f"TH{n:014d}", "rootThngId": "WP00000000000001", "thngModelId": "TM00000069",
+        "thngModelName": "light", "thngModelTypeName": "light", "thngModelTypeId": "TD00000069",
+        "uniqueNum": f"TH{n:014d}", "badEdgeStatus": False, "status": True, "nickname": f"Light panel {n}",
+        "battery": 100, "zigStrength": 0, "autoReLock": False, "dummyMode": False,
+        "createdAt": "2024-01-01T00:00:00Z", "deviceTotalCount": 1,
+    }) for n in range(PANELS)]
+
+
+def rooms() -> dict[str, list[int]]:
+    return {str(room + 1): list(range(room + 1, LIGHTS_PER_PANEL + 1, ROOMS_PER_PANEL)) for room in range(ROOMS_PER_PANEL)}
+
+
+def legacy_data(devices: list[SHomeDevice]) -> dict:
+    # LightsCoordinator._init_data as it was before the state store
+    result = {}
+    for device in devices:
+        result[device.id] = {
+            "group_info": {group_id: {"name": f"Room {group_id}", "devices": members}
+                           for group_id, members in rooms().items()},
+            "sub_device_info": {str(n): {"name": f"Light {n}", "on": n % 3 == 0}
+                                for n in range(1, LIGHTS_PER_PANEL + 1)},
+            "device_info": {
+                "id": device.unique_num,
+                "name": device.nick_name,
+                "shome_id": device.id,
+                "model": device.model_name,
+                "model_id": device.model_id,
+                "created_at": device.created_at,
+                "root_device_id": device.root_id,
+                "type": device.model_type_id
+            }
+        }
+    return result
+
+
+def legacy_snapshot(data: dict) -> dict:
+    # copy of the sub-device dicts kept to diff the next refresh against
+    return {device_id: {**device, "sub_device_info": {sub_id: dict(sub) for sub_id, sub in device["sub_device_info"].items()}}
+            for device_id, device in data.items()}
+
+
+def legacy_diff(old: dict, new: dict) -> dict:
+    changes = {}
+    for device_id in old.keys() | new.keys():
+        old_device, new_device = old.get(device_id), new.get(device_id)
+        if old_device == new_device:
+            continue
+        old_subs, new_subs = old_device["sub_device_info"], new_device["sub_device_info"]
+        changes[device_id] = {sub_id for sub_id in old_subs.keys() | new_subs.keys()
+                              if old_subs.get(sub_id) != new_subs.get(sub_id)}
+    return changes
+
+
+def legacy_refresh(devices: list[SHomeDevice], notified: dict) -> dict:
+    # rebuild the tree, diff it against the last notified snapshot, snapshot it for the next round
+    data = legacy_data(devices)
+    changes = legacy_diff(notified, data)
+    legacy_snapshot(data)
+    return changes
+
+
+def store_data(devices: list[SHomeDevice]) -> dict[str, DeviceState]:
+    return {device.id: DeviceState(
+        meta=DeviceMeta.from_device(device),
+        sub_devices=records_by_id(LightState(sub_id=sub_device_id(n), name=f"Light {n}", on=n % 3 == 0)
+                                  for n in range(1, LIGHTS_PER_PANEL + 1)),
+        groups={group_id: LightGroup(group_id=group_id, name=f"Room {group_id}",
+                                     members=tuple(sub_device_id(member) for member in members))
+                for group_id, members in rooms().items()},
+    ) for device in devices}
+
+
+def allocated(build) -> tuple[int, object]:
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    result = build()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    return size, result
+
+
+def main():
+    devices = make_devices()
+
+    legacy_size, legacy = allocated(lambda: legacy_data(devices))
+    store = StateStore()
+    store_size, _ = allocated(lambda: store.merge_all(store_data(devices)))
+    print(f"{PANELS} panels x {LIGHTS_PER_PANEL} lights: nested dicts {legacy_size / 1024:.1f} KiB, "
+          f"state store {store_size / 1024:.1f} KiB ({legacy_size / store_size:.1f}x smaller)\n")
+
+    device_id = devices[-1].id
+    light_id = str(LIGHTS_PER_PANEL)
+    handle = store.sub_device(device_id, light_id)
+    compare("ApiLight.is_on",
+            lambda: legacy.get(device_id, {}).get("sub_device_info", {}).get(light_id, {}).get("on"),
+            lambda: handle.on,
+            number=1_000_000)
+
+    members = [str(member) for member in rooms()["1"]]
+    lights = legacy[device_id]["sub_device_info"]
+    device = store.get(device_id)
+    compare("ApiRoomLight.is_on",
+            lambda: True in [status.get("on", False) for light_id, status in lights.items() if light_id in members],
+            lambda: any(device.sub_devices[member].on for member in members if member in device.sub_devices))
+
+    # a routine poll where nothing changed: rebuild + snapshot diff vs. rebuild records and merge in place
+    notified = legacy_snapshot(legacy)
+    compare("refresh without changes",
+            lambda: legacy_refresh(devices, notified),
+            lambda: store.merge_all(store_data(devices)),
+            number=200)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""Drive the real client and coordinators against the mock SHome server.
+
+Starts `MockSHomeServer` in-process, logs in, discovers the devices and runs
+`--rounds` refresh rounds of every coordinator, then prints the refresh
+latency percentiles and the number of requests per route. Optionally a number
+of light toggles is interleaved with every round.
+
+Unlike the micro-benchmarks this needs Home Assistant installed, since the
+coordinators are `DataUpdateCoordinator`s:
+
+    python benchmarks/load_test.py --rounds 20 --latency-ms 80 --light-panels 4
+"""
+import argparse
+import asyncio
+import logging
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+from mock_shome_server import MockSHomeServer, add_config_arguments, config_from_args
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from homeassistant.const import Platform  # noqa: E402
+from homeassistant.core import HomeAssistant  # noqa: E402
+
+from custom_components.shome_ha_integration.coordinators.aircon_coordinator import AirconCoordinator  # noqa: E402
+from custom_components.shome_ha_integration.coordinators.heater_coordinator import HeaterCoordinator  # noqa: E402
+from custom_components.shome_ha_integration.coordinators.light_coordinator import (  # noqa: E402
+    LightsCoordinator, LightToggleType
+)
+from custom_components.shome_ha_integration.coordinators.sensor_coordinator import SensorCoordinator  # noqa: E402
+from custom_components.shome_ha_integration.coordinators.ventilation_coordinator import (  # noqa: E402
+    VentilationCoordinator
+)
+from custom_components.shome_ha_integration.shome_client.dto.status import OnOffStatus  # noqa: E402
+from custom_components.shome_ha_integration.shome_client.utils.device_type import get_device_type  # noqa: E402
+from custom_components.shome_ha_integration.utils import get_client_registry  # noqa: E402
+
+CREDENTIAL = {"username": "load-test", "password": "load-test", "device_id": "load-test-device"}
+
+
+def _percentile(samples: list[float], percent: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(percent / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def _print_latencies(label: str, samples: list[float]):
+    if not samples:
+        return
+    print(f"{label:<24} n={len(samples):<5} mean={statistics.mean(samples):8.1f} ms  "
+          f"p50={_percentile(samples, 50):8.1f}  p90={_percentile(samples, 90):8.1f}  "
+          f"p99={_percentile(samples, 99):8.1f}")
+
+
+async def _run(args: argparse.Namespace):
+    server = MockSHomeServer(config_from_args(args))
+    base_url = await server.start()
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        registry = get_client_registry(hass)
+        registry.acquire(CREDENTIAL["username"])
+
+        started = time.perf_counter()
+        # create the client against the mock server, so the coordinators pick it up instead of the real cloud
+        client = await registry.get_or_create(CREDENTIAL, base_url=base_url)
+        home_info = await client.get_devices()
+        print(f"login + device list: {(time.perf_counter() - started) * 1000:.1f} ms, "
+              f"{len(home_info.devices)} devices")
+
+        by_type: dict[tuple, list] = {}
+        for device in home_info.devices:
+            if (device_type := get_device_type(device)) is not None:
+                by_type.setdefault(device_type, []).append(device)
+
+        lights = LightsCoordinator(hass, CREDENTIAL, by_type.get((Platform.LIGHT, "light"), []))
+        coordinators = [
+            lights,
+            SensorCoordinator(hass, CREDENTIAL, by_type.get((Platform.SENSOR, "environment-sensor"), [])),
+            VentilationCoordinator(hass, CREDENTIAL, by_type.get((Platform.FAN, "ventilator"), [])),
+            AirconCoordinator(hass, CREDENTIAL, by_type.get((Platform.CLIMATE, "aircon"), [])),
+            HeaterCoordinator(hass, CREDENTIAL, by_type.get((Platform.CLIMATE, "heater"), [])),
+        ]
+
+        server.reset_stats()
+        latencies: dict[str, list[float]] = {coordinator.name: [] for coordinator in coordinators}
+        round_latencies: list[float] = []
+        toggle_latencies: list[float] = []
+
+        async def _refresh(coordinator):
+            refresh_started = time.perf_counter()
+            await coordinator.async_refresh()
+            latencies[coordinator.name].append((time.perf_counter() - refresh_started) * 1000)
+
+        async def _toggle(device_id: str, light_id: str):
+            toggle_started = time.perf_counter()
+            state = random.choice([OnOffStatus.ON, OnOffStatus.OFF])
+            await lights.toggle_light(device_id, LightToggleType.SINGLE, light_id, state)
+            toggle_latencies.append((time.perf_counter() - toggle_started) * 1000)
+
+        light_ids = [
+            (device_id, light_id)
+            for device_id, lights_by_id in server.wallpad.lights.items()
+            for light_id in lights_by_id
+        ]
+        for _ in range(args.rounds):
+            round_started = time.perf_counter()
+            toggles = [_toggle(*random.choice(light_ids)) for _ in range(args.toggles if light_ids else 0)]
+            await asyncio.gather(*(_refresh(coordinator) for coordinator in coordinators), *toggles)
+            round_latencies.append((time.perf_counter() - round_started) * 1000)
+
+        print()
+        for name, samples in latencies.items():
+            _print_latencies(name, samples)
+        _print_latencies("light toggle", toggle_latencies)
+        _print_latencies("full round", round_latencies)
+
+        print("\nrequests per route:")
+        for url_type, count in sorted(server.request_counts.items()):
+            print(f"  {url_type:<24} {count:6d}")
+        print("responses per status:", dict(server.status_counts))
+
+        for coordinator in coordinators:
+            await coordinator.async_shutdown()
+        await registry.release(CREDENTIAL["username"])
+        await hass.async_stop(force=True)
+    await server.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument("--toggles", type=int, default=0, help="single light toggles sent during every round")
+    parser.add_argument("--debug", action="store_true")
+    add_config_arguments(parser)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.DEBUG if args.debug else logging.WARNING)
+    asyncio.run(_run(args))
+
+
+if __name__ == "__main__":
+    main()
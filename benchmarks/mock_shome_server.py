@@ -0,0 +1,367 @@
+"""Local stand-in for shome-api.samsung-ihp.com.
+
+Implements every route of `SHomeUrlMaker.ROUTES`, checks `hashData` the way
+`SHomeParamMaker` builds it, and simulates a wallpad with a configurable number
+of light panels, environment sensors, ventilators and climate zones.
+
+Run standalone with `python benchmarks/mock_shome_server.py --port 8080`, or
+start it in-process through `MockSHomeServer.start()` (see load_test.py).
+"""
+import argparse
+import asyncio
+import hashlib
+import random
+import secrets
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import Optional
+
+from aiohttp import web
+
+from _common import INTEGRATION_DIR  # noqa: F401  (puts shome_client on sys.path)
+from shome_client.shome_url_maker import SHomeUrlMaker
+
+WALLPAD_ID = "WP00000000000001"
+
+
+@dataclass
+class MockConfig:
+    latency_ms: float = 50.0
+    jitter_ms: float = 20.0
+    token_ttl: float = 3600.0
+    error_rate: float = 0.0
+    light_panels: int = 2
+    lights_per_panel: int = 40
+    rooms_per_panel: int = 8
+    sensor_devices: int = 2
+    sensors_per_device: int = 4
+    ventilators: int = 1
+    heater_zones: int = 6
+    aircon_zones: int = 4
+    # largest device list page served, 0 for no cap
+    device_page_size: int = 0
+
+
+def _expected_hash(fields: list[str]) -> str:
+    return hashlib.sha512(f"IHRESTAPI{''.join(fields)}".encode("utf-8")).hexdigest()
+
+
+class MockWallpad:
+    """In-memory wallpad state, shaped like the SHome API payloads."""
+
+    def __init__(self, config: MockConfig):
+        self.devices: list[dict] = []
+        self.lights: dict[str, dict[str, bool]] = {}
+        self.rooms: dict[str, dict[str, list[str]]] = {}
+        self.sensors: dict[str, list[dict]] = {}
+        self.ventilators: dict[str, dict[str, int]] = {}
+        self.climates: dict[str, dict[str, dict]] = {}
+
+        for panel in range(config.light_panels):
+            device_id = self._add_device("TD00000069", "light", f"Light panel {panel + 1}")
+            light_ids = [str(n) for n in range(1, config.lights_per_panel + 1)]
+            self.lights[device_id] = {light_id: random.random() < 0.3 for light_id in light_ids}
+            rooms = max(1, config.rooms_per_panel)
+            self.rooms[device_id] = {
+                str(room + 1): light_ids[room::rooms] for room in range(rooms) if light_ids[room::rooms]
+            }
+        for sensor in range(config.sensor_devices):
+            device_id = self._add_device("TD00000076", "environment-sensor", f"Environment sensor {sensor + 1}")
+            self.sensors[device_id] = [{
+                "deviceId": n,
+                "nickname": f"Sensor {n}",
+                "temperature": "23.5",
+                "humidity": "45",
+                "co2": "600",
+                "fineDust": "20",
+            } for n in range(1, config.sensors_per_device + 1)]
+        for ventilator in range(config.ventilators):
+            device_id = self._add_device("TD00000073", "ventilator", f"Ventilator {ventilator + 1}")
+            self.ventilators[device_id] = {"1": 0}
+        if config.heater_zones:
+            device_id = self._add_device("TD00000075", "heater", "Heater")
+            self.climates[device_id] = self._climate_zones(config.heater_zones, 22)
+        if config.aircon_zones:
+            device_id = self._add_device("TD00000072", "aircon", "Aircon")
+            self.climates[device_id] = self._climate_zones(config.aircon_zones, 26)
+
+    def _add_device(self, model_type_id: str, model_type_name: str, nickname: str) -> str:
+        device_id = f"TH{len(self.devices) + 1:014d}"
+        self.devices.append({
+            "thngId": device_id,
+            "rootThngId": WALLPAD_ID,
+            "thngModelId": f"TM{model_type_id[2:]}",
+            "thngModelName": model_type_name,
+            "thngModelTypeId": model_type_id,
+            "thngModelTypeName": model_type_name,
+            "uniqueNum": device_id,
+            "badEdgeStatus": False,
+            "status": True,
+            "nickname": nickname,
+            "battery": 100,
+            "zigStrength": 0,
+            "autoReLock": False,
+            "dummyMode": False,
+            "createdAt": "2024-01-01T00:00:00Z",
+            "deviceTotalCount": 1,
+        })
+        return device_id
+
+    @staticmethod
+    def _climate_zones(count: int, set_temp: int) -> dict[str, dict]:
+        return {str(n): {"on": False, "set_temp": set_temp, "current_temp": 21} for n in range(1, count + 1)}
+
+    def light_info(self, device_id: str) -> dict:
+        lights = self.lights[device_id]
+        return {
+            "groupInfo": [{
+                "groupId": int(room_id),
+                "nickname": f"Room {room_id}",
+                "deviceList": [int(light_id) for light_id in members],
+                "groupStatus": 1 if any(lights[light_id] for light_id in members) else 0,
+            } for room_id, members in self.rooms[device_id].items()],
+            "deviceInfoList": [{
+                "deviceId": int(light_id),
+                "nickname": f"Light {light_id}",
+                "deviceStatus": 1 if on else 0,
+            } for light_id, on in lights.items()],
+        }
+
+    def climate_info(self, device_id: str) -> dict:
+        return {"deviceInfoList": [{
+            "deviceId": int(zone_id),
+            "nickname": f"Zone {zone_id}",
+            "deviceStatus": 1 if zone["on"] else 0,
+            "currentTemp": zone["current_temp"],
+            "setTemp": zone["set_temp"],
+            "windSpeedMode": 0,
+            "operationMode": 0,
+        } for zone_id, zone in self.climates[device_id].items()]}
+
+
+class MockSHomeServer:
+
+    def __init__(self, config: Optional[MockConfig] = None):
+        self.config = config or MockConfig()
+        self.wallpad = MockWallpad(self.config)
+        self.request_counts: Counter = Counter()
+        self.status_counts: Counter = Counter()
+        self._tokens: dict[str, float] = {}
+        self._sessions: set[str] = set()
+        self._runner: Optional[web.AppRunner] = None
+        self.base_url: Optional[str] = None
+
+        self.app = web.Application(middlewares=[self._middleware])
+        for url_type, (path, method) in SHomeUrlMaker.ROUTES.items():
+            self.app.router.add_route(method, path, self._make_handler(url_type))
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        self._runner = web.AppRunner(self.app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.base_url = f"http://{host}:{port}"
+        return self.base_url
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def reset_stats(self):
+        self.request_counts.clear()
+        self.status_counts.clear()
+
+    # --- request pipeline ---
+
+    @web.middleware
+    async def _middleware(self, request: web.Request, handler):
+        config = self.config
+        delay = config.latency_ms + random.uniform(-config.jitter_ms, config.jitter_ms)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+        try:
+            if config.error_rate and random.random() < config.error_rate:
+                raise web.HTTPInternalServerError(text="injected error")
+            response = await handler(request)
+        except web.HTTPException as e:
+            self.status_counts[e.status] += 1
+            raise
+        self.status_counts[response.status] += 1
+        return response
+
+    def _make_handler(self, url_type: str):
+        async def handler(request: web.Request) -> web.StreamResponse:
+            self.request_counts[url_type] += 1
+            if url_type not in ("check_app_version", "login"):
+                self._check_auth(request)
+            self._check_hash(url_type, request)
+            return await getattr(self, f"_handle_{url_type}")(request)
+        return handler
+
+    def _check_auth(self, request: web.Request):
+        token = request.headers.get("Authorization", "").removeprefix("Bearer ").strip()
+        issued_at = self._tokens.get(token)
+        if issued_at is None or time.monotonic() - issued_at > self.config.token_ttl:
+            raise web.HTTPUnauthorized(text="token expired")
+        if request.cookies.get("JSESSIONID") not in self._sessions:
+            raise web.HTTPUnauthorized(text="unknown session")
+
+    @staticmethod
+    def _check_hash(url_type: str, request: web.Request):
+        query = request.query
+        match = request.match_info
+        create_date = query.get("createDate", "")
+        if url_type == "check_app_version":
+            fields = [query.get("appName", ""), query.get("osType", ""), query.get("currentVersion", "")]
+        elif url_type == "login":
+            fields = [query.get("userId", ""), query.get("password", ""), query.get("mobileDeviceIdno", ""),
+                      query.get("language", "")]
+        elif url_type == "list_device":
+            fields = [match["wallpad_id"]]
+        elif url_type == "toggle_all_light":
+            fields = [match["device_id"], "0", query.get("state", "")]
+        elif url_type == "toggle_single_light":
+            fields = [match["device_id"], match["light_id"], query.get("state", "")]
+        elif url_type == "toggle_room_light":
+            fields = [match["device_id"], match["room_id"], query.get("state", "")]
+        elif url_type == "set_ventilation_speed":
+            fields = [match["device_id"], match["sub_device_id"], query.get("mode", "")]
+        elif "sub_device_id" in match:
+            fields = [match["device_id"], match["sub_device_id"], query.get("state", "")]
+        else:
+            fields = [match["device_id"]]
+        if query.get("hashData") != _expected_hash(fields + [create_date]):
+            raise web.HTTPBadRequest(text=f"invalid hashData for {url_type}")
+
+    # --- handlers ---
+
+    async def _handle_check_app_version(self, request: web.Request):
+        response = web.json_response({"result": 1, "needUpdate": "0"})
+        session_id = secrets.token_hex(16)
+        self._sessions.add(session_id)
+        response.set_cookie("JSESSIONID", session_id)
+        response.set_cookie("WMONID", secrets.token_hex(8))
+        return response
+
+    async def _handle_login(self, request: web.Request):
+        if request.cookies.get("JSESSIONID") not in self._sessions:
+            raise web.HTTPUnauthorized(text="unknown session")
+        token = secrets.token_hex(32)
+        self._tokens[token] = time.monotonic()
+        return web.json_response({
+            "homeId": "HOME0001",
+            "ihdId": WALLPAD_ID,
+            "userName": "mock",
+            "userId": request.query.get("userId", ""),
+            "accessToken": token,
+        })
+
+    async def _handle_list_device(self, request: web.Request):
+        devices = self.wallpad.devices
+        offset = int(request.query.get("offset", "0"))
+        limit = int(request.query.get("limit", str(len(devices))))
+        if self.config.device_page_size:
+            limit = min(limit, self.config.device_page_size)
+        return web.json_response({
+            "pagination": {"offset": offset, "limit": limit, "total": len(devices)},
+            "deviceList": devices[offset:offset + limit],
+        })
+
+    async def _handle_get_light_info(self, request: web.Request):
+        return web.json_response(self.wallpad.light_info(request.match_info["device_id"]))
+
+    async def _handle_toggle_all_light(self, request: web.Request):
+        lights = self.wallpad.lights[request.match_info["device_id"]]
+        on = request.query.get("state") == "ON"
+        for light_id in lights:
+            lights[light_id] = on
+        return web.json_response({})
+
+    async def _handle_toggle_single_light(self, request: web.Request):
+        lights = self.wallpad.lights[request.match_info["device_id"]]
+        lights[request.match_info["light_id"]] = request.query.get("state") == "ON"
+        return web.json_response({})
+
+    async def _handle_toggle_room_light(self, request: web.Request):
+        device_id = request.match_info["device_id"]
+        on = request.query.get("state") == "ON"
+        for light_id in self.wallpad.rooms[device_id][request.match_info["room_id"]]:
+            self.wallpad.lights[device_id][light_id] = on
+        return web.json_response({})
+
+    async def _handle_sensor_info(self, request: web.Request):
+        return web.json_response({"deviceInfoList": self.wallpad.sensors[request.match_info["device_id"]]})
+
+    async def _handle_ventilation_info(self, request: web.Request):
+        ventilator = self.wallpad.ventilators[request.match_info["device_id"]]
+        return web.json_response({"deviceInfoList": [{
+            "deviceId": int(sub_id), "nickname": f"Ventilator {sub_id}", "windSpeedMode": speed
+        } for sub_id, speed in ventilator.items()]})
+
+    async def _handle_toggle_ventilation(self, request: web.Request):
+        ventilator = self.wallpad.ventilators[request.match_info["device_id"]]
+        sub_id = request.match_info["sub_device_id"]
+        ventilator[sub_id] = (ventilator[sub_id] or 3) if request.query.get("state") == "ON" else 0
+        return web.json_response({})
+
+    async def _handle_set_ventilation_speed(self, request: web.Request):
+        ventilator = self.wallpad.ventilators[request.match_info["device_id"]]
+        ventilator[request.match_info["sub_device_id"]] = int(request.query.get("mode", "0"))
+        return web.json_response({})
+
+    async def _handle_aircon_info(self, request: web.Request):
+        return web.json_response(self.wallpad.climate_info(request.match_info["device_id"]))
+
+    _handle_heater_info = _handle_aircon_info
+
+    async def _handle_toggle_aircon(self, request: web.Request):
+        zone = self.wallpad.climates[request.match_info["device_id"]][request.match_info["sub_device_id"]]
+        zone["on"] = request.query.get("state") == "ON"
+        return web.json_response({})
+
+    _handle_toggle_heater = _handle_toggle_aircon
+
+    async def _handle_set_aircon_temp(self, request: web.Request):
+        zone = self.wallpad.climates[request.match_info["device_id"]][request.match_info["sub_device_id"]]
+        zone["set_temp"] = int(request.query.get("state", "0"))
+        return web.json_response({})
+
+    _handle_set_heater_temp = _handle_set_aircon_temp
+
+
+def add_config_arguments(parser: argparse.ArgumentParser):
+    defaults = MockConfig()
+    for name, value in vars(defaults).items():
+        parser.add_argument(f"--{name.replace('_', '-')}", type=type(value), default=value)
+
+
+def config_from_args(args: argparse.Namespace) -> MockConfig:
+    return MockConfig(**{name: getattr(args, name) for name in vars(MockConfig())})
+
+
+async def _serve(config: MockConfig, port: int):
+    server = MockSHomeServer(config)
+    base_url = await server.start(port=port)
+    print(f"mock SHome server listening on {base_url} ({len(server.wallpad.devices)} devices)")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8080)
+    add_config_arguments(parser)
+    args = parser.parse_args()
+    try:
+        asyncio.run(_serve(config_from_args(args), args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
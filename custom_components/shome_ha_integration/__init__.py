@@ -1,92 +1,235 @@
+import asyncio
 import logging
+from typing import Optional
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
 
-from .const import DOMAIN
+from .const import CONF_MAX_CONCURRENT_REQUESTS, DEFAULT_MAX_CONCURRENT_REQUESTS, DOMAIN
 from .coordinators.aircon_coordinator import AirconCoordinator
+from .coordinators.base_coordinator import SHomeCoordinator
 from .coordinators.heater_coordinator import HeaterCoordinator
 from .coordinators.light_coordinator import LightsCoordinator
 from .coordinators.sensor_coordinator import SensorCoordinator
 from .coordinators.ventilation_coordinator import VentilationCoordinator
+from .inventory_cache import CachedInventory, InventoryCache
+from .session_cache import SessionCache
 from .shome_client.dto.device import SHomeDevice
 from .shome_client.dto.home_info import SHomeInfo
 from .shome_client.shome_client import SHomeClient
 from .shome_client.utils.device_type import get_device_type
-from .utils import unload_client, get_or_create_client
+from .utils import acquire_client, get_or_create_client, release_client
 
 _LOGGER = logging.getLogger(__name__)
 
+# hass.data key -> (coordinator, platform and device type of the devices it polls)
+_COORDINATORS: dict[str, tuple[type[SHomeCoordinator], Platform, str]] = {
+    "lights_coordinator": (LightsCoordinator, Platform.LIGHT, "light"),
+    "sensor_coordinator": (SensorCoordinator, Platform.SENSOR, "environment-sensor"),
+    "ventilation_coordinator": (VentilationCoordinator, Platform.FAN, "ventilator"),
+    "aircon_coordinator": (AirconCoordinator, Platform.CLIMATE, "aircon"),
+    "heater_coordinator": (HeaterCoordinator, Platform.CLIMATE, "heater"),
+}
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
 
     credential: dict = entry.data.get("credential")
-    client: SHomeClient = await get_or_create_client(hass, credential)
+    # the entry holds a reference to its account's client until it is unloaded
+    acquire_client(hass, credential)
+    try:
+        return await _async_setup_entry(hass, entry, credential)
+    except BaseException:
+        await release_client(hass, credential)
+        raise
+
+
+async def _async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, credential: dict) -> bool:
+    inventory = InventoryCache(hass, entry.entry_id)
+
+    # get devices: from the inventory cache when there is one, so setup does not wait for the cloud
+    cached: Optional[CachedInventory] = await inventory.async_load()
+    if cached is not None:
+        _LOGGER.debug("Setting up %d devices from the inventory cache", len(cached.devices))
+        devices = cached.devices
+        device_by_type = _classify_devices(devices)
+    else:
+        # classify devices while the later pages of the device list are still downloading
+        client: SHomeClient = await get_or_create_client(hass, credential)
+        devices = []
+        device_by_type = {}
+        async for device in client.iter_devices():
+            devices.append(device)
+            _classify_device(device_by_type, device)
+
+    max_concurrency = entry.options.get(CONF_MAX_CONCURRENT_REQUESTS, DEFAULT_MAX_CONCURRENT_REQUESTS)
+    coordinators = _create_coordinators(hass, credential, device_by_type, len(devices), max_concurrency)
+    inventory.track(coordinators.values())
+
+    if cached is not None:
+        # entities start from the last-known state; devices missing from the cache are fetched now
+        incomplete = [
+            coordinator for coordinator in coordinators.values()
+            if not _restore_coordinator(coordinator, cached.states.get(coordinator.name, {}))
+        ]
+        await _async_first_refresh_all(incomplete)
+    else:
+        # first refresh of every coordinator at once, so setup only waits for the slowest device class
+        await _async_first_refresh_all(list(coordinators.values()))
+        inventory.async_save_devices(devices)
+
+    # save coordinators for future use
+    hass.data.setdefault(DOMAIN, {})
+    hass.data[DOMAIN][entry.entry_id] = coordinators
+
+    # launch devices; the sensor platform always runs for the diagnostic request sensors
+    platforms = {*device_by_type.keys(), Platform.SENSOR}
+    # the forwarded platforms, unloaded again by async_unload_entry
+    entry.runtime_data = platforms
+    await hass.config_entries.async_forward_entry_setups(entry, platforms)
+
+    if cached is not None:
+        entry.async_create_background_task(
+            hass,
+            _async_reconcile(hass, entry, inventory, coordinators, device_by_type),
+            f"{DOMAIN} inventory reconcile {entry.entry_id}",
+        )
+    entry.async_on_unload(entry.add_update_listener(_async_options_updated))
+    return True
 
-    # get devices
-    home_info: SHomeInfo = await client.get_devices()
+
+async def _async_options_updated(hass: HomeAssistant, entry: ConfigEntry):
+    """Recreate the coordinators with the changed options."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
+def _classify_devices(devices: list[SHomeDevice]) -> dict[Platform, dict[str, list[SHomeDevice]]]:
     device_by_type: dict[Platform, dict[str, list[SHomeDevice]]] = {}
-    for device in home_info.devices:
-        if (device_type := get_device_type(device)) is None:
-            _LOGGER.warning("Device %s (model_type_id: %s) is not supported, skipping",
-                            device.nick_name, device.model_type_id)
-            continue
-        _LOGGER.debug("device_type: %s", device_type)
-        platform, shome_device_type = device_type
-        _LOGGER.debug("Device %s (model_type_id: %s) classified as %s",
-                     device.nick_name, device.model_type_id, (platform, shome_device_type))
-        device_by_type.setdefault(platform, {}).setdefault(shome_device_type, []).append(device)
-
-    # create light coordinator
-    light_devices: list[SHomeDevice] = device_by_type.get(Platform.LIGHT, {}).get("light", [])
-    _LOGGER.debug("Found %d light devices from total %d devices", len(light_devices), len(home_info.devices))
-    light_coordinator: LightsCoordinator = LightsCoordinator(hass, credential, light_devices)
-    await light_coordinator.async_config_entry_first_refresh()
-
-    # create sensor coordinator
-    sensor_devices: list[SHomeDevice] = device_by_type.get(Platform.SENSOR, {}).get("environment-sensor", [])
-    _LOGGER.debug("Found %d sensor devices from total %d devices", len(sensor_devices), len(home_info.devices))
-    sensor_coordinator: SensorCoordinator = SensorCoordinator(hass, credential, sensor_devices)
-    await sensor_coordinator.async_config_entry_first_refresh()
-
-    # create ventilation coordinator
-    fan_devices: list[SHomeDevice] = device_by_type.get(Platform.FAN, {}).get("ventilator", [])
-    _LOGGER.debug("Found %d fan devices from total %d devices", len(fan_devices), len(home_info.devices))
-    ventilation_coordinator: VentilationCoordinator = VentilationCoordinator(hass, credential, fan_devices)
-    await ventilation_coordinator.async_config_entry_first_refresh()
-
-    # create aircon coordinator
-    aircon_devices: list[SHomeDevice] = device_by_type.get(Platform.CLIMATE, {}).get("aircon", [])
-    _LOGGER.debug("Found %d aircon devices from total %d devices", len(aircon_devices), len(home_info.devices))
-    aircon_coordinator: AirconCoordinator = AirconCoordinator(hass, credential, aircon_devices)
-    await aircon_coordinator.async_config_entry_first_refresh()
-
-    # create heater coordinator
-    heater_devices: list[SHomeDevice] = device_by_type.get(Platform.CLIMATE, {}).get("heater", [])
-    _LOGGER.debug("Found %d heater devices from total %d devices", len(heater_devices), len(home_info.devices))
-    heater_coordinator: HeaterCoordinator = HeaterCoordinator(hass, credential, heater_devices)
-    await heater_coordinator.async_config_entry_first_refresh()
+    for device in devices:
+        _classify_device(device_by_type, device)
+    return device_by_type
+
+
+def _classify_device(device_by_type: dict[Platform, dict[str, list[SHomeDevice]]], device: SHomeDevice):
+    if (device_type := get_device_type(device)) is None:
+        _LOGGER.warning("Device %s (model_type_id: %s) is not supported, skipping",
+                        device.nick_name, device.model_type_id)
+        return
+    _LOGGER.debug("device_type: %s", device_type)
+    platform, shome_device_type = device_type
+    _LOGGER.debug("Device %s (model_type_id: %s) classified as %s",
+                 device.nick_name, device.model_type_id, (platform, shome_device_type))
+    device_by_type.setdefault(platform, {}).setdefault(shome_device_type, []).append(device)
+
+
+def _create_coordinators(
+        hass: HomeAssistant,
+        credential: dict,
+        device_by_type: dict[Platform, dict[str, list[SHomeDevice]]],
+        total: int,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENT_REQUESTS,
+) -> dict[str, SHomeCoordinator]:
+    coordinators = {}
+    for key, (coordinator_class, platform, shome_device_type) in _COORDINATORS.items():
+        devices: list[SHomeDevice] = device_by_type.get(platform, {}).get(shome_device_type, [])
+        _LOGGER.debug("Found %d %s devices from total %d devices", len(devices), shome_device_type, total)
+        coordinators[key] = coordinator_class(hass, credential, devices, max_concurrency)
+    return coordinators
+
+
+def _restore_coordinator(coordinator: SHomeCoordinator, cached: dict[str, dict]) -> bool:
+    """Seed a coordinator from the cache, return whether all of its devices were restored."""
+    try:
+        return coordinator.restore_state(cached)
+    except (KeyError, TypeError, ValueError) as e:
+        _LOGGER.warning("Ignoring unreadable cached state of %s - %s", coordinator.name, e)
+        return False
 
 
-    # save coordinators for future use
-    hass.data.setdefault(DOMAIN, {})
-    hass.data[DOMAIN][entry.entry_id] = {
-        "lights_coordinator": light_coordinator,
-        "sensor_coordinator": sensor_coordinator,
-        "ventilation_coordinator": ventilation_coordinator,
-        "aircon_coordinator": aircon_coordinator,
-        "heater_coordinator": heater_coordinator,
+def _device_ids(device_by_type: dict[Platform, dict[str, list[SHomeDevice]]]) -> dict[tuple[Platform, str], set[str]]:
+    return {
+        (platform, shome_device_type): {device.id for device in devices}
+        for platform, by_type in device_by_type.items()
+        for shome_device_type, devices in by_type.items()
     }
 
-    # launch devices
-    await hass.config_entries.async_forward_entry_setups(entry, device_by_type.keys())
-    return True
+
+async def _async_reconcile(
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        inventory: InventoryCache,
+        coordinators: dict[str, SHomeCoordinator],
+        cached_device_by_type: dict[Platform, dict[str, list[SHomeDevice]]],
+):
+    """Compare the cached inventory with the cloud after a setup from cache.
+
+    Reloads the entry when devices or sub-devices were added or removed (the entities
+    have to be recreated), otherwise refreshes the coordinators in place.
+    """
+    credential: dict = entry.data.get("credential")
+    try:
+        client: SHomeClient = await get_or_create_client(hass, credential)
+        home_info: SHomeInfo = await client.get_devices()
+    except Exception as e:
+        # polling keeps retrying; entities stay on their cached state until then
+        _LOGGER.warning("Could not reconcile the device inventory with the cloud - %s", e)
+        return
+    inventory.async_save_devices(home_info.devices)
+
+    device_by_type = _classify_devices(home_info.devices)
+    if _device_ids(device_by_type) != _device_ids(cached_device_by_type):
+        _LOGGER.info("Device list changed since the inventory was cached, reloading %s", entry.entry_id)
+        hass.config_entries.async_schedule_reload(entry.entry_id)
+        return
+
+    topology = {}
+    for key, coordinator in coordinators.items():
+        _, platform, shome_device_type = _COORDINATORS[key]
+        coordinator.replace_devices(device_by_type.get(platform, {}).get(shome_device_type, []))
+        topology[key] = coordinator.store.topology()
+    await asyncio.gather(*(coordinator.async_refresh() for coordinator in coordinators.values() if coordinator.has_devices))
+
+    if any(coordinator.store.topology() != topology[key] for key, coordinator in coordinators.items()):
+        _LOGGER.info("Sub-devices changed since the inventory was cached, reloading %s", entry.entry_id)
+        hass.config_entries.async_schedule_reload(entry.entry_id)
+
+
+async def _async_first_refresh_all(coordinators: list[SHomeCoordinator]):
+    """Run the first refresh of the coordinators concurrently.
+
+    Coordinators without any device skip the network round trip and start with empty data.
+    """
+    refreshing = []
+    for coordinator in coordinators:
+        if coordinator.has_devices:
+            refreshing.append(coordinator)
+        else:
+            _LOGGER.debug("No devices for %s, skipping first refresh", coordinator.name)
+            coordinator.async_set_updated_data(coordinator.store)
+
+    results = await asyncio.gather(
+        *(coordinator.async_config_entry_first_refresh() for coordinator in refreshing),
+        return_exceptions=True
+    )
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry):
     """Unload a config entry."""
+    # entities go first; the coordinators and the client stay while a platform refuses to unload
+    platforms: set[Platform] = getattr(entry, "runtime_data", None) or set()
+    if not await hass.config_entries.async_unload_platforms(entry, platforms):
+        _LOGGER.warning("Could not unload the platforms of entry %s", entry.entry_id)
+        return False
 
     hass.data.setdefault(DOMAIN, {})
+    if (coordinators := hass.data[DOMAIN].get(entry.entry_id)) is not None:
+        # stop pending confirmation refreshes and polling before dropping the coordinators
+        for coordinator in coordinators.values():
+            await coordinator.async_shutdown()
     if entry.entry_id in hass.data[DOMAIN]:
         hass.data[DOMAIN][entry.entry_id] = None
 
@@ -94,7 +237,14 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry):
     if not credential:
         _LOGGER.error("No credential found in entry data for unloading: %s", entry.entry_id)
         return False
-    await unload_client(hass, credential)
+    await release_client(hass, credential)
 
     _LOGGER.info("Unloading SHome integration entry: %s", entry.entry_id)
     return True
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry):
+    """Delete the inventory cache and stored session of a removed config entry."""
+    await InventoryCache(hass, entry.entry_id).async_remove()
+    if credential := entry.data.get("credential"):
+        await SessionCache(hass, credential).async_remove()
@@ -0,0 +1,166 @@
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Optional
+
+from aiohttp import ClientSession
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import Event, HomeAssistant, callback
+
+from .session_cache import SessionCache
+from .shome_client.const import SHARED_CONNECTION_LIMIT_PER_HOST
+from .shome_client.session import create_session
+from .shome_client.shome_client import SHomeClient
+from .shome_client.shome_signer import SHomeSigner
+from .shome_client.shome_url_maker import SHomeUrlMaker
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class ClientNotAcquiredError(RuntimeError):
+    """A client was asked for while no config entry (or flow) holds a reference to the account."""
+
+    def __init__(self, username: str):
+        super().__init__(f"No reference held to the SHome client of {username}, it is released or not set up")
+        self.username = username
+
+
+@dataclass
+class _HostResources:
+    """Connection pool and signer shared by every client of one API host."""
+    session: ClientSession
+    signer: SHomeSigner
+    usernames: set[str] = field(default_factory=set)
+
+
+class ClientRegistry:
+    """The `SHomeClient` of every account, one per username.
+
+    Clients are created (and logged in) under a per-username lock, so concurrent callers
+    missing the registry wait for one login instead of starting their own. Config entries
+    hold references with `acquire` / `release`; the client is closed when the last reference
+    is released, and the connection pool of its host once no client uses it any more.
+    `get_or_create` only serves accounts somebody holds a reference to, so a late refresh or
+    command of an unloaded entry cannot bring a client back that nobody would close.
+    """
+
+    def __init__(self, hass: HomeAssistant):
+        self._hass = hass
+        self._clients: dict[str, SHomeClient] = {}
+        self._refs: dict[str, int] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+        # base url -> resources shared by the clients of that host
+        self._hosts: dict[str, _HostResources] = {}
+        self._unsub_close = hass.bus.async_listen_once(EVENT_HOMEASSISTANT_CLOSE, self._async_close_on_stop)
+
+    def _lock(self, username: str) -> asyncio.Lock:
+        lock = self._locks.get(username)
+        if lock is None:
+            lock = self._locks[username] = asyncio.Lock()
+        return lock
+
+    def get(self, username: str) -> Optional[SHomeClient]:
+        return self._clients.get(username)
+
+    def refs(self, username: str) -> int:
+        return self._refs.get(username, 0)
+
+    @callback
+    def acquire(self, username: str):
+        """Hold a reference to the client of `username`, created on first use."""
+        self._refs[username] = self._refs.get(username, 0) + 1
+
+    async def release(self, username: str) -> bool:
+        """Drop a reference; close the client once none is left. Return whether that was the last one."""
+        async with self._lock(username):
+            refs = self._refs.get(username, 0) - 1
+            if refs > 0:
+                self._refs[username] = refs
+                return False
+            self._refs.pop(username, None)
+            if (client := self._clients.pop(username, None)) is not None:
+                _LOGGER.info("Closing SHomeClient for user: %s", username)
+                await self._close_client(username, client)
+            return True
+
+    async def get_or_create(self, credential: dict, base_url: str = SHomeUrlMaker.BASE_URL) -> SHomeClient:
+        """Return the client of this account, creating and logging it in if there is none.
+
+        Raises `ClientNotAcquiredError` unless a reference to the account is held (see `acquire`).
+        """
+        username = credential["username"]
+        if (client := self._clients.get(username)) is not None:
+            return client
+        self._check_acquired(username)
+
+        async with self._lock(username):
+            # another caller may have created it while we waited for the lock
+            if (client := self._clients.get(username)) is not None:
+                return client
+            # or the last reference may have been released meanwhile
+            self._check_acquired(username)
+
+            _LOGGER.info("Creating new SHomeClient for user: %s", username)
+            host = self._host(base_url)
+            client = SHomeClient(self._hass, base_url=base_url, session=host.session, signer=host.signer)
+            client.set_credential(credential)
+            host.usernames.add(username)
+            try:
+                await self._start_session(client, credential)
+            except BaseException:
+                await self._close_client(username, client)
+                raise
+            self._clients[username] = client
+            return client
+
+    def _check_acquired(self, username: str):
+        if self._refs.get(username, 0) <= 0:
+            _LOGGER.debug("Not creating a SHomeClient for %s, nobody holds a reference", username)
+            raise ClientNotAcquiredError(username)
+
+    async def _start_session(self, client: SHomeClient, credential: dict):
+        # reuse the session of the last run; a rejected token is replaced by a login on its first 401
+        session_cache = SessionCache(self._hass, credential)
+        client.set_session_listener(session_cache.async_save)
+        if (session := await session_cache.async_load()) is not None and client.restore_session(session):
+            _LOGGER.info("Reusing stored session for user: %s", credential["username"])
+        else:
+            await client.login()
+
+    def _host(self, base_url: str) -> _HostResources:
+        host = self._hosts.get(base_url)
+        if host is None or host.session.closed:
+            host = self._hosts[base_url] = _HostResources(
+                session=create_session(limit_per_host=SHARED_CONNECTION_LIMIT_PER_HOST),
+                signer=SHomeSigner(),
+            )
+        return host
+
+    async def _close_client(self, username: str, client: SHomeClient):
+        await client.close()
+        for url, host in list(self._hosts.items()):
+            if username not in host.usernames:
+                continue
+            host.usernames.remove(username)
+            if not host.usernames:
+                _LOGGER.debug("Closing connection pool of %s", url)
+                del self._hosts[url]
+                await host.session.close()
+
+    async def async_close(self):
+        """Close every client and connection pool, whatever their references."""
+        if self._unsub_close is not None:
+            self._unsub_close()
+            self._unsub_close = None
+        clients, self._clients = self._clients, {}
+        self._refs.clear()
+        for client in clients.values():
+            await client.close()
+        hosts, self._hosts = self._hosts, {}
+        for host in hosts.values():
+            await host.session.close()
+
+    async def _async_close_on_stop(self, event: Event):
+        # the listener is gone once it fired
+        self._unsub_close = None
+        await self.async_close()
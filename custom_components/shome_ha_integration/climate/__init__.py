@@ -28,15 +28,10 @@ async def async_setup_entry(
     if aircon_coordinator.data is None:
         await aircon_coordinator.async_request_refresh()
 
-    aircon_data = aircon_coordinator.data
-    if aircon_data:
-        for device_id, device_data in aircon_data.items():
-            for sub_device_num, aircon_device in device_data["sub_devices"].items():
-                climates.append(Aircon(aircon_coordinator, {
-                    "device_info": device_data.get("device_info", {}),
-                    "sub_device_num": sub_device_num,
-                    "sub_device_name": aircon_device.get("name")
-                }))
+    if aircon_coordinator.store:
+        for device in aircon_coordinator.store.values():
+            for zone in device.sub_devices.values():
+                climates.append(Aircon(aircon_coordinator, device, zone))
     else:
         _LOGGER.debug("No aircon data available")
 
@@ -45,15 +40,10 @@ async def async_setup_entry(
     if heater_coordinator.data is None:
         await heater_coordinator.async_request_refresh()
 
-    heater_data = heater_coordinator.data
-    if heater_data:
-        for device_id, device_data in heater_data.items():
-            for sub_device_num, heater_device in device_data["sub_devices"].items():
-                climates.append(Heater(heater_coordinator, {
-                    "device_info": device_data.get("device_info", {}),
-                    "sub_device_num": sub_device_num,
-                    "sub_device_name": heater_device.get("name")
-                }))
+    if heater_coordinator.store:
+        for device in heater_coordinator.store.values():
+            for zone in device.sub_devices.values():
+                climates.append(Heater(heater_coordinator, device, zone))
     else:
         _LOGGER.debug("No heater data available")
 
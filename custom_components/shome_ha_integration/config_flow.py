@@ -3,11 +3,12 @@ import logging
 import secrets
 
 from homeassistant import config_entries
+from homeassistant.core import callback
 import homeassistant.helpers.config_validation as cv
 import voluptuous as vol
 
-from .const import DOMAIN
-from .utils import get_or_create_client
+from .const import CONF_MAX_CONCURRENT_REQUESTS, DEFAULT_MAX_CONCURRENT_REQUESTS, DOMAIN, MAX_CONCURRENT_REQUESTS_RANGE
+from .utils import acquire_client, get_or_create_client, release_client
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -30,9 +31,13 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
     def __init__(self):
         self._credential: dict = {}
-        self._client = None
         self._devices = []
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: config_entries.ConfigEntry) -> config_entries.OptionsFlow:
+        return OptionsFlow()
+
     async def async_step_user(self, user_input=None):
         """Handle the initial step."""
         errors = {}
@@ -43,20 +48,20 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 "password": hashed_user_id,
                 "device_id": user_input["device_id"]
             }
-            _LOGGER.info("User attempting login with credential: %s", self._credential)
+            _LOGGER.info("User attempting login: %s", self._credential["username"])
 
+            # the flow only checks the login; the entry takes its own reference once set up
+            acquire_client(self.hass, self._credential)
             try:
-                # Import here to avoid circular import
-                
                 _LOGGER.debug("Attempting to authenticate user")
-                client = await get_or_create_client(self.hass, self._credential)
+                await get_or_create_client(self.hass, self._credential)
                 _LOGGER.info("Login successful")
-                
-                self._client = client   # Store for later use
             except Exception as e:
                 _LOGGER.error("Login failed - %s", str(e))
                 errors["base"] = "auth"
                 return self.async_show_form(step_id="user", data_schema=ACCOUNT_SCHEMA, errors=errors)
+            finally:
+                await release_client(self.hass, self._credential)
 
             await self.async_set_unique_id(self._credential['username'])
             self._abort_if_unique_id_configured()
@@ -68,3 +73,22 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             )
 
         return self.async_show_form(step_id="user", data_schema=ACCOUNT_SCHEMA, errors=errors)
+
+
+class OptionsFlow(config_entries.OptionsFlow):
+    """Polling options of an entry; saving them reloads the entry."""
+
+    async def async_step_init(self, user_input=None):
+        if user_input is not None:
+            return self.async_create_entry(title="", data=user_input)
+
+        current = self.config_entry.options.get(CONF_MAX_CONCURRENT_REQUESTS, DEFAULT_MAX_CONCURRENT_REQUESTS)
+        low, high = MAX_CONCURRENT_REQUESTS_RANGE
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema({
+                vol.Required(CONF_MAX_CONCURRENT_REQUESTS, default=current): vol.All(
+                    vol.Coerce(int), vol.Range(min=low, max=high)
+                ),
+            }),
+        )
@@ -2,3 +2,33 @@ DOMAIN = "shome_integration"
 
 CONF_USERNAME = "username"
 CONF_PASSWORD = "password"
+CONF_MAX_CONCURRENT_REQUESTS = "max_concurrent_requests"
+
+# Maximum number of wallpad device requests a coordinator keeps in flight during a refresh,
+# unless changed in the entry options (within the given range)
+DEFAULT_MAX_CONCURRENT_REQUESTS = 4
+MAX_CONCURRENT_REQUESTS_RANGE = (1, 16)
+
+# Post-command confirmation refreshes are collapsed into one, delayed at most this long (seconds)
+CONFIRMATION_REFRESH_MAX_DELAY = 10.0
+
+# Commanded values are shown until a refresh reports them, or for at most this long after the command was sent (seconds)
+OPTIMISTIC_STATE_TIMEOUT = 15.0
+
+# Single light toggles arriving within this window (seconds) are sent together as one batch
+LIGHT_BATCH_WINDOW = 0.2
+
+# Adaptive polling: interval right after user activity or a detected change, and the back-off ceiling (seconds)
+MIN_POLL_INTERVAL = 30.0
+MAX_POLL_INTERVAL = 900.0
+POLL_BACKOFF_FACTOR = 2.0
+
+# Polling requests per hour shared by all coordinators of one account
+POLL_REQUEST_BUDGET_PER_HOUR = 240
+
+# Device inventory cache in HA storage: schema version, and how long state changes are batched before a write (seconds)
+INVENTORY_CACHE_VERSION = 1
+INVENTORY_SAVE_DELAY = 60.0
+
+# Stored login session (cookies, access token) schema version
+SESSION_CACHE_VERSION = 1
@@ -1,81 +1,61 @@
 import logging
 
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers.debounce import Debouncer
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
-from ..shome_client.dto.aircon import SHomeAirconInfo
+from .base_coordinator import SHomeCoordinator
+from .payload_records import climate_records
+from .state_store import DeviceState, ClimateState
+from ..const import DEFAULT_MAX_CONCURRENT_REQUESTS
 from ..shome_client.dto.device import SHomeDevice
 from ..shome_client.dto.status import OnOffStatus
+from ..shome_client.scheduler import RequestPriority
+from ..shome_client.shome_client import SHomeClient
 from ..utils import get_or_create_client
 
 
 _LOGGER = logging.getLogger(__name__)
 
 
-class AirconCoordinator(DataUpdateCoordinator):
+class AirconCoordinator(SHomeCoordinator):
 
-    def __init__(self, hass: HomeAssistant, credential: dict, devices: list[SHomeDevice]):
+    _record_type = ClimateState
+
+    def __init__(
+            self,
+            hass: HomeAssistant,
+            credential: dict,
+            devices: list[SHomeDevice],
+            max_concurrency: int = DEFAULT_MAX_CONCURRENT_REQUESTS,
+    ):
         super().__init__(
             hass,
-            _LOGGER,
+            credential,
+            devices,
             name="aircon_coordinator",
-            update_method=self._async_update_data,
-            update_interval=None,
-            request_refresh_debouncer=Debouncer(
-                hass, _LOGGER, cooldown=1.0, immediate=False
-            )
+            max_concurrency=max_concurrency,
         )
-        self._hass = hass
-        self._credential = credential
-        self._devices = devices
 
-    def _init_data(self, aircon_devices: dict[SHomeDevice, list[SHomeAirconInfo]]):
+    def _init_data(self, aircon_devices: dict[SHomeDevice, dict]) -> dict[str, DeviceState]:
         result = {}
-        for device, device_aircons in aircon_devices.items():
-            result.setdefault(device.id, {
-                "device_info": {
-                    "id": device.unique_num,
-                    "name": device.nick_name,
-                    "shome_id": device.id,
-                    "model": device.model_name,
-                    "model_id": device.model_id,
-                    "created_at": device.created_at,
-                    "manufacturer": "SHome",
-                },
-                "sub_devices": {}
-            })
-            for aircon in device_aircons:
-                result[device.id]["sub_devices"][str(aircon.sub_device_num)] = {
-                    "name": aircon.sub_device_name,
-                    "on": aircon.on,
-                    "current_temperature": aircon.current_temp,
-                    "target_temperature": aircon.set_temp,
-                }
+        for device, payload in aircon_devices.items():
+            result[device.id] = DeviceState(meta=self._device_meta(device), sub_devices=climate_records(payload))
             _LOGGER.debug("Aircon device %s initialized with data: %s", device.id, result[device.id])
         return result
 
-    async def _async_update_data(self) -> dict:
-        _LOGGER.debug("Starting aircon _async_update_data, devices count: %d", len(self._devices))
-        try:
-            client = await get_or_create_client(self._hass, self._credential)
-            aircon_device_results: dict[SHomeDevice, list[SHomeAirconInfo]] = {}
-            for device in self._devices:
-                aircon_infos: list[SHomeAirconInfo] = await client.get_aircon_info(device.id)
-                aircon_device_results[device] = aircon_infos
-                _LOGGER.debug("Fetched aircon info for device %s: %s", device.id, aircon_infos)
-            return self._init_data(aircon_device_results)
-        except Exception as e:
-            _LOGGER.error("Error fetching aircon data: %s", e)
-            raise UpdateFailed(f"Error fetching aircon data: {e}") from e
+    async def _fetch_device(self, client: SHomeClient, device: SHomeDevice, priority: RequestPriority) -> dict:
+        payload = await client.get_device_payload("aircon_info", device.id, priority)
+        _LOGGER.debug("Fetched aircon info for device %s: %s", device.id, payload)
+        return payload
 
     async def toggle_aircon(self, device_id: str, sub_device_num: str, status: OnOffStatus):
         """에어컨 on/off 토글."""
         _LOGGER.debug("Toggling aircon %s sub-device %s to status %s", device_id, sub_device_num, status)
         try:
             client = await get_or_create_client(self._hass, self._credential)
-            await client.toggle_aircon(device_id, sub_device_num, status)
-            await self.async_request_refresh()
+            await self._command_queue.submit(
+                (device_id, sub_device_num), "on", status,
+                lambda value: client.toggle_aircon(device_id, sub_device_num, value)
+            )
             _LOGGER.debug("Successfully toggled aircon %s sub-device %s to status %s", device_id, sub_device_num, status)
         except Exception as e:
             _LOGGER.error("Error toggling aircon %s sub-device %s: %s", device_id, sub_device_num, e)
@@ -85,8 +65,11 @@ class AirconCoordinator(DataUpdateCoordinator):
         _LOGGER.debug("Setting aircon %s sub-device %s temperature to %d", device_id, sub_device_num, temperature)
         try:
             client = await get_or_create_client(self._hass, self._credential)
-            await client.set_aircon_temp(device_id, sub_device_num, temperature)
-            await self.async_request_refresh()
+            # only the latest target is sent; the entity schedules the confirmation refresh
+            await self._command_queue.submit(
+                (device_id, sub_device_num), "temperature", temperature,
+                lambda value: client.set_aircon_temp(device_id, sub_device_num, value)
+            )
             _LOGGER.debug("Successfully set aircon %s sub-device %s temperature to %d", device_id, sub_device_num, temperature)
         except Exception as e:
             _LOGGER.error("Error setting aircon %s sub-device %s temperature: %s", device_id, sub_device_num, e)
@@ -0,0 +1,380 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Iterable, Optional
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.debounce import Debouncer
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
+
+from .command_queue import DeviceCommandQueue
+from .optimistic_state import OptimisticState
+from .poll_scheduler import AdaptivePollScheduler
+from .refresh_scheduler import ConfirmationRefreshScheduler
+from .state_store import (
+    DeviceMeta, DeviceState, StateChanges, StateStore, SubDeviceState, context_changed, merge_changes
+)
+from ..const import (
+    CONFIRMATION_REFRESH_MAX_DELAY,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    MAX_POLL_INTERVAL,
+    MIN_POLL_INTERVAL,
+    POLL_BACKOFF_FACTOR,
+)
+from ..shome_client.circuit_breaker import CircuitOpenError
+from ..shome_client.dto.device import SHomeDevice
+from ..shome_client.scheduler import RequestExpiredError, RequestPriority
+from ..shome_client.shome_client import SHomeClient
+from ..utils import get_or_create_client, get_poll_budget
+
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def device_context(device_id: str, sub_device_ids: Optional[Iterable[str]] = None) -> tuple[str, Optional[frozenset[str]]]:
+    """Listener context binding an entity to a wallpad device (and optionally some of its sub-devices)."""
+    return device_id, frozenset(sub_device_ids) if sub_device_ids is not None else None
+
+
+class SHomeCoordinator(DataUpdateCoordinator[StateStore]):
+    """Common base for the per-platform coordinators.
+
+    Subclasses implement `_fetch_device` (one cloud call per wallpad device, returning the
+    decoded JSON payload) and `_init_data` (payload -> `DeviceState` records in one pass,
+    see `payload_records`). The base class fans the fetches out with at most
+    `max_concurrency` requests in flight.
+
+    Polling is adaptive: the interval drops to `min_poll_interval` after a command or
+    a poll that found changed state and backs off towards `max_poll_interval` while
+    nothing changes, within the request budget shared by the account's coordinators.
+
+    `data` is a `StateStore` that every refresh is merged into in place; entities keep
+    direct references to their records. Listeners are notified per sub-device: only
+    entities whose device context saw a changed value get a state write.
+
+    While the cloud's circuit breaker is open, refreshes keep the last-known state instead of
+    failing (`stale_since` is set) and the next poll waits for the circuit to allow a probe.
+    Polls are sent at the lowest request priority and confirmation refreshes above them;
+    polls the client's scheduler dropped as stale also keep the last-known state.
+
+    The store can be seeded from the inventory cache with `restore_state`, so entities
+    are created from the last-known state before the cloud has answered.
+
+    Entities send commands through `async_send_command`: the commanded values show at once,
+    are rolled back if the command fails, and win over stale refreshes until the wallpad
+    reports them or they expire (see `OptimisticState`).
+    """
+
+    # sub-device record type of this coordinator, used to rebuild cached state
+    _record_type: type[SubDeviceState] = SubDeviceState
+
+    def __init__(
+            self,
+            hass: HomeAssistant,
+            credential: dict,
+            devices: list[SHomeDevice],
+            name: str,
+            min_poll_interval: float = MIN_POLL_INTERVAL,
+            max_poll_interval: float = MAX_POLL_INTERVAL,
+            max_concurrency: int = DEFAULT_MAX_CONCURRENT_REQUESTS,
+    ):
+        super().__init__(
+            hass,
+            _LOGGER,
+            name=name,
+            update_method=self._async_update_data,
+            # nothing to poll when the wallpad has no device of this type
+            update_interval=timedelta(seconds=min_poll_interval) if devices else None,
+            request_refresh_debouncer=Debouncer(
+                hass, _LOGGER, cooldown=1.0, immediate=False
+            )
+        )
+        self._hass = hass
+        self._credential = credential
+        self._devices = devices
+        self._max_concurrency = max(1, max_concurrency)
+        self._confirmation_scheduler = ConfirmationRefreshScheduler(
+            hass, name, self._async_confirm, CONFIRMATION_REFRESH_MAX_DELAY
+        )
+        self._command_queue = DeviceCommandQueue(hass, name)
+        self._poll_scheduler = AdaptivePollScheduler(min_poll_interval, max_poll_interval, POLL_BACKOFF_FACTOR)
+        self._poll_budget = get_poll_budget(hass, credential)
+
+        self._store = StateStore()
+        self._optimistic = OptimisticState(clock=hass.loop.time)
+        # changes merged into the store since the listeners were last notified
+        self._pending_changes: StateChanges = {}
+        self._notified_success: Optional[bool] = None
+        self._listener_updates_sent = 0
+        self._listener_updates_avoided = 0
+        # device -> its DeviceMeta, so refreshes do not rebuild (and re-compare) new metadata objects
+        self._device_metas: dict[SHomeDevice, DeviceMeta] = {}
+        # when the data started being served from the store because the cloud was unreachable
+        self._stale_since: Optional[datetime] = None
+        # saves the store to the inventory cache, see InventoryCache.track
+        self._state_cache = None
+
+    @property
+    def has_devices(self) -> bool:
+        return bool(self._devices)
+
+    @property
+    def store(self) -> StateStore:
+        return self._store
+
+    @property
+    def devices(self) -> list[SHomeDevice]:
+        return self._devices
+
+    def set_state_cache(self, state_cache):
+        """Save the store through `state_cache.async_schedule_save()` whenever it changed."""
+        self._state_cache = state_cache
+
+    def replace_devices(self, devices: list[SHomeDevice]):
+        """Swap in a fresh copy of the same wallpad devices (e.g. renamed) fetched from the cloud."""
+        self._devices = devices
+        self._device_metas.clear()
+
+    @callback
+    def restore_state(self, cached: dict[str, dict]) -> bool:
+        """Seed the store with the cached state of this coordinator's devices.
+
+        Marks the data as loaded, so entities can be created right away. Returns whether
+        every device had a cached state.
+        """
+        restored = {
+            device.id: DeviceState.from_dict(cached[device.id], self._record_type)
+            for device in self._devices if device.id in cached
+        }
+        self._store.merge_all(restored)
+        self.async_set_updated_data(self._store)
+        _LOGGER.debug("[%s] restored %d of %d devices from cache", self.name, len(restored), len(self._devices))
+        return len(restored) == len(self._devices)
+
+    @property
+    def stale_since(self) -> Optional[datetime]:
+        """Since when the data is last-known state kept through a cloud outage, None when it is fresh."""
+        return self._stale_since
+
+    @property
+    def listener_update_stats(self) -> dict[str, int]:
+        """How many entity state writes were sent, and how many were skipped because nothing changed."""
+        return {
+            "sent": self._listener_updates_sent,
+            "avoided": self._listener_updates_avoided,
+        }
+
+    @property
+    def optimistic_stats(self) -> dict[str, int]:
+        return self._optimistic.as_dict()
+
+    @callback
+    def async_schedule_confirmation(self, delay: float, device_id: Optional[str] = None):
+        """Confirm a command with a refresh after `delay` seconds, merged with other pending confirmations.
+
+        With `device_id` only that wallpad device is refetched.
+        """
+        self._confirmation_scheduler.schedule(delay, device_id)
+        if self._devices:
+            # a command was sent: poll at the short interval again
+            self._set_poll_interval(self._poll_scheduler.record_activity())
+            if self._unsub_refresh is not None:
+                self._schedule_refresh()
+
+    @callback
+    def _set_poll_interval(self, interval: float):
+        interval = self._poll_budget.throttle(self, len(self._devices), interval)
+        self.update_interval = timedelta(seconds=interval)
+        _LOGGER.debug("[%s] polling every %.0f seconds", self.name, interval)
+
+    async def _async_confirm(self, device_ids: Optional[set[str]]):
+        if device_ids is None or self.data is None:
+            await self.async_refresh()
+        else:
+            await self.async_refresh_devices(device_ids)
+
+    async def async_refresh_devices(
+            self, device_ids: Iterable[str], priority: RequestPriority = RequestPriority.CONFIRMATION
+    ):
+        """Refetch only the given wallpad devices, merge them into `data` and notify their entities.
+
+        Used to confirm commands, so the requests are queued ahead of background polls by default.
+        """
+        device_ids = set(device_ids)
+        devices = [device for device in self._devices if device.id in device_ids]
+        if not devices:
+            return
+        if self.data is None:
+            await self.async_refresh()
+            return
+
+        _LOGGER.debug("[%s] partial refresh of %d devices", self.name, len(devices))
+        try:
+            client = await get_or_create_client(self._hass, self._credential)
+            results, failures = await self._fetch_devices(client, devices, priority)
+        except Exception as e:
+            _LOGGER.warning("[%s] partial refresh failed - %s", self.name, e)
+            return
+        for device, error in failures.items():
+            _LOGGER.warning("[%s] failed to refresh device %s (id: %s) - %s", self.name, device.nick_name, device.id, error)
+        if not results:
+            return
+
+        merge_changes(self._pending_changes, self._merge_fresh(self._init_data(results)))
+        self.async_update_listeners()
+
+    async def async_send_command(
+            self, device_id: str, sub_ids: Iterable[str], command: Awaitable[None], confirm_delay: float, **values
+    ):
+        """Send `command` for sub-devices of a wallpad device, showing its outcome `values` right away.
+
+        The records are set before the command is awaited. If it fails or is cancelled they
+        are rolled back and the error is re-raised; once it is sent a confirmation refresh is
+        scheduled `confirm_delay` seconds later.
+        """
+        expected = self._optimistic.expect(self._store, device_id, sub_ids, values)
+        self._notify_changed(device_id, expected.changed)
+        try:
+            await command
+        except BaseException:
+            # failed or cancelled (e.g. the command queue shut down): the command may never have been sent
+            self._notify_changed(device_id, self._optimistic.rollback(self._store, expected))
+            raise
+        self._optimistic.sent(expected)
+        self.async_schedule_confirmation(confirm_delay, device_id)
+
+    @callback
+    def _notify_changed(self, device_id: str, sub_ids: set[str]):
+        if sub_ids:
+            merge_changes(self._pending_changes, {device_id: sub_ids})
+            self.async_set_updated_data(self._store)
+
+    def _merge_fresh(self, fresh: dict[str, DeviceState]) -> StateChanges:
+        """Merge fetched devices into the store, keeping the values of commands the wallpad has not applied yet."""
+        overridden = self._optimistic.overlay(fresh)
+        changes = self._store.merge_all(fresh)
+        for device_id in overridden:
+            # look again once the expectation expired, in case the wallpad never applies the command
+            self._confirmation_scheduler.schedule(self._optimistic.next_expiry(device_id) + 1.0, device_id)
+        return changes
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Notify only the entities whose device or sub-device changed since the last notification.
+
+        Entities registered without a context are always notified, and everybody is
+        notified when availability (`last_update_success`) flipped.
+        """
+        changes, self._pending_changes = self._pending_changes, {}
+        if changes and self._state_cache is not None:
+            self._state_cache.async_schedule_save()
+        if self.last_update_success != self._notified_success:
+            changes = None
+        self._notified_success = self.last_update_success
+
+        sent = 0
+        listeners = list(self._listeners.values())
+        for update_callback, context in listeners:
+            if changes is None or context is None or context_changed(context, changes):
+                update_callback()
+                sent += 1
+        self._listener_updates_sent += sent
+        self._listener_updates_avoided += len(listeners) - sent
+        if sent < len(listeners):
+            _LOGGER.debug("[%s] notified %d of %d listeners", self.name, sent, len(listeners))
+
+    async def async_shutdown(self) -> None:
+        self._confirmation_scheduler.cancel()
+        self._command_queue.cancel()
+        self._poll_budget.release(self)
+        await super().async_shutdown()
+
+    def _init_data(self, device_results: dict[SHomeDevice, Any]) -> dict[str, DeviceState]:
+        raise NotImplementedError
+
+    def _device_meta(self, device: SHomeDevice) -> DeviceMeta:
+        meta = self._device_metas.get(device)
+        if meta is None:
+            meta = self._device_metas[device] = DeviceMeta.from_device(device)
+        return meta
+
+    async def _fetch_device(self, client: SHomeClient, device: SHomeDevice, priority: RequestPriority) -> Any:
+        raise NotImplementedError
+
+    async def _fetch_devices(
+            self, client: SHomeClient, devices: list[SHomeDevice], priority: RequestPriority = RequestPriority.POLL
+    ) -> tuple[dict[SHomeDevice, Any], dict[SHomeDevice, Exception]]:
+        """Fetch the devices concurrently, bounded by `max_concurrency`.
+
+        Returns (results, failures) so one failing device does not drop the others.
+        """
+        semaphore = asyncio.Semaphore(self._max_concurrency)
+
+        async def _fetch(device: SHomeDevice):
+            async with semaphore:
+                _LOGGER.debug("[%s] fetching device: %s (id: %s)", self.name, device.nick_name, device.id)
+                return await self._fetch_device(client, device, priority)
+
+        responses = await asyncio.gather(*(_fetch(device) for device in devices), return_exceptions=True)
+
+        results: dict[SHomeDevice, Any] = {}
+        failures: dict[SHomeDevice, Exception] = {}
+        for device, response in zip(devices, responses):
+            if isinstance(response, Exception):
+                failures[device] = response
+            elif isinstance(response, BaseException):
+                # CancelledError and friends must not be swallowed
+                raise response
+            else:
+                results[device] = response
+        return results, failures
+
+    async def _async_update_data(self) -> StateStore:
+        _LOGGER.debug("Starting %s _async_update_data, devices count: %d", self.name, len(self._devices))
+        if not self._devices:
+            return self._store
+
+        try:
+            client = await get_or_create_client(self._hass, self._credential)
+            results, failures = await self._fetch_devices(client, self._devices)
+        except Exception as e:
+            _LOGGER.error("Error updating %s data: %s", self.name, e)
+            raise UpdateFailed(str(e)) from e
+
+        if failures and not results:
+            error = next(iter(failures.values()))
+            if isinstance(error, CircuitOpenError) and self._store:
+                return self._serve_stale(error)
+            if isinstance(error, RequestExpiredError) and self._store:
+                # the account is overloaded and the polls were shed; the next one tries again
+                _LOGGER.warning("[%s] %s; keeping last-known state", self.name, error)
+                return self._store
+            _LOGGER.error("Error updating %s data, all %d devices failed: %s", self.name, len(failures), error)
+            raise UpdateFailed(str(error)) from error
+
+        # devices which failed this round are not merged, so they keep their last-known state
+        for device, error in failures.items():
+            _LOGGER.warning("[%s] failed to fetch device %s (id: %s), keeping last-known state - %s",
+                            self.name, device.nick_name, device.id, error)
+        changes = self._merge_fresh(self._init_data(results))
+        merge_changes(self._pending_changes, changes)
+        if self._stale_since is not None:
+            _LOGGER.info("[%s] cloud reachable again, data is fresh", self.name)
+            self._stale_since = None
+
+        # back off while the polled state stays the same
+        self._set_poll_interval(self._poll_scheduler.record_poll(bool(changes)))
+
+        _LOGGER.debug("Fetched %s data for %d devices (%d failed), %d changed",
+                      self.name, len(results), len(failures), len(changes))
+        return self._store
+
+    def _serve_stale(self, error: CircuitOpenError) -> StateStore:
+        """Keep the entities on their last-known state while the circuit is open."""
+        if self._stale_since is None:
+            self._stale_since = dt_util.utcnow()
+            _LOGGER.warning("[%s] %s; keeping last-known state", self.name, error)
+        # no point polling before the breaker lets a probe through
+        self._set_poll_interval(max(self._poll_scheduler.interval, error.retry_after))
+        return self._store
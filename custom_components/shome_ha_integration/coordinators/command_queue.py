@@ -0,0 +1,102 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Hashable, Optional
+
+from homeassistant.core import HomeAssistant, callback
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class _PendingCommand:
+
+    def __init__(self, value: Any, send: Callable[[Any], Awaitable[None]]):
+        self.value = value
+        self.send = send
+        self.waiters: list[asyncio.Future] = []
+
+
+class DeviceCommandQueue:
+    """Serializes commands per (device_id, sub_device_id) with last-write-wins coalescing.
+
+    Only one command per sub-device is in flight at a time. While it runs, newer values
+    for the same attribute replace the pending one, so a burst of slider moves ends up as
+    the command in flight plus the final value. Callers whose value was superseded are
+    resolved together with the command that replaced it.
+    """
+
+    def __init__(self, hass: HomeAssistant, name: str):
+        self._hass = hass
+        self._name = name
+        self._pending: dict[Hashable, dict[str, _PendingCommand]] = {}
+        # key -> the command being sent, no longer in `_pending`
+        self._in_flight: dict[Hashable, _PendingCommand] = {}
+        self._workers: dict[Hashable, asyncio.Task] = {}
+
+    async def submit(self, key: Hashable, attribute: str, value: Any, send: Callable[[Any], Awaitable[None]]):
+        """Queue `send(value)` for `attribute` of `key` and wait until it (or a newer value) is sent."""
+        pending = self._pending.setdefault(key, {})
+        command = pending.get(attribute)
+        if command is None:
+            command = pending[attribute] = _PendingCommand(value, send)
+        else:
+            _LOGGER.debug("[%s] %s %s: %s superseded by %s", self._name, key, attribute, command.value, value)
+            command.value = value
+            command.send = send
+
+        waiter = self._hass.loop.create_future()
+        command.waiters.append(waiter)
+        if key not in self._workers:
+            self._workers[key] = self._hass.async_create_task(self._run(key))
+        await waiter
+
+    async def _run(self, key: Hashable):
+        try:
+            while pending := self._pending.get(key):
+                # oldest attribute first, so on-off and temperature keep their submission order
+                attribute = next(iter(pending))
+                command = self._in_flight[key] = pending.pop(attribute)
+                try:
+                    await command.send(command.value)
+                except Exception as e:
+                    self._resolve(command, e)
+                except BaseException:
+                    # cancelled: nobody may be left waiting for a command that will never report back
+                    self._cancel_waiters(command)
+                    raise
+                else:
+                    self._resolve(command, None)
+                finally:
+                    self._in_flight.pop(key, None)
+        finally:
+            for command in self._pending.pop(key, {}).values():
+                self._cancel_waiters(command)
+            self._workers.pop(key, None)
+
+    @staticmethod
+    def _resolve(command: _PendingCommand, error: Optional[Exception]):
+        for waiter in command.waiters:
+            if waiter.done():
+                continue
+            if error is None:
+                waiter.set_result(None)
+            else:
+                waiter.set_exception(error)
+
+    @staticmethod
+    def _cancel_waiters(command: _PendingCommand):
+        for waiter in command.waiters:
+            waiter.cancel()
+
+    @callback
+    def cancel(self):
+        """Cancel every queued and in-flight command; their callers get `CancelledError`."""
+        for pending in self._pending.values():
+            for command in pending.values():
+                self._cancel_waiters(command)
+        for command in self._in_flight.values():
+            self._cancel_waiters(command)
+        self._pending = {}
+        self._in_flight = {}
+        for worker in list(self._workers.values()):
+            worker.cancel()
+        self._workers = {}
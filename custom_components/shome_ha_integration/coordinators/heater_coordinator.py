@@ -1,81 +1,61 @@
 import logging
 
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers.debounce import Debouncer
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
-from ..shome_client.dto.heater import SHomeHeaterInfo
+from .base_coordinator import SHomeCoordinator
+from .payload_records import climate_records
+from .state_store import DeviceState, ClimateState
+from ..const import DEFAULT_MAX_CONCURRENT_REQUESTS
 from ..shome_client.dto.device import SHomeDevice
 from ..shome_client.dto.status import OnOffStatus
+from ..shome_client.scheduler import RequestPriority
+from ..shome_client.shome_client import SHomeClient
 from ..utils import get_or_create_client
 
 
 _LOGGER = logging.getLogger(__name__)
 
 
-class HeaterCoordinator(DataUpdateCoordinator):
+class HeaterCoordinator(SHomeCoordinator):
 
-    def __init__(self, hass: HomeAssistant, credential: dict, devices: list[SHomeDevice]):
+    _record_type = ClimateState
+
+    def __init__(
+            self,
+            hass: HomeAssistant,
+            credential: dict,
+            devices: list[SHomeDevice],
+            max_concurrency: int = DEFAULT_MAX_CONCURRENT_REQUESTS,
+    ):
         super().__init__(
             hass,
-            _LOGGER,
+            credential,
+            devices,
             name="heater_coordinator",
-            update_method=self._async_update_data,
-            update_interval=None,
-            request_refresh_debouncer=Debouncer(
-                hass, _LOGGER, cooldown=1.0, immediate=False
-            )
+            max_concurrency=max_concurrency,
         )
-        self._hass = hass
-        self._credential = credential
-        self._devices = devices
 
-    def _init_data(self, heater_devices: dict[SHomeDevice, list[SHomeHeaterInfo]]):
+    def _init_data(self, heater_devices: dict[SHomeDevice, dict]) -> dict[str, DeviceState]:
         result = {}
-        for device, device_heaters in heater_devices.items():
-            result.setdefault(device.id, {
-                "device_info": {
-                    "id": device.unique_num,
-                    "name": device.nick_name,
-                    "shome_id": device.id,
-                    "model": device.model_name,
-                    "model_id": device.model_id,
-                    "created_at": device.created_at,
-                    "manufacturer": "SHome",
-                },
-                "sub_devices": {}
-            })
-            for heater in device_heaters:
-                result[device.id]["sub_devices"][str(heater.sub_device_num)] = {
-                    "name": heater.sub_device_name,
-                    "on": heater.on,
-                    "current_temperature": heater.current_temp,
-                    "target_temperature": heater.set_temp,
-                }
+        for device, payload in heater_devices.items():
+            result[device.id] = DeviceState(meta=self._device_meta(device), sub_devices=climate_records(payload))
             _LOGGER.debug("Heater device %s initialized with data: %s", device.id, result[device.id])
         return result
 
-    async def _async_update_data(self) -> dict:
-        _LOGGER.debug("Starting heater _async_update_data, devices count: %d", len(self._devices))
-        try:
-            client = await get_or_create_client(self._hass, self._credential)
-            heater_device_results: dict[SHomeDevice, list[SHomeHeaterInfo]] = {}
-            for device in self._devices:
-                heater_infos: list[SHomeHeaterInfo] = await client.get_heater_info(device.id)
-                heater_device_results[device] = heater_infos
-                _LOGGER.debug("Fetched heater info for device %s: %s", device.id, heater_infos)
-            return self._init_data(heater_device_results)
-        except Exception as e:
-            _LOGGER.error("Error fetching heater data: %s", e)
-            raise UpdateFailed(f"Error fetching heater data: {e}") from e
+    async def _fetch_device(self, client: SHomeClient, device: SHomeDevice, priority: RequestPriority) -> dict:
+        payload = await client.get_device_payload("heater_info", device.id, priority)
+        _LOGGER.debug("Fetched heater info for device %s: %s", device.id, payload)
+        return payload
 
     async def toggle_heater(self, device_id: str, sub_device_num: str, status: OnOffStatus):
         """에어컨 on/off 토글."""
         _LOGGER.debug("Toggling heater %s sub-device %s to status %s", device_id, sub_device_num, status)
         try:
             client = await get_or_create_client(self._hass, self._credential)
-            await client.toggle_heater(device_id, sub_device_num, status)
-            await self.async_request_refresh()
+            await self._command_queue.submit(
+                (device_id, sub_device_num), "on", status,
+                lambda value: client.toggle_heater(device_id, sub_device_num, value)
+            )
             _LOGGER.debug("Successfully toggled heater %s sub-device %s to status %s", device_id, sub_device_num, status)
         except Exception as e:
             _LOGGER.error("Error toggling heater %s sub-device %s: %s", device_id, sub_device_num, e)
@@ -85,8 +65,11 @@ class HeaterCoordinator(DataUpdateCoordinator):
         _LOGGER.debug("Setting heater %s sub-device %s temperature to %d", device_id, sub_device_num, temperature)
         try:
             client = await get_or_create_client(self._hass, self._credential)
-            await client.set_heater_temp(device_id, sub_device_num, temperature)
-            await self.async_request_refresh()
+            # only the latest target is sent; the entity schedules the confirmation refresh
+            await self._command_queue.submit(
+                (device_id, sub_device_num), "temperature", temperature,
+                lambda value: client.set_heater_temp(device_id, sub_device_num, value)
+            )
             _LOGGER.debug("Successfully set heater %s sub-device %s temperature to %d", device_id, sub_device_num, temperature)
         except Exception as e:
             _LOGGER.error("Error setting heater %s sub-device %s temperature: %s", device_id, sub_device_num, e)
@@ -0,0 +1,141 @@
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Optional
+
+from homeassistant.core import HomeAssistant, callback
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class LightCommandPlan:
+    """Cloud calls reaching a requested light state: `all_on` first, then rooms and singles."""
+    all_on: Optional[bool] = None
+    rooms: list[tuple[str, bool]] = field(default_factory=list)
+    singles: list[tuple[str, bool]] = field(default_factory=list)
+
+    @property
+    def call_count(self) -> int:
+        return (0 if self.all_on is None else 1) + len(self.rooms) + len(self.singles)
+
+
+def plan_light_commands(current: dict[str, bool], groups: dict[str, list[str]], requested: dict[str, bool]) -> LightCommandPlan:
+    """Find the fewest all/room/single calls that turn `current` into `current` + `requested`.
+
+    Lights that were not requested keep their current value, so a room (or all) call is only
+    used when every light it touches should end up in the same state. `current` must cover
+    every light such a call touches: a room with a light missing from it is not called, and
+    the all-call is only used when `current` knows every requested light, i.e. the whole panel.
+    Otherwise the lights are toggled one by one.
+    """
+    target = {**current, **requested}
+    best: Optional[LightCommandPlan] = None
+    # the all-call switches the whole panel, so it needs a state of the whole panel
+    panel_known = bool(current) and all(light_id in current for light_id in requested)
+
+    for all_on in ((None, True, False) if panel_known else (None,)):
+        state = {light_id: current.get(light_id) if all_on is None else all_on for light_id in target}
+        rooms = []
+        while True:
+            # greedily take the room call that fixes the most lights, as long as it fixes at least two
+            best_room, best_fixes = None, 1
+            for group_id, members in groups.items():
+                if not members or any(member not in current for member in members):
+                    continue
+                room_on = target[members[0]]
+                if any(target[member] != room_on for member in members):
+                    continue
+                fixes = sum(1 for member in members if state[member] != room_on)
+                if fixes > best_fixes:
+                    best_room, best_fixes = (group_id, room_on), fixes
+            if best_room is None:
+                break
+            rooms.append(best_room)
+            for member in groups[best_room[0]]:
+                state[member] = best_room[1]
+
+        singles = [(light_id, on) for light_id, on in target.items() if state[light_id] != on]
+        plan = LightCommandPlan(all_on=all_on, rooms=rooms, singles=singles)
+        if best is None or plan.call_count < best.call_count:
+            best = plan
+    return best
+
+
+class LightCommandBatcher:
+    """Collects single-light toggles that arrive within `window` seconds and sends them as one plan.
+
+    `get_state` returns (current on/off per light, group members per room) for a wallpad device,
+    `execute` sends a `LightCommandPlan` for it.
+    """
+
+    def __init__(
+            self,
+            hass: HomeAssistant,
+            name: str,
+            get_state: Callable[[str], tuple[dict[str, bool], dict[str, list[str]]]],
+            execute: Callable[[str, LightCommandPlan], Awaitable[None]],
+            window: float,
+    ):
+        self._hass = hass
+        self._name = name
+        self._get_state = get_state
+        self._execute = execute
+        self._window = window
+        self._requested: dict[str, dict[str, bool]] = {}
+        self._waiters: dict[str, list[asyncio.Future]] = {}
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: set[asyncio.Task] = set()
+
+    async def submit(self, device_id: str, light_id: str, on: bool):
+        """Queue a toggle and wait until the batch containing it has been sent."""
+        self._requested.setdefault(device_id, {})[light_id] = on
+        waiter = self._hass.loop.create_future()
+        self._waiters.setdefault(device_id, []).append(waiter)
+        if self._timer is None:
+            self._timer = self._hass.loop.call_later(self._window, self._flush)
+        await waiter
+
+    @callback
+    def _flush(self):
+        self._timer = None
+        requested, self._requested = self._requested, {}
+        waiters, self._waiters = self._waiters, {}
+        for device_id, lights in requested.items():
+            task = self._hass.async_create_task(self._send(device_id, lights, waiters.get(device_id, [])))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _send(self, device_id: str, requested: dict[str, bool], waiters: list[asyncio.Future]):
+        try:
+            current, groups = self._get_state(device_id)
+            plan = plan_light_commands(current, groups, requested)
+            _LOGGER.debug("[%s] %d light toggles on %s sent as %d calls: %s",
+                          self._name, len(requested), device_id, plan.call_count, plan)
+            await self._execute(device_id, plan)
+        except Exception as e:
+            for waiter in waiters:
+                if not waiter.done():
+                    waiter.set_exception(e)
+        except BaseException:
+            # cancelled: the batch may never be sent, nobody may be left waiting for it
+            for waiter in waiters:
+                waiter.cancel()
+            raise
+        else:
+            for waiter in waiters:
+                if not waiter.done():
+                    waiter.set_result(None)
+
+    @callback
+    def cancel(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        for waiters in self._waiters.values():
+            for waiter in waiters:
+                waiter.cancel()
+        self._requested = {}
+        self._waiters = {}
+        for task in self._tasks:
+            task.cancel()
@@ -1,14 +1,20 @@
+import asyncio
 import logging
 from enum import Enum
 
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers.debounce import Debouncer
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.helpers.update_coordinator import UpdateFailed
 
+from .base_coordinator import SHomeCoordinator
+from .light_command_batcher import LightCommandBatcher, LightCommandPlan
+from .payload_records import light_records
+from .state_store import DeviceState, LightState
 # top-level imports
-from ..shome_client.dto.light import SHomeLightInfo
 from ..shome_client.dto.status import OnOffStatus
 from ..shome_client.dto.device import SHomeDevice
+from ..shome_client.scheduler import RequestPriority
+from ..shome_client.shome_client import SHomeClient
+from ..const import DEFAULT_MAX_CONCURRENT_REQUESTS, LIGHT_BATCH_WINDOW
 from ..utils import get_or_create_client
 
 _LOGGER = logging.getLogger(__name__)
@@ -20,77 +26,74 @@ class LightToggleType(Enum):
     SINGLE = "SINGLE"
 
 
-class LightsCoordinator(DataUpdateCoordinator[dict]):
+class LightsCoordinator(SHomeCoordinator):
 
-    def __init__(self, hass: HomeAssistant, credential: dict, devices: list[SHomeDevice]):
+    _record_type = LightState
+
+    def __init__(
+            self,
+            hass: HomeAssistant,
+            credential: dict,
+            devices: list[SHomeDevice],
+            max_concurrency: int = DEFAULT_MAX_CONCURRENT_REQUESTS,
+    ):
         super().__init__(
             hass,
-            _LOGGER,
+            credential,
+            devices,
             name="light_coordinator",
-            update_method=self._async_update_data,
-            update_interval=None,
-            request_refresh_debouncer=Debouncer(
-                hass, _LOGGER, cooldown=1.0, immediate=False
-            )
+            max_concurrency=max_concurrency,
+        )
+        self._batcher = LightCommandBatcher(
+            hass, "light_coordinator", self._get_batch_state, self._execute_plan, LIGHT_BATCH_WINDOW
         )
-        self._hass = hass
-        self._credential = credential
-        self._devices = devices
 
-    def _init_data(self, light_devices: dict[SHomeDevice, SHomeLightInfo]):
+    async def async_shutdown(self) -> None:
+        self._batcher.cancel()
+        await super().async_shutdown()
+
+    def _init_data(self, light_devices: dict[SHomeDevice, dict]) -> dict[str, DeviceState]:
         result = {}
-        for device, light_info in light_devices.items():
-            groups = {}
-            for group in light_info.groups:
-                groups[str(group.group_id)] = {
-                    "name": group.nick_name,
-                    "devices": group.devices,
-                }
-            sub_devices = {}
-            for light in light_info.devices:
-                sub_devices[str(light.id)] = {
-                    "name": light.nick_name,
-                    "on": light.on
-                }
-            result[device.id] = {
-                "group_info": groups,
-                "sub_device_info": sub_devices,
-                "device_info": {
-                    "id": device.unique_num,
-                    "name": device.nick_name,
-                    "shome_id": device.id,
-                    "model": device.model_name,
-                    "model_id": device.model_id,
-                    "created_at": device.created_at,
-                    "root_device_id": device.root_id,
-                    "type": device.model_type_id
-                }
-            }
+        for device, payload in light_devices.items():
+            lights, groups = light_records(payload)
+            result[device.id] = DeviceState(meta=self._device_meta(device), sub_devices=lights, groups=groups)
             _LOGGER.debug("Light device %s initialized with info: %s", device.id, result[device.id])
         return result
 
-    async def _async_update_data(self) -> dict:
-        _LOGGER.debug("Starting _async_update_data, devices count: %d", len(self._devices))
-        try:
-            client = await get_or_create_client(self._hass, self._credential)
-            light_device_results: dict[SHomeDevice, SHomeLightInfo] = {}
-            for device in self._devices:
-                _LOGGER.debug("Fetching light info for device: %s (id: %s)", device.nick_name, device.id)
-                light_info = await client.get_light_info(device.id)
-                light_device_results[device] = light_info
-            _LOGGER.debug("Fetched light info for %d devices", len(light_device_results))
-            return self._init_data(light_device_results)
-        except Exception as e:
-            raise UpdateFailed(str(e)) from e
+    async def _fetch_device(self, client: SHomeClient, device: SHomeDevice, priority: RequestPriority) -> dict:
+        return await client.get_device_payload("get_light_info", device.id, priority)
 
     async def toggle_light(self, light_shome_id: str, light_type: LightToggleType, light_id: str, state: OnOffStatus):
         try:
+            if light_type == LightToggleType.SINGLE:
+                # single toggles from scenes arrive in bursts; batch them into the fewest calls
+                await self._batcher.submit(light_shome_id, light_id, state == OnOffStatus.ON)
+                return
             client = await get_or_create_client(self._hass, self._credential)
             if light_type == LightToggleType.ALL:
                 await client.toggle_all_light(light_shome_id, state)
             if light_type == LightToggleType.ROOM:
                 await client.toggle_room_light(light_shome_id, light_id, state)
-            if light_type == LightToggleType.SINGLE:
-                await client.toggle_single_light(light_shome_id, light_id, state)
         except Exception as e:
             raise UpdateFailed(str(e)) from e
+
+    def _get_batch_state(self, light_shome_id: str) -> tuple[dict[str, bool], dict[str, list[str]]]:
+        device = self._store.get(light_shome_id)
+        if device is None:
+            return {}, {}
+        # plan against what the wallpad has, not against the optimistic values of pending toggles
+        current = {light_id: self._optimistic.known_value(light_shome_id, light_id, "on", light.on)
+                   for light_id, light in device.sub_devices.items()}
+        groups = {group_id: list(group.members) for group_id, group in device.groups.items()}
+        return current, groups
+
+    async def _execute_plan(self, light_shome_id: str, plan: LightCommandPlan):
+        client = await get_or_create_client(self._hass, self._credential)
+        if plan.all_on is not None:
+            await client.toggle_all_light(light_shome_id, OnOffStatus.ON if plan.all_on else OnOffStatus.OFF)
+        await asyncio.gather(
+            *(client.toggle_room_light(light_shome_id, room_id, OnOffStatus.ON if on else OnOffStatus.OFF)
+              for room_id, on in plan.rooms),
+            *(client.toggle_single_light(light_shome_id, light_id, OnOffStatus.ON if on else OnOffStatus.OFF)
+              for light_id, on in plan.singles),
+        )
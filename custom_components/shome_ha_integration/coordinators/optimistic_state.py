@@ -0,0 +1,156 @@
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable, Optional
+
+from .state_store import DeviceState, StateChanges, StateStore
+from ..const import OPTIMISTIC_STATE_TIMEOUT
+
+_LOGGER = logging.getLogger(__name__)
+
+# (device_id, sub_id, field name)
+_Key = tuple[str, str, str]
+
+
+@dataclass(slots=True)
+class _Expectation:
+    command: 'OptimisticCommand'
+    value: Any
+    # last value known to be on the wallpad: the polled one, or the last value a command delivered
+    known: Any
+    expires_at: float
+    delivered: bool = False
+
+
+@dataclass(eq=False, slots=True)
+class OptimisticCommand:
+    """Handle of one command's expectations, returned by `OptimisticState.expect`."""
+    device_id: str
+    keys: list[_Key] = field(default_factory=list)
+    # sub-devices whose records were changed when the command was expected
+    changed: set[str] = field(default_factory=set)
+
+
+class OptimisticState:
+    """Values the coordinator's commands are expected to produce, until the wallpad reports them.
+
+    `expect` writes the commanded values into the store records right away and remembers
+    them per field. Refreshes are passed through `overlay` before they are merged: a polled
+    value that matches the expectation confirms it, one that disagrees is stale (the wallpad
+    has not applied the command yet) and is replaced by the expected value, so the entity
+    does not flap back and forth. An expectation the wallpad has not confirmed within
+    `timeout` seconds of its command is dropped and the polled value wins. When the command
+    fails, `rollback` restores the last known value, unless a newer command took the field over.
+    """
+
+    def __init__(self, timeout: float = OPTIMISTIC_STATE_TIMEOUT, clock: Callable[[], float] = time.monotonic):
+        self._timeout = timeout
+        self._clock = clock
+        self._expectations: dict[_Key, _Expectation] = {}
+        self._confirmed = 0
+        self._suppressed = 0
+        self._expired = 0
+        self._rolled_back = 0
+
+    def expect(self, store: StateStore, device_id: str, sub_ids: Iterable[str], values: dict[str, Any]) -> OptimisticCommand:
+        """Set `values` on the sub-device records and expect the wallpad to report them."""
+        command = OptimisticCommand(device_id)
+        device = store.get(device_id)
+        if device is None:
+            return command
+        expires_at = self._clock() + self._timeout
+        for sub_id in sub_ids:
+            record = device.sub_devices.get(sub_id)
+            if record is None:
+                continue
+            for name, value in values.items():
+                key = (device_id, sub_id, name)
+                previous = self._expectations.get(key)
+                known = previous.known if previous is not None else getattr(record, name)
+                self._expectations[key] = _Expectation(command, value, known, expires_at)
+                command.keys.append(key)
+            if record.update(**values):
+                command.changed.add(sub_id)
+        return command
+
+    def sent(self, command: OptimisticCommand):
+        """The command was delivered: its values are now the known ones, and the timeout restarts."""
+        expires_at = self._clock() + self._timeout
+        for key in command.keys:
+            expectation = self._expectations.get(key)
+            if expectation is not None and expectation.command is command:
+                expectation.known = expectation.value
+                expectation.delivered = True
+                expectation.expires_at = expires_at
+
+    def rollback(self, store: StateStore, command: OptimisticCommand) -> set[str]:
+        """The command failed: restore the fields it still owns, return the changed sub-device ids."""
+        changed: set[str] = set()
+        for key in command.keys:
+            expectation = self._expectations.get(key)
+            if expectation is None or expectation.command is not command:
+                # confirmed, expired or taken over by a newer command
+                continue
+            del self._expectations[key]
+            device_id, sub_id, name = key
+            record = store.sub_device(device_id, sub_id)
+            if record is not None and record.update(**{name: expectation.known}):
+                changed.add(sub_id)
+        if changed:
+            self._rolled_back += 1
+            _LOGGER.debug("rolled back command on %s: %s", command.device_id, sorted(changed))
+        return changed
+
+    def known_value(self, device_id: str, sub_id: str, name: str, current: Any) -> Any:
+        """Value of a field on the wallpad as far as known, `current` when nothing is expected."""
+        expectation = self._expectations.get((device_id, sub_id, name))
+        return expectation.known if expectation is not None else current
+
+    def overlay(self, fresh: dict[str, DeviceState]) -> StateChanges:
+        """Reconcile freshly fetched devices with the expectations before they are merged.
+
+        Returns the sub-devices whose polled value was overridden; their expectations are
+        still pending, see `next_expiry`.
+        """
+        if not self._expectations:
+            return {}
+        now = self._clock()
+        overridden: StateChanges = {}
+        for key in [key for key in self._expectations if key[0] in fresh]:
+            device_id, sub_id, name = key
+            expectation = self._expectations[key]
+            record = fresh[device_id].sub_devices.get(sub_id)
+            if record is None:
+                del self._expectations[key]
+                continue
+            polled = getattr(record, name)
+            if polled == expectation.value:
+                del self._expectations[key]
+                self._confirmed += 1
+            elif now >= expectation.expires_at:
+                del self._expectations[key]
+                self._expired += 1
+                _LOGGER.debug("%s %s %s: expected %s expired, wallpad reports %s",
+                              device_id, sub_id, name, expectation.value, polled)
+            else:
+                if not expectation.delivered:
+                    # not delivered yet: the poll is the latest word on the wallpad's value
+                    expectation.known = polled
+                setattr(record, name, expectation.value)
+                self._suppressed += 1
+                overridden.setdefault(device_id, set()).add(sub_id)
+        return overridden
+
+    def next_expiry(self, device_id: str) -> Optional[float]:
+        """Seconds until the first pending expectation of the device expires, None when there is none."""
+        expiries = [expectation.expires_at for key, expectation in self._expectations.items() if key[0] == device_id]
+        return max(0.0, min(expiries) - self._clock()) if expiries else None
+
+    def as_dict(self) -> dict:
+        return {
+            "pending": len(self._expectations),
+            "confirmed": self._confirmed,
+            "suppressed": self._suppressed,
+            "expired": self._expired,
+            "rolled_back": self._rolled_back,
+        }
@@ -0,0 +1,78 @@
+"""Device info payloads -> state records, in one pass.
+
+The coordinators build their `DeviceState`s straight from the decoded JSON instead of going
+through the `shome_client.dto` dataclasses first; the keys read here are the ones the DTO
+parsers read. Nothing here imports Home Assistant or the client, so the module can be
+benchmarked on its own.
+"""
+from typing import Optional
+
+from .state_store import ClimateState, LightGroup, LightState, SensorState, VentilationState, records_by_id, sub_device_id
+
+
+def light_records(payload: dict) -> tuple[dict[str, LightState], dict[str, LightGroup]]:
+    """`get_light_info` payload -> (lights, rooms)."""
+    lights = records_by_id(
+        LightState(
+            sub_id=sub_device_id(light.get("deviceId", 0)),
+            name=light.get("nickname", ""),
+            on=light.get("deviceStatus", 0) == 1,
+        )
+        for light in payload.get("deviceInfoList", [])
+    )
+    groups = {}
+    for group in payload.get("groupInfo", []):
+        group_id = str(group.get("groupId", 0))
+        groups[group_id] = LightGroup(
+            group_id=group_id,
+            name=group.get("nickname", ""),
+            members=tuple(sub_device_id(light_id) for light_id in group.get("deviceList", [])),
+        )
+    return lights, groups
+
+
+def climate_records(payload: dict) -> dict[str, ClimateState]:
+    """`aircon_info` / `heater_info` payload -> zones."""
+    return records_by_id(
+        ClimateState(
+            sub_id=sub_device_id(zone.get("deviceId", 0)),
+            name=zone.get("nickname", ""),
+            on=zone.get("deviceStatus", 0) != 0,
+            current_temperature=zone.get("currentTemp", 0),
+            target_temperature=zone.get("setTemp", 0),
+        )
+        for zone in payload.get("deviceInfoList", [])
+    )
+
+
+def _number(value, number_type) -> Optional[float]:
+    # readings arrive as numbers or numeric strings, and are missing when the sensor lacks them
+    return number_type(value) if value is not None else None
+
+
+def sensor_records(payload: dict) -> dict[str, SensorState]:
+    """`sensor_info` payload -> sensors."""
+    return records_by_id(
+        SensorState(
+            sub_id=sub_device_id(sensor.get("deviceId")),
+            name=sensor.get("nickname", ""),
+            temperature=_number(sensor.get("temperature"), float),
+            humidity=_number(sensor.get("humidity"), int),
+            co2=_number(sensor.get("co2"), int),
+            pm10=_number(sensor.get("fineDust"), int),
+        )
+        for sensor in payload.get("deviceInfoList", [])
+    )
+
+
+def ventilation_records(payload: dict) -> dict[str, VentilationState]:
+    """`ventilation_info` payload -> ventilators."""
+    return records_by_id(
+        VentilationState(
+            sub_id=sub_device_id(ventilation.get("deviceId", 0)),
+            name=ventilation.get("nickname", ""),
+            # a `VentilationSpeed` value
+            speed=ventilation.get("windSpeedMode", 0),
+        )
+        for ventilation in payload.get("deviceInfoList", [])
+    )
@@ -0,0 +1,66 @@
+import logging
+from typing import Hashable
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class AdaptivePollScheduler:
+    """Picks the next poll interval of a coordinator from what the previous polls saw.
+
+    User activity or a poll that found changed state drops the interval to `minimum`;
+    every poll without changes multiplies it by `backoff_factor`, up to `maximum`.
+    """
+
+    def __init__(self, minimum: float, maximum: float, backoff_factor: float):
+        self._minimum = minimum
+        self._maximum = max(minimum, maximum)
+        self._backoff_factor = max(1.0, backoff_factor)
+        self._interval = minimum
+
+    @property
+    def interval(self) -> float:
+        return self._interval
+
+    def record_activity(self) -> float:
+        """A command was sent: poll soon to pick up its side effects."""
+        self._interval = self._minimum
+        return self._interval
+
+    def record_poll(self, changed: bool) -> float:
+        """Return the interval until the next poll after a successful one."""
+        if changed:
+            self._interval = self._minimum
+        else:
+            self._interval = min(self._interval * self._backoff_factor, self._maximum)
+        return self._interval
+
+
+class PollBudget:
+    """Request budget shared by all polling coordinators of one account.
+
+    Each coordinator reports the request rate it would like (requests per poll / interval).
+    While the sum stays within `requests_per_hour` the intervals are used as they are,
+    otherwise every interval is stretched by the same factor so the total matches the budget.
+    Coordinators that backed off leave room for the ones that are active.
+    """
+
+    def __init__(self, requests_per_hour: float):
+        self._rate = requests_per_hour / 3600
+        self._demand: dict[Hashable, float] = {}
+
+    def throttle(self, key: Hashable, requests_per_poll: int, interval: float) -> float:
+        """Register the wanted `interval` for `key` and return the one it may use."""
+        if requests_per_poll <= 0 or interval <= 0:
+            self._demand.pop(key, None)
+            return interval
+        self._demand[key] = requests_per_poll / interval
+        total = sum(self._demand.values())
+        if total <= self._rate:
+            return interval
+        throttled = interval * total / self._rate
+        _LOGGER.debug("poll budget exceeded (%.2f > %.2f requests/s), stretching %.0fs to %.0fs",
+                      total, self._rate, interval, throttled)
+        return throttled
+
+    def release(self, key: Hashable):
+        self._demand.pop(key, None)
@@ -0,0 +1,81 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable, Optional
+
+from homeassistant.core import HomeAssistant, callback
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class ConfirmationRefreshScheduler:
+    """Collapses post-command confirmation refreshes into a single deadline.
+
+    Every command pushes the deadline out to `now + delay`, but never further than
+    `max_delay` seconds after the first pending request, so a long burst of commands
+    still gets confirmed in time. The devices touched by the pending commands are
+    collected and handed to `refresh`; None means "refresh everything".
+    """
+
+    def __init__(
+            self,
+            hass: HomeAssistant,
+            name: str,
+            refresh: Callable[[Optional[set[str]]], Awaitable[None]],
+            max_delay: float
+    ):
+        self._hass = hass
+        self._name = name
+        self._refresh = refresh
+        self._max_delay = max_delay
+        self._first_requested_at: Optional[float] = None
+        self._deadline: Optional[float] = None
+        self._device_ids: Optional[set[str]] = set()
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    @property
+    def pending(self) -> bool:
+        return self._timer is not None
+
+    @callback
+    def schedule(self, delay: float, device_id: Optional[str] = None):
+        """Request a confirmation refresh of `device_id` (or everything) `delay` seconds from now."""
+        if device_id is None:
+            self._device_ids = None
+        elif self._device_ids is not None:
+            self._device_ids.add(device_id)
+
+        now = self._hass.loop.time()
+        if self._first_requested_at is None:
+            self._first_requested_at = now
+        deadline = min(max(self._deadline or now, now + delay), self._first_requested_at + self._max_delay)
+        if self._timer is not None and deadline == self._deadline:
+            return
+
+        if self._timer is not None:
+            self._timer.cancel()
+        self._deadline = deadline
+        self._timer = self._hass.loop.call_at(deadline, self._on_deadline)
+        _LOGGER.debug("[%s] confirmation refresh scheduled in %.1f seconds", self._name, deadline - now)
+
+    @callback
+    def _on_deadline(self):
+        device_ids = self._device_ids
+        self._timer = None
+        self._deadline = None
+        self._first_requested_at = None
+        self._device_ids = set()
+        self._refresh_task = self._hass.async_create_task(self._refresh(device_ids))
+
+    @callback
+    def cancel(self):
+        """Drop the pending confirmation and stop a running one."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self._deadline = None
+        self._first_requested_at = None
+        self._device_ids = set()
+        if self._refresh_task is not None and not self._refresh_task.done():
+            self._refresh_task.cancel()
+        self._refresh_task = None
@@ -0,0 +1,266 @@
+from dataclasses import dataclass, field, fields
+from datetime import datetime
+from functools import cache
+from typing import TYPE_CHECKING, Iterable, Iterator, Optional
+
+if TYPE_CHECKING:
+    from ..shome_client.dto.device import SHomeDevice
+
+# device_id -> changed sub-device ids, None when the device entry changed as a whole
+StateChanges = dict[str, Optional[set[str]]]
+
+
+@cache
+def sub_device_id(value) -> str:
+    """Sub-device id as a shared string, so dict keys, records and group members reuse one object."""
+    return str(value)
+
+
+@dataclass(frozen=True, slots=True)
+class DeviceMeta:
+    """Wallpad device metadata. Immutable and kept once per device across refreshes."""
+    shome_id: str
+    unique_num: str
+    name: str
+    model: str
+    model_id: str
+    created_at: datetime
+    root_device_id: str
+    type: str
+
+    @staticmethod
+    def from_device(device: 'SHomeDevice') -> 'DeviceMeta':
+        return DeviceMeta(
+            shome_id=device.id,
+            unique_num=device.unique_num,
+            name=device.nick_name,
+            model=device.model_name,
+            model_id=device.model_id,
+            created_at=device.created_at,
+            root_device_id=device.root_id,
+            type=device.model_type_id,
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "shome_id": self.shome_id,
+            "unique_num": self.unique_num,
+            "name": self.name,
+            "model": self.model,
+            "model_id": self.model_id,
+            "created_at": self.created_at.isoformat(),
+            "root_device_id": self.root_device_id,
+            "type": self.type,
+        }
+
+    @staticmethod
+    def from_dict(data: dict) -> 'DeviceMeta':
+        return DeviceMeta(**{**data, "created_at": datetime.fromisoformat(data["created_at"])})
+
+
+@dataclass(slots=True)
+class SubDeviceState:
+    """Mutable state record of one sub-device. Entities keep a reference to it."""
+    sub_id: str
+    name: str
+
+    def update_from(self, other: 'SubDeviceState') -> bool:
+        """Copy the values of `other` into this record, return whether anything changed."""
+        if self == other:
+            return False
+        for name in _field_names(type(self)):
+            setattr(self, name, getattr(other, name))
+        return True
+
+    def update(self, **values) -> bool:
+        """Set the given fields, return whether anything changed."""
+        changed = False
+        for name, value in values.items():
+            if getattr(self, name) != value:
+                setattr(self, name, value)
+                changed = True
+        return changed
+
+    def to_dict(self) -> dict:
+        return {name: getattr(self, name) for name in _field_names(type(self))}
+
+
+@cache
+def _field_names(cls: type) -> tuple[str, ...]:
+    return tuple(f.name for f in fields(cls))
+
+
+def records_by_id(records: Iterable[SubDeviceState]) -> dict[str, SubDeviceState]:
+    return {record.sub_id: record for record in records}
+
+
+@dataclass(slots=True)
+class LightState(SubDeviceState):
+    on: bool = False
+
+
+@dataclass(slots=True)
+class ClimateState(SubDeviceState):
+    on: bool = False
+    current_temperature: Optional[int] = None
+    target_temperature: Optional[int] = None
+
+
+@dataclass(slots=True)
+class SensorState(SubDeviceState):
+    temperature: Optional[float] = None
+    humidity: Optional[int] = None
+    co2: Optional[int] = None
+    pm10: Optional[int] = None
+
+
+@dataclass(slots=True)
+class VentilationState(SubDeviceState):
+    speed: int = 0
+
+
+@dataclass(frozen=True, slots=True)
+class LightGroup:
+    group_id: str
+    name: str
+    members: tuple[str, ...]
+
+
+@dataclass(slots=True)
+class DeviceState:
+    meta: DeviceMeta
+    sub_devices: dict[str, SubDeviceState] = field(default_factory=dict)
+    groups: dict[str, LightGroup] = field(default_factory=dict)
+
+    def to_dict(self) -> dict:
+        return {
+            "meta": self.meta.to_dict(),
+            "sub_devices": [record.to_dict() for record in self.sub_devices.values()],
+            "groups": [{"group_id": group.group_id, "name": group.name, "members": list(group.members)}
+                       for group in self.groups.values()],
+        }
+
+    @staticmethod
+    def from_dict(data: dict, record_type: type[SubDeviceState]) -> 'DeviceState':
+        """Rebuild a device saved with `to_dict`, its sub-devices as `record_type` records."""
+        return DeviceState(
+            meta=DeviceMeta.from_dict(data["meta"]),
+            sub_devices=records_by_id(
+                record_type(**{**record, "sub_id": sub_device_id(record["sub_id"])})
+                for record in data["sub_devices"]
+            ),
+            groups={
+                group["group_id"]: LightGroup(
+                    group_id=group["group_id"],
+                    name=group["name"],
+                    members=tuple(sub_device_id(member) for member in group["members"]),
+                )
+                for group in data["groups"]
+            },
+        )
+
+
+class StateStore:
+    """device_id -> DeviceState of one coordinator.
+
+    Refreshes are merged into the existing records in place, so the `DeviceState` and
+    `SubDeviceState` objects entities hold stay valid, and the merge reports what changed.
+    """
+
+    __slots__ = ("_devices",)
+
+    def __init__(self):
+        self._devices: dict[str, DeviceState] = {}
+
+    def __len__(self) -> int:
+        return len(self._devices)
+
+    def __contains__(self, device_id: str) -> bool:
+        return device_id in self._devices
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._devices)
+
+    def items(self):
+        return self._devices.items()
+
+    def values(self):
+        return self._devices.values()
+
+    def get(self, device_id: str) -> Optional[DeviceState]:
+        return self._devices.get(device_id)
+
+    def sub_device(self, device_id: str, sub_id: str) -> Optional[SubDeviceState]:
+        device = self._devices.get(device_id)
+        return device.sub_devices.get(sub_id) if device is not None else None
+
+    def as_dict(self) -> dict[str, dict]:
+        """JSON-serializable copy of the store, see `DeviceState.from_dict`."""
+        return {device_id: device.to_dict() for device_id, device in self._devices.items()}
+
+    def topology(self) -> dict[str, tuple[frozenset[str], frozenset[str]]]:
+        """device_id -> (sub-device ids, group ids): what the entities were created from."""
+        return {device_id: (frozenset(device.sub_devices), frozenset(device.groups))
+                for device_id, device in self._devices.items()}
+
+    def merge(self, device_id: str, fresh: DeviceState) -> Optional[set[str]]:
+        """Merge a freshly fetched device into the store.
+
+        Returns the ids of the sub-devices that changed, or None when the device itself
+        (metadata, groups) is new or changed.
+        """
+        current = self._devices.get(device_id)
+        if current is None:
+            self._devices[device_id] = fresh
+            return None
+
+        whole_device = False
+        if current.meta != fresh.meta:
+            current.meta = fresh.meta
+            whole_device = True
+        if current.groups != fresh.groups:
+            current.groups = fresh.groups
+            whole_device = True
+
+        changed: set[str] = set()
+        sub_devices = current.sub_devices
+        for sub_id, record in fresh.sub_devices.items():
+            existing = sub_devices.get(sub_id)
+            if existing is None or type(existing) is not type(record):
+                sub_devices[sub_id] = record
+                changed.add(sub_id)
+            elif existing.update_from(record):
+                changed.add(sub_id)
+        for sub_id in [sub_id for sub_id in sub_devices if sub_id not in fresh.sub_devices]:
+            del sub_devices[sub_id]
+            changed.add(sub_id)
+        return None if whole_device else changed
+
+    def merge_all(self, fresh: dict[str, DeviceState]) -> StateChanges:
+        changes: StateChanges = {}
+        for device_id, device in fresh.items():
+            changed = self.merge(device_id, device)
+            if changed is None or changed:
+                changes[device_id] = changed
+        return changes
+
+
+def merge_changes(into: StateChanges, changes: StateChanges):
+    """Accumulate `changes` into `into`."""
+    for device_id, changed in changes.items():
+        if device_id in into:
+            existing = into[device_id]
+            into[device_id] = None if existing is None or changed is None else existing | changed
+        else:
+            into[device_id] = None if changed is None else set(changed)
+
+
+def context_changed(context: tuple[str, Optional[frozenset[str]]], changes: StateChanges) -> bool:
+    """Whether a listener registered with `device_context(...)` is affected by `changes`."""
+    device_id, sub_device_ids = context
+    if device_id not in changes:
+        return False
+    changed_sub_ids = changes[device_id]
+    if changed_sub_ids is None or sub_device_ids is None:
+        return True
+    return not sub_device_ids.isdisjoint(changed_sub_ids)
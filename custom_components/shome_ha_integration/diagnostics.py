@@ -0,0 +1,45 @@
+"""Diagnostics download of the SHome integration: request metrics and coordinator state."""
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+from .coordinators.base_coordinator import SHomeCoordinator
+from .utils import get_client, get_client_registry
+
+# the entry title contains the username
+TO_REDACT = {"credential", "username", "password", "device_id", "title", "unique_id"}
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> dict[str, Any]:
+    coordinators: dict[str, SHomeCoordinator] = (hass.data.get(DOMAIN) or {}).get(entry.entry_id) or {}
+    credential: dict = entry.data.get("credential") or {}
+    client = get_client(hass, credential) if credential else None
+
+    return {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        "client": None if client is None else {
+            "token_age_seconds": client.token_age,
+            "entry_references": get_client_registry(hass).refs(credential["username"]),
+            "circuits": client.circuit_states,
+            "rate_limits": client.rate_limits,
+            "scheduler": client.scheduler_stats,
+            "requests": client.metrics.as_dict(),
+        },
+        "coordinators": {
+            key: {
+                "devices": len(coordinator.devices),
+                "sub_devices": sum(len(device.sub_devices) for device in coordinator.store.values()),
+                "last_update_success": coordinator.last_update_success,
+                "stale_since": coordinator.stale_since.isoformat() if coordinator.stale_since else None,
+                "update_interval_seconds": (
+                    coordinator.update_interval.total_seconds() if coordinator.update_interval else None
+                ),
+                "listener_updates": coordinator.listener_update_stats,
+                "optimistic_state": coordinator.optimistic_stats,
+            }
+            for key, coordinator in coordinators.items()
+        },
+    }
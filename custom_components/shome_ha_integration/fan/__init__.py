@@ -23,18 +23,13 @@ async def async_setup_entry(
     if ventilation_coordinator.data is None:
         await ventilation_coordinator.async_request_refresh()
     
-    ventilation_data = ventilation_coordinator.data
-    if not ventilation_data:
+    if not ventilation_coordinator.store:
         _LOGGER.warning("No ventilation data available")
         return
     
     fans = []
-    for device_id, device_data in ventilation_data.items():
-        for sub_device_num, ventilation in device_data["sub_devices"].items():
+    for device in ventilation_coordinator.store.values():
+        for ventilation in device.sub_devices.values():
             # Create the fan entity
-            fans.append(VentilationFan(ventilation_coordinator, {
-                "device_info": device_data.get("device_info", {}),
-                "sub_device_num": sub_device_num,
-                "sub_device_name": ventilation.get("name")
-            }))
+            fans.append(VentilationFan(ventilation_coordinator, device, ventilation))
     async_add_entities(fans)
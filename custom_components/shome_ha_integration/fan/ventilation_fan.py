@@ -1,5 +1,4 @@
 """Support for SHome ventilation fan."""
-import asyncio
 import logging
 from typing import Any, Optional
 from math import ceil
@@ -13,6 +12,8 @@ from homeassistant.util.percentage import (
 )
 
 from ..const import DOMAIN
+from ..coordinators.base_coordinator import device_context
+from ..coordinators.state_store import DeviceState, VentilationState
 from ..coordinators.ventilation_coordinator import VentilationCoordinator
 from ..shome_client.dto.status import OnOffStatus
 from ..shome_client.dto.ventilation import VentilationSpeed
@@ -30,34 +31,28 @@ class VentilationFan(CoordinatorEntity, FanEntity):
     _attr_supported_features = FanEntityFeature.SET_SPEED | FanEntityFeature.TURN_ON | FanEntityFeature.TURN_OFF
     _attr_speed_count = 3
     
-    def __init__(self, coordinator: VentilationCoordinator, info: dict):
+    def __init__(self, coordinator: VentilationCoordinator, device: DeviceState, state: VentilationState):
         """Initialize the fan."""
-        super().__init__(coordinator)
-        self._id = str(info["sub_device_num"])
-        self._device_key = info["device_info"]["shome_id"]
-        self._attr_unique_id = f"{self._device_key}_{info['sub_device_num']}"
-        self._attr_name = info["sub_device_name"]
+        super().__init__(coordinator, context=device_context(device.meta.shome_id, [state.sub_id]))
+        self._id = state.sub_id
+        self._device_key = device.meta.shome_id
+        # direct handle on the record the coordinator merges refreshes into
+        self._state = state
+        self._attr_unique_id = f"{self._device_key}_{state.sub_id}"
+        self._attr_name = state.name
         self._attr_device_info = DeviceInfo(
             identifiers={(DOMAIN, self._device_key)},
-            name=info["device_info"]["name"],
-            model=info["device_info"]["model"],
-            model_id=info["device_info"]["model_id"],
-            modified_at=info["device_info"]["created_at"],
+            name=device.meta.name,
+            model=device.meta.model,
+            model_id=device.meta.model_id,
+            modified_at=device.meta.created_at,
             manufacturer="SHome"
         )
 
-    @property
-    def _state(self) -> dict:
-        """Get current state from coordinator."""
-        return self.coordinator.data\
-            .get(self._device_key, {})\
-            .get("sub_devices", {})\
-            .get(self._id, {})\
-
     @property
     def is_on(self) -> bool:
         """Return true if the fan is on."""
-        if self._state.get("status", 0) == 0:
+        if self._state.speed == 0:
             return False
         else:
             return True
@@ -66,7 +61,7 @@ class VentilationFan(CoordinatorEntity, FanEntity):
     @property
     def percentage(self) -> Optional[int]:
         """Return the current speed percentage."""
-        current_speed = self._state.get("status", 0)
+        current_speed = self._state.speed
         if current_speed == VentilationSpeed.OFF:
             return 0
         real_speed = 4 - current_speed
@@ -74,51 +69,37 @@ class VentilationFan(CoordinatorEntity, FanEntity):
         return result
 
 
-    async def _delayed_refresh(self):
-        await asyncio.sleep(4)
-        await self.coordinator.async_request_refresh()
-
-
     async def async_turn_on(self, speed: Optional[str] = None, percentage: Optional[int] = None, preset_mode: Optional[str] = None, **kwargs: Any) -> None:
         """Turn the fan on."""
         if percentage is None:
             percentage = 33  # Default to low speed if not specified
-        await self.coordinator.toggle_ventilation(self._device_key, self._id, OnOffStatus.ON)
         await self.async_set_percentage(percentage)
 
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn the fan off."""
-        await self.coordinator.toggle_ventilation(self._device_key, self._id, OnOffStatus.OFF)
-
-        # Optimistic update
-        new_data = self.coordinator.data
-        current_device = new_data.get(self._device_key, {})
-        if not current_device:
-            return
-        new_data[self._device_key]["sub_devices"][self._id]["status"] = VentilationSpeed.OFF.value
-        self.coordinator.async_set_updated_data(new_data)
-
-        asyncio.create_task(self._delayed_refresh())
+        await self.coordinator.async_send_command(
+            self._device_key, [self._id],
+            self.coordinator.toggle_ventilation(self._device_key, self._id, OnOffStatus.OFF),
+            confirm_delay=4, speed=VentilationSpeed.OFF.value
+        )
 
 
     async def async_set_percentage(self, percentage: int) -> None:
         """Set the speed percentage of the fan."""
-        speed_value = ceil(percentage_to_ranged_value(SPEED_RANGE, percentage))
         if percentage == 0:
-            shome_value = VentilationSpeed.OFF
-            await self.coordinator.toggle_ventilation(self._device_key, self._id, OnOffStatus.OFF)
-        else:
-            shome_value = VentilationSpeed(4 - speed_value)
-            if not self.is_on:
-                await self.coordinator.toggle_ventilation(self._device_key, self._id, OnOffStatus.ON)
-            await self.coordinator.set_ventilation_speed(self._device_key, self._id, shome_value)
-
-        new_data = self.coordinator.data
-        current_device = new_data.get(self._device_key, {})
-        if not current_device:
+            await self.async_turn_off()
             return
-        new_data[self._device_key]["sub_devices"][self._id]["status"] = shome_value.value
-        self.coordinator.async_set_updated_data(new_data)
+        speed_value = ceil(percentage_to_ranged_value(SPEED_RANGE, percentage))
+        shome_value = VentilationSpeed(4 - speed_value)
+        # checked before the optimistic update shows the fan on
+        await self.coordinator.async_send_command(
+            self._device_key, [self._id],
+            self._send_speed(shome_value, turn_on=not self.is_on),
+            confirm_delay=4, speed=shome_value.value
+        )
 
-        asyncio.create_task(self._delayed_refresh())
+    async def _send_speed(self, speed: VentilationSpeed, turn_on: bool):
+        if turn_on:
+            await self.coordinator.toggle_ventilation(self._device_key, self._id, OnOffStatus.ON)
+        await self.coordinator.set_ventilation_speed(self._device_key, self._id, speed)
@@ -0,0 +1,74 @@
+import logging
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Iterable, Optional
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN, INVENTORY_CACHE_VERSION, INVENTORY_SAVE_DELAY
+from .shome_client.dto.device import SHomeDevice
+
+if TYPE_CHECKING:
+    from .coordinators.base_coordinator import SHomeCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class CachedInventory:
+    devices: list[SHomeDevice]
+    # coordinator name -> StateStore.as_dict()
+    states: dict[str, dict[str, dict]]
+
+
+class InventoryCache:
+    """Device list and last-known coordinator states of one config entry, kept in HA storage.
+
+    Lets setup create the entities without waiting for the cloud. Writes are delayed and
+    batched; the storage helper flushes a pending write when Home Assistant stops.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str):
+        self._store: Store[dict] = Store(hass, INVENTORY_CACHE_VERSION, f"{DOMAIN}.{entry_id}.inventory")
+        self._devices: list[SHomeDevice] = []
+        self._coordinators: list['SHomeCoordinator'] = []
+
+    async def async_load(self) -> Optional[CachedInventory]:
+        """Return the cached inventory, or None when there is none (or it is unreadable)."""
+        data = await self._store.async_load()
+        if not data:
+            return None
+        try:
+            devices = [SHomeDevice.from_dict(device) for device in data["devices"]]
+            states = dict(data["states"])
+        except (KeyError, TypeError, ValueError) as e:
+            _LOGGER.warning("Ignoring unreadable device inventory cache - %s", e)
+            return None
+        self._devices = devices
+        return CachedInventory(devices=devices, states=states)
+
+    def track(self, coordinators: Iterable['SHomeCoordinator']):
+        """Save the state of these coordinators whenever one of them changed."""
+        self._coordinators = list(coordinators)
+        for coordinator in self._coordinators:
+            coordinator.set_state_cache(self)
+
+    @callback
+    def async_save_devices(self, devices: list[SHomeDevice]):
+        """Remember the device list fetched from the cloud."""
+        self._devices = devices
+        self.async_schedule_save()
+
+    @callback
+    def async_schedule_save(self):
+        self._store.async_delay_save(self._data_to_save, INVENTORY_SAVE_DELAY)
+
+    async def async_remove(self):
+        await self._store.async_remove()
+
+    @callback
+    def _data_to_save(self) -> dict:
+        return {
+            "devices": [device.to_dict() for device in self._devices],
+            "states": {coordinator.name: coordinator.store.as_dict() for coordinator in self._coordinators},
+        }
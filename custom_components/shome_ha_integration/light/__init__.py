@@ -21,32 +21,19 @@ async def async_setup_entry(
     if light_coordinator.data is None:
         await light_coordinator.async_request_refresh()
 
-    light_info = light_coordinator.data
-
-    for light_device_id, light_device_info in light_info.items():
+    for light_device in light_coordinator.store.values():
 
         # init single light
-        single_lights = []
-        for light_id, light_attributes in light_device_info["sub_device_info"].items():
-            single_lights.append(ApiLight(light_coordinator, {
-                "id": light_id,
-                "name": light_attributes["name"],
-                "device_info": light_device_info["device_info"]
-            }))
-        async_add_entities(single_lights)
+        async_add_entities([
+            ApiLight(light_coordinator, light_device, light)
+            for light in light_device.sub_devices.values()
+        ])
 
         # init room light
-        room_lights = []
-        for group_id, group_info in light_device_info["group_info"].items():
-            room_lights.append(ApiRoomLight(light_coordinator, {
-                "id": group_id,
-                "name": group_info["name"],
-                "devices": group_info["devices"],
-                "device_info": light_device_info["device_info"]
-            }))
-        async_add_entities(room_lights)
+        async_add_entities([
+            ApiRoomLight(light_coordinator, light_device, group)
+            for group in light_device.groups.values()
+        ])
 
         # add grouped light entity
-        async_add_entities([ApiGroupedLight(light_coordinator, {
-            "device_info": light_device_info["device_info"]
-        })])
+        async_add_entities([ApiGroupedLight(light_coordinator, light_device)])
@@ -1,10 +1,10 @@
-import asyncio
-
 from homeassistant.components.light import LightEntity, ColorMode
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
+from ..coordinators.base_coordinator import device_context
 from ..coordinators.light_coordinator import LightToggleType
+from ..coordinators.state_store import DeviceState
 from ..const import DOMAIN
 from ..shome_client.dto.status import OnOffStatus
 
@@ -14,71 +14,43 @@ class ApiGroupedLight(CoordinatorEntity, LightEntity):
     _attr_color_mode = ColorMode.ONOFF
     _attr_should_poll = False
 
-    def __init__(self, coordinator, info: dict):
-        super().__init__(coordinator)
+    def __init__(self, coordinator, device: DeviceState):
+        super().__init__(coordinator, context=device_context(device.meta.shome_id))
         self._id = "0"
-        self._device_key = info["device_info"]["shome_id"]
+        self._device_key = device.meta.shome_id
+        self._device = device
         self._attr_unique_id = f"{self._device_key}_grouped_light"
         self._attr_name = "전체 조명"
         self._attr_device_info = DeviceInfo(
             identifiers={(DOMAIN, self._device_key)},
-            name=info["device_info"]["name"],
-            model=info["device_info"]["model"],
-            model_id=info["device_info"]["model_id"],
-            modified_at=info["device_info"]["created_at"],
+            name=device.meta.name,
+            model=device.meta.model,
+            model_id=device.meta.model_id,
+            modified_at=device.meta.created_at,
             manufacturer="SHome"
         )
 
-    # coordinator.data에서 내 데이터만 꺼내서 표시
-    @property
-    def _state(self):
-        return self.coordinator.data\
-            .get(self._device_key, {})\
-            .get("sub_device_info", {})
-
     @property
     def is_on(self) -> bool | None:
-        result = []
-        for light_id, light_status in self._state.items():
-            result.append(light_status.get("on", False))
-        if True in result:
-            return True
-        if result:
-            return False
-        return None
+        lights = self._device.sub_devices
+        if not lights:
+            return None
+        return any(light.on for light in lights.values())
 
     @property
     def brightness(self) -> int | None:
         return None
 
-    async def _delayed_refresh(self):
-        await asyncio.sleep(3)
-        await self.coordinator.async_request_refresh()
-
     async def async_turn_on(self, **kwargs):
-        await self.coordinator.toggle_light(self._device_key, LightToggleType.ALL, self._id, OnOffStatus.ON)
-
-        # Optimistic update
-        new_data = self.coordinator.data
-        current_device = new_data.get(self._device_key, {})
-        if not current_device:
-            return
-        for light_id, _ in current_device["sub_device_info"].items():
-            new_data[self._device_key]["sub_device_info"][str(light_id)]["on"] = True
-        self.coordinator.async_set_updated_data(new_data)
-
-        asyncio.create_task(self._delayed_refresh())
+        await self.coordinator.async_send_command(
+            self._device_key, list(self._device.sub_devices),
+            self.coordinator.toggle_light(self._device_key, LightToggleType.ALL, self._id, OnOffStatus.ON),
+            confirm_delay=3, on=True
+        )
 
     async def async_turn_off(self, **kwargs):
-        await self.coordinator.toggle_light(self._device_key, LightToggleType.ALL, self._id, OnOffStatus.OFF)
-
-        # Optimistic update
-        new_data = self.coordinator.data
-        current_device = new_data.get(self._device_key, {})
-        if not current_device:
-            return
-        for light_id, _ in current_device["sub_device_info"].items():
-            new_data[self._device_key]["sub_device_info"][str(light_id)]["on"] = False
-        self.coordinator.async_set_updated_data(new_data)
-
-        asyncio.create_task(self._delayed_refresh())
+        await self.coordinator.async_send_command(
+            self._device_key, list(self._device.sub_devices),
+            self.coordinator.toggle_light(self._device_key, LightToggleType.ALL, self._id, OnOffStatus.OFF),
+            confirm_delay=3, on=False
+        )
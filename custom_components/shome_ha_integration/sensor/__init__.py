@@ -10,6 +10,7 @@ from .temperature_sensor import TemperatureSensor
 from .humidity_sensor import HumiditySensor
 from .co2_sensor import CO2Sensor
 from .dust_sensor import PM10Sensor
+from .request_metrics_sensor import RequestCountSensor, RequestLatencySensor, RequestsInFlightSensor, ReloginSensor
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -19,31 +20,33 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up sensor entities from a config entry."""
-    
+
+    # diagnostic sensors over the cloud requests of this account
+    async_add_entities([
+        RequestCountSensor(hass, entry),
+        RequestLatencySensor(hass, entry),
+        RequestsInFlightSensor(hass, entry),
+        ReloginSensor(hass, entry),
+    ])
+
     sensor_coordinator: SensorCoordinator = hass.data[DOMAIN][entry.entry_id]["sensor_coordinator"]
     if sensor_coordinator.data is None:
         await sensor_coordinator.async_request_refresh()
     
-    sensor_data = sensor_coordinator.data
-    if not sensor_data:
+    if not sensor_coordinator.store:
         _LOGGER.warning("No sensor data available")
         return
 
     sensors = []
-    for device_id, device in sensor_data.items():
-        for sub_device_num, sub_device in device["sub_devices"].items():
-            params = {
-                "device_info": device["device_info"],
-                "sub_device_num": sub_device_num,
-                "sub_device_name": sub_device.get("name")
-            }
+    for device in sensor_coordinator.store.values():
+        for sub_device in device.sub_devices.values():
             # Only add sensors if data exists
-            if sub_device.get("temperature") is not None:
-                sensors.append(TemperatureSensor(sensor_coordinator, params))
-            if sub_device.get("humidity") is not None:
-                sensors.append(HumiditySensor(sensor_coordinator, params))
-            if sub_device.get("co2") is not None:
-                sensors.append(CO2Sensor(sensor_coordinator, params))
-            if sub_device.get("pm10") is not None:
-                sensors.append(PM10Sensor(sensor_coordinator, params))
+            if sub_device.temperature is not None:
+                sensors.append(TemperatureSensor(sensor_coordinator, device, sub_device))
+            if sub_device.humidity is not None:
+                sensors.append(HumiditySensor(sensor_coordinator, device, sub_device))
+            if sub_device.co2 is not None:
+                sensors.append(CO2Sensor(sensor_coordinator, device, sub_device))
+            if sub_device.pm10 is not None:
+                sensors.append(PM10Sensor(sensor_coordinator, device, sub_device))
     async_add_entities(sensors)
@@ -4,6 +4,8 @@ from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from ..const import DOMAIN
+from ..coordinators.base_coordinator import device_context
+from ..coordinators.state_store import DeviceState, SensorState
 
 
 class HumiditySensor(CoordinatorEntity, SensorEntity):
@@ -12,21 +14,23 @@ class HumiditySensor(CoordinatorEntity, SensorEntity):
     _attr_state_class = SensorStateClass.MEASUREMENT
     _attr_native_unit_of_measurement = PERCENTAGE
 
-    def __init__(self, coordinator, info: dict):
-        super().__init__(coordinator)
-        self._id = str(info["sub_device_num"])
-        self._device_key = info["device_info"]["shome_id"]
+    def __init__(self, coordinator, device: DeviceState, state: SensorState):
+        super().__init__(coordinator, context=device_context(device.meta.shome_id, [state.sub_id]))
+        self._id = state.sub_id
+        self._device_key = device.meta.shome_id
+        # direct handle on the record the coordinator merges refreshes into
+        self._state = state
         self._attr_unique_id = f"{self._device_key}_{self._id}_humidity"
-        self._attr_name = f"{info['sub_device_name']}_humidity"
+        self._attr_name = f"{state.name}_humidity"
         self._attr_device_info = DeviceInfo(
             identifiers={(DOMAIN, self._device_key)},
-            name=info["device_info"]["name"],
-            model=info["device_info"]["model"],
-            model_id=info["device_info"]["model_id"],
-            modified_at=info["device_info"]["created_at"],
+            name=device.meta.name,
+            model=device.meta.model,
+            model_id=device.meta.model_id,
+            modified_at=device.meta.created_at,
             manufacturer="SHome"
         )
 
     @property
     def native_value(self):
-        return self.coordinator.data.get(self._device_key, {}).get("sub_devices", {}).get(self._id, {}).get("humidity")
\ No newline at end of file
+        return self._state.humidity
\ No newline at end of file
@@ -0,0 +1,94 @@
+from typing import Optional
+
+from homeassistant.components.sensor import SensorEntity, SensorStateClass
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EntityCategory, UnitOfTime
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.device_registry import DeviceEntryType
+from homeassistant.helpers.entity import DeviceInfo
+
+from ..const import DOMAIN
+from ..shome_client.metrics import RequestMetrics
+from ..utils import get_client
+
+
+class RequestMetricsSensor(SensorEntity):
+    """Diagnostic sensor over the request metrics of the account's `SHomeClient`.
+
+    Polled: the metrics are plain counters, reading them is cheap. Only the scalar state is
+    exposed; the per-endpoint breakdown changes on every poll and would make the recorder write
+    a new attributes row each time, so it is left to the diagnostics download.
+    """
+    _attr_should_poll = True
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _key: str = ""
+
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry):
+        self._hass = hass
+        self._credential: dict = entry.data.get("credential")
+        self._attr_unique_id = f"{entry.entry_id}_{self._key}"
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, f"{entry.entry_id}_cloud")},
+            name="SHome cloud",
+            entry_type=DeviceEntryType.SERVICE,
+            manufacturer="SHome"
+        )
+
+    @property
+    def _metrics(self) -> Optional[RequestMetrics]:
+        client = get_client(self._hass, self._credential)
+        return client.metrics if client is not None else None
+
+    @property
+    def available(self) -> bool:
+        # no client before the first cloud call of a setup from the inventory cache
+        return self._metrics is not None
+
+
+class RequestCountSensor(RequestMetricsSensor):
+    _key = "api_requests"
+    _attr_name = "SHome API requests"
+    _attr_icon = "mdi:cloud-upload"
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+
+    @property
+    def native_value(self):
+        metrics = self._metrics
+        return metrics.requests if metrics is not None else None
+
+
+class RequestLatencySensor(RequestMetricsSensor):
+    _key = "api_latency"
+    _attr_name = "SHome API latency"
+    _attr_icon = "mdi:timer-outline"
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+
+    @property
+    def native_value(self):
+        metrics = self._metrics
+        return metrics.mean_ms if metrics is not None else None
+
+
+class RequestsInFlightSensor(RequestMetricsSensor):
+    _key = "api_requests_in_flight"
+    _attr_name = "SHome API requests in flight"
+    _attr_icon = "mdi:cloud-sync"
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    @property
+    def native_value(self):
+        metrics = self._metrics
+        return metrics.in_flight if metrics is not None else None
+
+
+class ReloginSensor(RequestMetricsSensor):
+    _key = "api_relogins"
+    _attr_name = "SHome API re-logins"
+    _attr_icon = "mdi:account-key"
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+
+    @property
+    def native_value(self):
+        metrics = self._metrics
+        return metrics.relogins if metrics is not None else None
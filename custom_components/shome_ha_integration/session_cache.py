@@ -0,0 +1,46 @@
+import hashlib
+import logging
+from typing import Optional
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN, SESSION_CACHE_VERSION
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _digest(*values: str) -> str:
+    return hashlib.sha256("\0".join(values).encode("utf-8")).hexdigest()
+
+
+class SessionCache:
+    """Login session (cookies, access token) of one account, kept in private HA storage.
+
+    The file is only readable by the HA user and is keyed by a hash of the username. A
+    session is only handed back for the exact credential it was issued to, so a changed
+    password or device id always leads to a fresh login.
+    """
+
+    def __init__(self, hass: HomeAssistant, credential: dict):
+        self._store: Store[dict] = Store(
+            hass, SESSION_CACHE_VERSION, f"{DOMAIN}.session.{_digest(credential['username'])[:16]}", private=True
+        )
+        self._fingerprint = _digest(credential["username"], credential["password"], credential.get("device_id", ""))
+
+    async def async_load(self) -> Optional[dict]:
+        """Return the stored session for this credential, or None."""
+        data = await self._store.async_load()
+        if not data or data.get("fingerprint") != self._fingerprint:
+            return None
+        return data.get("session")
+
+    @callback
+    def async_save(self, session: Optional[dict]):
+        if session is None:
+            return
+        data = {"fingerprint": self._fingerprint, "session": session}
+        self._store.async_delay_save(lambda: data)
+
+    async def async_remove(self):
+        await self._store.async_remove()
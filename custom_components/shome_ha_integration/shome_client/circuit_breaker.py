@@ -0,0 +1,131 @@
+import logging
+import random
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from .const import (
+    CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_MAX_RESET_TIMEOUT_SECONDS,
+    CIRCUIT_RESET_TIMEOUT_SECONDS,
+    RETRY_ATTEMPTS,
+    RETRY_BASE_DELAY_SECONDS,
+    RETRY_MAX_DELAY_SECONDS,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class CircuitOpenError(Exception):
+    """A request was not sent because the circuit of its endpoint family is open."""
+
+    def __init__(self, family: str, retry_after: float):
+        super().__init__(f"SHome API '{family}' endpoints are failing, not retrying for {retry_after:.0f} seconds")
+        self.family = family
+        self.retry_after = retry_after
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    attempts: int = RETRY_ATTEMPTS
+    base_delay: float = RETRY_BASE_DELAY_SECONDS
+    max_delay: float = RETRY_MAX_DELAY_SECONDS
+
+    def delay(self, attempt: int) -> float:
+        """Backoff before retry number `attempt` (1-based): full jitter over an exponential cap."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+
+class CircuitBreaker:
+    """Stops sending requests to an endpoint family that keeps failing.
+
+    closed: requests pass, `failure_threshold` consecutive failures open the circuit.
+    open: requests fail fast with `CircuitOpenError` until `reset_timeout` passed.
+    half_open: one probe request is let through; success closes the circuit, failure
+    opens it again with a doubled timeout.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+            self,
+            family: str,
+            failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+            reset_timeout: float = CIRCUIT_RESET_TIMEOUT_SECONDS,
+            max_reset_timeout: float = CIRCUIT_MAX_RESET_TIMEOUT_SECONDS,
+            clock: Callable[[], float] = time.monotonic,
+    ):
+        self._family = family
+        self._failure_threshold = max(1, failure_threshold)
+        self._base_reset_timeout = reset_timeout
+        self._max_reset_timeout = max(reset_timeout, max_reset_timeout)
+        self._clock = clock
+
+        self._state = self.CLOSED
+        self._failures = 0
+        self._reset_timeout = reset_timeout
+        self._opened_at = 0.0
+        self._probe_started: Optional[float] = None
+
+    @property
+    def state(self) -> str:
+        if self._state == self.OPEN and self.retry_after == 0:
+            return self.HALF_OPEN
+        return self._state
+
+    @property
+    def is_open(self) -> bool:
+        return self._state == self.OPEN
+
+    @property
+    def retry_after(self) -> float:
+        """Seconds until a probe request is let through, 0 when requests may be sent."""
+        if self._state != self.OPEN:
+            return 0.0
+        return max(0.0, self._opened_at + self._reset_timeout - self._clock())
+
+    def before_request(self):
+        """Raise `CircuitOpenError` unless a request may be sent now."""
+        if self._state == self.CLOSED:
+            return
+        now = self._clock()
+        if self._state == self.OPEN:
+            if (retry_after := self._opened_at + self._reset_timeout - now) > 0:
+                raise CircuitOpenError(self._family, retry_after)
+            self._state = self.HALF_OPEN
+            self._probe_started = None
+        # half open: a single probe at a time; a probe that never reported back is replaced after a timeout
+        if self._probe_started is not None and now - self._probe_started < self._reset_timeout:
+            raise CircuitOpenError(self._family, self._probe_started + self._reset_timeout - now)
+        self._probe_started = now
+
+    def release_probe(self):
+        """The request let through by `before_request` was never sent (expired, cancelled): let another one probe."""
+        if self._state == self.HALF_OPEN:
+            self._probe_started = None
+
+    def record_success(self):
+        if self._state != self.CLOSED:
+            _LOGGER.info("[%s] SHome API recovered, closing circuit", self._family)
+        self._state = self.CLOSED
+        self._failures = 0
+        self._reset_timeout = self._base_reset_timeout
+        self._probe_started = None
+
+    def record_failure(self):
+        self._failures += 1
+        if self._state == self.HALF_OPEN:
+            # the probe failed: stay away twice as long
+            self._open(min(self._max_reset_timeout, self._reset_timeout * 2))
+        elif self._state == self.CLOSED and self._failures >= self._failure_threshold:
+            self._open(self._base_reset_timeout)
+
+    def _open(self, reset_timeout: float):
+        self._state = self.OPEN
+        self._reset_timeout = reset_timeout
+        self._opened_at = self._clock()
+        self._probe_started = None
+        _LOGGER.warning("[%s] SHome API failed %d times in a row, pausing requests for %.0f seconds",
+                        self._family, self._failures, reset_timeout)
@@ -3,3 +3,57 @@ APP_NAME = "SHOME"
 OS_TYPE = "ANDROID"
 VERSION_HEADER = "3.1.45"
 VERSION_PARAM = "30145"
+
+# Access token lifetime is not published by the API; start from this guess, shrink it once this many
+# tokens in a row died earlier (a single 401 may be a forced logout), and grow it back by the given
+# factor whenever a token lives until its background renewal
+TOKEN_LIFETIME_SECONDS = 60 * 60
+TOKEN_MIN_LIFETIME_SECONDS = 5 * 60
+TOKEN_EARLY_EXPIRY_THRESHOLD = 2
+TOKEN_LIFETIME_GROWTH = 2.0
+# Re-login in the background once the token has used this share of its expected lifetime
+TOKEN_REFRESH_RATIO = 0.9
+
+# Circuit breaker per endpoint family: consecutive failures that open it, and how long it stays
+# open before one probe request is let through (doubled after every failed probe, up to the max)
+CIRCUIT_FAILURE_THRESHOLD = 5
+CIRCUIT_RESET_TIMEOUT_SECONDS = 30.0
+CIRCUIT_MAX_RESET_TIMEOUT_SECONDS = 600.0
+# Retries of idempotent GETs on transient failures, with full-jitter exponential backoff (seconds)
+RETRY_ATTEMPTS = 3
+RETRY_BASE_DELAY_SECONDS = 0.5
+RETRY_MAX_DELAY_SECONDS = 8.0
+# Responses that say the cloud is struggling rather than that the request was wrong
+TRANSIENT_STATUS_CODES = frozenset({408, 429, 500, 502, 503, 504})
+
+# Connection pool of the SHome API session: connections per host, idle keep-alive (longer than the
+# shortest poll interval so polls find warm connections) and DNS cache lifetime (seconds)
+CONNECTION_LIMIT_PER_HOST = 8
+KEEPALIVE_TIMEOUT_SECONDS = 60.0
+DNS_CACHE_TTL_SECONDS = 300
+# Connections per host of the pool shared by every account of an HA instance
+SHARED_CONNECTION_LIMIT_PER_HOST = 32
+
+# Device list paging: devices asked for per page, and pages fetched at once after the first one
+# (which tells the total)
+DEVICE_PAGE_SIZE = 100
+DEVICE_PAGE_CONCURRENCY = 4
+
+# Request rate limits per account (token buckets): sustained requests per second and burst, for the
+# whole account and for each endpoint family. Polls leave the last tokens of a bucket to commands.
+RATE_LIMIT_ACCOUNT_PER_SECOND = 5.0
+RATE_LIMIT_ACCOUNT_BURST = 20
+RATE_LIMIT_FAMILY_PER_SECOND = 2.0
+RATE_LIMIT_FAMILY_BURST = 10
+RATE_LIMIT_INTERACTIVE_RESERVE = 2
+
+# Request scheduling per account: requests in flight at once, and per priority (interactive
+# commands, confirmation refreshes, background polls) the dispatch weight and how long a request
+# may wait in the queue before it is dropped (seconds, None to wait as long as it takes)
+SCHEDULER_MAX_IN_FLIGHT = 8
+SCHEDULER_WEIGHTS = (8, 4, 1)
+SCHEDULER_DEADLINES_SECONDS = (None, 30.0, 20.0)
+
+# Device info responses are kept this long (seconds) for callers asking again, 0 to only share
+# fetches that are still in flight; a command on the device drops them
+RESPONSE_CACHE_TTL_SECONDS = 1.0
@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+from functools import cached_property
 
 
 @dataclass(frozen=True)
@@ -6,10 +7,27 @@ class Cookie:
     JSESSIONID: str
     WMONID: str
 
+    @staticmethod
+    def from_dict(data: dict) -> 'Cookie':
+        return Cookie(
+            JSESSIONID=data["JSESSIONID"],
+            WMONID=data.get("WMONID")
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "JSESSIONID": self.JSESSIONID,
+            "WMONID": self.WMONID
+        }
+
     def to_header(self) -> dict:
         return {
             "Cookie": f"JSESSIONID={self.JSESSIONID}; WMONID={self.WMONID}"
         }
 
+    @cached_property
+    def _header_value(self) -> str:
+        return f"JSESSIONID={self.JSESSIONID}; WMONID={self.WMONID}"
+
     def to_header_value(self) -> str:
-        return f"JSESSIONID={self.JSESSIONID}; WMONID={self.WMONID}"
\ No newline at end of file
+        return self._header_value
@@ -1,9 +1,16 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
+from functools import cached_property
 
 
 @dataclass(frozen=True)
 class SHomeDevice:
+    """A device of the wallpad's device list.
+
+    Only the fields needed to classify and address the device are decoded up front; the
+    rest (battery, zigbee strength, creation time, ...) is decoded from the raw entry on
+    first access.
+    """
     id: str
     root_id: str
     model_id: str
@@ -11,15 +18,8 @@ class SHomeDevice:
     model_type_name: str
     model_type_id: str
     unique_num: str
-    bad_edge_status: bool
-    status: bool
     nick_name: str
-    battery: int
-    zigbee_signal_strength: int
-    auto_re_lock: bool
-    dummy_mode: bool
-    created_at: datetime
-    device_total_count: int
+    _raw: dict = field(default_factory=dict, compare=False, repr=False)
 
     @staticmethod
     def from_dict(data: dict) -> 'SHomeDevice':
@@ -31,13 +31,52 @@ class SHomeDevice:
             model_type_id=data.get("thngModelTypeId", ""),
             model_type_name=data.get("thngModelTypeName", ""),
             unique_num=data.get("uniqueNum", ""),
-            bad_edge_status=data.get("badEdgeStatus", False),
-            status=data.get("status", False),
             nick_name=data.get("nickname", ""),
-            battery=data.get("battery", 0),
-            zigbee_signal_strength=data.get("zigStrength", 0),
-            auto_re_lock=data.get("autoReLock", False),
-            dummy_mode=data.get("dummyMode", False),
-            created_at=datetime.fromisoformat(data.get("createdAt", "1970-01-01T00:00:00Z").replace('Z', '+00:00')),
-            device_total_count=data.get("deviceTotalCount", 0)
+            _raw=data
         )
+
+    def to_dict(self) -> dict:
+        """Inverse of `from_dict`, in the API's field names."""
+        return {
+            **self._raw,
+            "thngId": self.id,
+            "rootThngId": self.root_id,
+            "thngModelId": self.model_id,
+            "thngModelName": self.model_name,
+            "thngModelTypeId": self.model_type_id,
+            "thngModelTypeName": self.model_type_name,
+            "uniqueNum": self.unique_num,
+            "nickname": self.nick_name
+        }
+
+    @property
+    def bad_edge_status(self) -> bool:
+        return self._raw.get("badEdgeStatus", False)
+
+    @property
+    def status(self) -> bool:
+        return self._raw.get("status", False)
+
+    @property
+    def battery(self) -> int:
+        return self._raw.get("battery", 0)
+
+    @property
+    def zigbee_signal_strength(self) -> int:
+        return self._raw.get("zigStrength", 0)
+
+    @property
+    def auto_re_lock(self) -> bool:
+        return self._raw.get("autoReLock", False)
+
+    @property
+    def dummy_mode(self) -> bool:
+        return self._raw.get("dummyMode", False)
+
+    @cached_property
+    def created_at(self) -> datetime:
+        return datetime.fromisoformat(self._raw.get("createdAt", "1970-01-01T00:00:00Z").replace('Z', '+00:00'))
+
+    @property
+    def device_total_count(self) -> int:
+        return self._raw.get("deviceTotalCount", 0)
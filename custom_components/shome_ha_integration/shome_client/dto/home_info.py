@@ -1,4 +1,5 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from functools import cached_property
 
 from .device import SHomeDevice
 from .pagination import Pagination
@@ -6,5 +7,29 @@ from .pagination import Pagination
 
 @dataclass(frozen=True)
 class SHomeInfo:
-    pagination: Pagination
     devices: list[SHomeDevice]
+    # decoded on first access of `pagination`
+    _raw_pagination: dict = field(default_factory=dict, compare=False, repr=False)
+
+    @staticmethod
+    def from_dict(data: dict) -> 'SHomeInfo':
+        return SHomeInfo(
+            devices=[SHomeDevice.from_dict(device) for device in data.get("deviceList", [])],
+            _raw_pagination=data.get("pagination", {})
+        )
+
+    @staticmethod
+    def from_pages(pages: list['SHomeInfo']) -> 'SHomeInfo':
+        """Join the pages of a paged device list, in list order and without duplicates."""
+        devices = {}
+        for page in sorted(pages, key=lambda page: page.pagination.offset):
+            for device in page.devices:
+                devices.setdefault(device.id, device)
+        return SHomeInfo(
+            devices=list(devices.values()),
+            _raw_pagination={"offset": 0, "limit": len(devices), "total": len(devices)}
+        )
+
+    @cached_property
+    def pagination(self) -> Pagination:
+        return Pagination.from_dict(self._raw_pagination)
@@ -46,4 +46,20 @@ class Login:
             biz_id=data.get("bizId", ""),
             access_token=data.get("accessToken", ""),
             join_device_type=data.get("joinDeviceType", "")
-        )
\ No newline at end of file
+        )
+
+    def to_dict(self) -> dict:
+        """Inverse of `from_dict`, in the API's field names."""
+        return {
+            "homeId": self.home_id,
+            "ihdId": self.wallpad_id,
+            "userName": self.user_name,
+            "userId": self.user_id,
+            "email": self.email,
+            "dong": self.dong,
+            "ho": self.ho,
+            "userDstnct": self.user_distinct,
+            "bizId": self.biz_id,
+            "accessToken": self.access_token,
+            "joinDeviceType": self.join_device_type
+        }
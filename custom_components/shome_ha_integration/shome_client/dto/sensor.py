@@ -13,24 +13,20 @@ class SHomeSensorInfo:
     
     @staticmethod
     def from_dict(data: dict) -> list['SHomeSensorInfo']:
+        # the payload may be shared by coalesced callers, so it is read without being modified
         devices = data.get("deviceInfoList", [])
         result = []
         for device in devices:
-            if device.get("temperature") is not None:
-                device["temperature"] = float(device["temperature"])
-            if device.get("humidity") is not None:
-                device["humidity"] = int(device["humidity"])
-            if device.get("co2") is not None:
-                device["co2"] = int(device["co2"])
-            if device.get("fineDust") is not None:
-                device["fineDust"] = int(device["fineDust"])
-
             result.append(SHomeSensorInfo(
                 sub_device_num=device.get("deviceId"),
                 sub_device_name=device.get("nickname", ""),
-                temperature=device.get("temperature"),
-                humidity=device.get("humidity"),
-                co2=device.get("co2"),
-                pm10=device.get("fineDust")
+                temperature=_convert(device.get("temperature"), float),
+                humidity=_convert(device.get("humidity"), int),
+                co2=_convert(device.get("co2"), int),
+                pm10=_convert(device.get("fineDust"), int)
             ))
         return result
+
+
+def _convert(value, convert):
+    return convert(value) if value is not None else None
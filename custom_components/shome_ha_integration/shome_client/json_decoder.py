@@ -0,0 +1,7 @@
+"""JSON decoding of API responses: orjson when installed (Home Assistant ships it), else the stdlib."""
+try:
+    from orjson import loads as json_loads
+except ImportError:  # pragma: no cover
+    from json import loads as json_loads
+
+__all__ = ["json_loads"]
@@ -0,0 +1,183 @@
+from bisect import bisect_left
+from time import perf_counter
+from typing import Optional
+
+# Upper bounds (milliseconds) of the latency histogram buckets; the last bucket is unbounded
+LATENCY_BUCKETS_MS: tuple[float, ...] = (50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class EndpointMetrics:
+    """Counters of one url_key. Recording is a handful of integer updates, cheap enough to leave on."""
+
+    __slots__ = ("requests", "failures", "in_flight", "retries", "relogins", "bytes_received",
+                 "total_ms", "max_ms", "buckets", "status_codes", "throttled", "throttled_ms", "coalesced",
+                 "cache_hits")
+
+    def __init__(self):
+        self.requests = 0
+        self.failures = 0
+        self.in_flight = 0
+        self.retries = 0
+        self.relogins = 0
+        self.bytes_received = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        # HTTP status -> count, None for requests that got no response
+        self.status_codes: dict[Optional[int], int] = {}
+        # requests held back by the rate limits, and the time they waited (not part of the latency)
+        self.throttled = 0
+        self.throttled_ms = 0.0
+        # calls answered by a fetch already in flight / by the response cache, without a request
+        self.coalesced = 0
+        self.cache_hits = 0
+
+    def start(self) -> float:
+        """Count a request in flight, returns its start time for `finish`."""
+        self.in_flight += 1
+        return perf_counter()
+
+    def finish(self, started: float, status: Optional[int], bytes_received: int = 0):
+        """Record a request begun with `start`; `status` is None when no response came."""
+        elapsed_ms = (perf_counter() - started) * 1000
+        self.in_flight -= 1
+        self.requests += 1
+        self.total_ms += elapsed_ms
+        if elapsed_ms > self.max_ms:
+            self.max_ms = elapsed_ms
+        self.buckets[bisect_left(LATENCY_BUCKETS_MS, elapsed_ms)] += 1
+        status_codes = self.status_codes
+        status_codes[status] = status_codes.get(status, 0) + 1
+        if status is None or status >= 400:
+            self.failures += 1
+        self.bytes_received += bytes_received
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        """Upper bound of the bucket holding the given fraction of requests (ms), None without data."""
+        return _percentile(self.buckets, self.requests, self.max_ms, fraction)
+
+    def as_dict(self) -> dict:
+        return {
+            "requests": self.requests,
+            "failures": self.failures,
+            "in_flight": self.in_flight,
+            "retries": self.retries,
+            "relogins": self.relogins,
+            "bytes_received": self.bytes_received,
+            "throttled": self.throttled,
+            "throttled_ms": round(self.throttled_ms, 1),
+            "coalesced": self.coalesced,
+            "cache_hits": self.cache_hits,
+            "mean_ms": round(self.total_ms / self.requests, 1) if self.requests else None,
+            "p50_ms": self.percentile(0.5),
+            "p95_ms": self.percentile(0.95),
+            "max_ms": round(self.max_ms, 1),
+            "latency_buckets_ms": _buckets_dict(self.buckets),
+            "status_codes": {
+                str(status) if status is not None else "error": count for status, count in self.status_codes.items()
+            },
+        }
+
+
+def _percentile(buckets: list[int], total: int, max_ms: float, fraction: float) -> Optional[float]:
+    if not total:
+        return None
+    threshold = fraction * total
+    seen = 0
+    for bound, count in zip(LATENCY_BUCKETS_MS, buckets):
+        seen += count
+        if seen >= threshold:
+            return bound
+    return max_ms
+
+
+def _buckets_dict(buckets: list[int]) -> dict[str, int]:
+    return {
+        **{f"<={bound:g}": count for bound, count in zip(LATENCY_BUCKETS_MS, buckets)},
+        f">{LATENCY_BUCKETS_MS[-1]:g}": buckets[-1],
+    }
+
+
+class QueueMetrics:
+    """Time the requests of one priority waited for a dispatch slot."""
+
+    __slots__ = ("dispatched", "expired", "cancelled", "waiting", "total_wait_ms", "max_wait_ms", "buckets")
+
+    def __init__(self):
+        self.dispatched = 0
+        # dropped when their deadline passed in the queue / given up by their caller
+        self.expired = 0
+        self.cancelled = 0
+        self.waiting = 0
+        self.total_wait_ms = 0.0
+        self.max_wait_ms = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+
+    def record_wait(self, wait_ms: float):
+        self.dispatched += 1
+        self.total_wait_ms += wait_ms
+        if wait_ms > self.max_wait_ms:
+            self.max_wait_ms = wait_ms
+        self.buckets[bisect_left(LATENCY_BUCKETS_MS, wait_ms)] += 1
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        return _percentile(self.buckets, self.dispatched, self.max_wait_ms, fraction)
+
+    def as_dict(self) -> dict:
+        return {
+            "dispatched": self.dispatched,
+            "expired": self.expired,
+            "cancelled": self.cancelled,
+            "waiting": self.waiting,
+            "mean_wait_ms": round(self.total_wait_ms / self.dispatched, 1) if self.dispatched else None,
+            "p95_wait_ms": self.percentile(0.95),
+            "max_wait_ms": round(self.max_wait_ms, 1),
+            "wait_buckets_ms": _buckets_dict(self.buckets),
+        }
+
+
+class RequestMetrics:
+    """Per url_key request metrics of one `SHomeClient`."""
+
+    __slots__ = ("_endpoints",)
+
+    def __init__(self):
+        self._endpoints: dict[str, EndpointMetrics] = {}
+
+    def endpoint(self, url_key: str) -> EndpointMetrics:
+        metrics = self._endpoints.get(url_key)
+        if metrics is None:
+            metrics = self._endpoints[url_key] = EndpointMetrics()
+        return metrics
+
+    @property
+    def requests(self) -> int:
+        return sum(metrics.requests for metrics in self._endpoints.values())
+
+    @property
+    def failures(self) -> int:
+        return sum(metrics.failures for metrics in self._endpoints.values())
+
+    @property
+    def in_flight(self) -> int:
+        return sum(metrics.in_flight for metrics in self._endpoints.values())
+
+    @property
+    def relogins(self) -> int:
+        return sum(metrics.relogins for metrics in self._endpoints.values())
+
+    @property
+    def mean_ms(self) -> Optional[float]:
+        requests = self.requests
+        if not requests:
+            return None
+        return round(sum(metrics.total_ms for metrics in self._endpoints.values()) / requests, 1)
+
+    def slowest(self) -> Optional[str]:
+        """url_key that spent the most time in requests so far."""
+        if not self._endpoints:
+            return None
+        return max(self._endpoints.items(), key=lambda item: item[1].total_ms)[0]
+
+    def as_dict(self) -> dict[str, dict]:
+        return {url_key: metrics.as_dict() for url_key, metrics in sorted(self._endpoints.items())}
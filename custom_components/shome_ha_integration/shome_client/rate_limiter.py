@@ -0,0 +1,123 @@
+import asyncio
+import logging
+import time
+from typing import Callable
+
+from .const import (
+    RATE_LIMIT_ACCOUNT_BURST,
+    RATE_LIMIT_ACCOUNT_PER_SECOND,
+    RATE_LIMIT_FAMILY_BURST,
+    RATE_LIMIT_FAMILY_PER_SECOND,
+    RATE_LIMIT_INTERACTIVE_RESERVE,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """`rate` tokens per second, holding at most `capacity`; one token per request."""
+
+    __slots__ = ("_rate", "_capacity", "_tokens", "_updated_at", "_clock")
+
+    def __init__(self, rate: float, capacity: float, clock: Callable[[], float] = time.monotonic):
+        self._rate = rate
+        self._capacity = max(1.0, capacity)
+        self._tokens = self._capacity
+        self._clock = clock
+        self._updated_at = clock()
+
+    def _refill(self):
+        now = self._clock()
+        self._tokens = min(self._capacity, self._tokens + (now - self._updated_at) * self._rate)
+        self._updated_at = now
+
+    @property
+    def rate(self) -> float:
+        return self._rate
+
+    @property
+    def tokens(self) -> float:
+        self._refill()
+        return self._tokens
+
+    def wait_time(self, reserve: float = 0.0) -> float:
+        """Seconds until a token can be taken while leaving `reserve` tokens, 0 when it can now."""
+        missing = 1.0 + reserve - self.tokens
+        return missing / self._rate if missing > 0 else 0.0
+
+    def take(self):
+        self._refill()
+        self._tokens -= 1.0
+
+
+class RequestGovernor:
+    """Request rate limits of one account: a token bucket for the account and one per endpoint family.
+
+    Interactive requests (commands) go first. Background requests (polls) wait while a
+    command is waiting, and never take the last `interactive_reserve` tokens of a bucket,
+    so a command does not queue behind a poll burst while polling slows down instead.
+    """
+
+    def __init__(
+            self,
+            account_rate: float = RATE_LIMIT_ACCOUNT_PER_SECOND,
+            account_burst: float = RATE_LIMIT_ACCOUNT_BURST,
+            family_rate: float = RATE_LIMIT_FAMILY_PER_SECOND,
+            family_burst: float = RATE_LIMIT_FAMILY_BURST,
+            interactive_reserve: float = RATE_LIMIT_INTERACTIVE_RESERVE,
+            clock: Callable[[], float] = time.monotonic,
+    ):
+        self._clock = clock
+        self._account = TokenBucket(account_rate, account_burst, clock)
+        self._family_rate = family_rate
+        self._family_burst = family_burst
+        self._reserve = interactive_reserve
+        # endpoint family -> bucket
+        self._families: dict[str, TokenBucket] = {}
+        self._interactive_waiting = 0
+
+    def _bucket(self, family: str) -> TokenBucket:
+        bucket = self._families.get(family)
+        if bucket is None:
+            bucket = self._families[family] = TokenBucket(self._family_rate, self._family_burst, self._clock)
+        return bucket
+
+    def _wait_time(self, family: TokenBucket, interactive: bool) -> float:
+        if interactive:
+            return max(self._account.wait_time(), family.wait_time())
+        if self._interactive_waiting:
+            # let the waiting commands have the next tokens
+            return max(self._account.wait_time(), family.wait_time(), 1.0 / self._account.rate)
+        return max(self._account.wait_time(self._reserve), family.wait_time(self._reserve))
+
+    async def acquire(self, family: str, interactive: bool) -> float:
+        """Wait until a request of `family` may be sent, return the seconds waited."""
+        bucket = self._bucket(family)
+        wait = self._wait_time(bucket, interactive)
+        if wait <= 0:
+            self._account.take()
+            bucket.take()
+            return 0.0
+
+        started = self._clock()
+        if interactive:
+            self._interactive_waiting += 1
+        try:
+            while wait > 0:
+                await asyncio.sleep(wait)
+                wait = self._wait_time(bucket, interactive)
+        finally:
+            if interactive:
+                self._interactive_waiting -= 1
+        self._account.take()
+        bucket.take()
+        waited = self._clock() - started
+        _LOGGER.debug("[%s] rate limited for %.2fs (%s)", family, waited, "command" if interactive else "poll")
+        return waited
+
+    def as_dict(self) -> dict:
+        return {
+            "account_tokens": round(self._account.tokens, 1),
+            "family_tokens": {family: round(bucket.tokens, 1) for family, bucket in sorted(self._families.items())},
+            "commands_waiting": self._interactive_waiting,
+        }
@@ -0,0 +1,86 @@
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Optional
+
+from .const import RESPONSE_CACHE_TTL_SECONDS
+from .metrics import EndpointMetrics
+from .scheduler import RequestPriority
+
+_LOGGER = logging.getLogger(__name__)
+
+# (url_key, device_id)
+_Key = tuple[str, str]
+
+
+class RequestCoalescer:
+    """Shares device info GETs between concurrent callers, keyed by url_key and device id.
+
+    A caller asking for a device whose info is already being fetched awaits that fetch
+    instead of sending its own, unless the running fetch has a lower priority (a
+    confirmation does not wait for a queued poll). With a `ttl` the decoded response is
+    also kept that many seconds. Commands invalidate their device, so state fetched before
+    a command completed is never handed to a caller that asked after it.
+
+    Callers share the same decoded payload and must not modify it.
+    """
+
+    def __init__(self, ttl: float = RESPONSE_CACHE_TTL_SECONDS, clock: Callable[[], float] = time.monotonic):
+        self._ttl = ttl
+        self._clock = clock
+        self._in_flight: dict[_Key, tuple[asyncio.Future, RequestPriority]] = {}
+        # key -> (fetched at, payload)
+        self._cache: dict[_Key, tuple[float, Any]] = {}
+
+    async def get(
+            self,
+            url_key: str,
+            device_id: str,
+            priority: RequestPriority,
+            fetch: Callable[[], Awaitable[Any]],
+            endpoint: Optional[EndpointMetrics] = None,
+    ) -> Any:
+        key = (url_key, device_id)
+        if self._ttl > 0 and (cached := self._cache.get(key)) is not None:
+            fetched_at, payload = cached
+            if self._clock() - fetched_at < self._ttl:
+                if endpoint is not None:
+                    endpoint.cache_hits += 1
+                return payload
+            del self._cache[key]
+
+        running = self._in_flight.get(key)
+        if running is not None and running[1] <= priority:
+            future = running[0]
+            if endpoint is not None:
+                endpoint.coalesced += 1
+        else:
+            future = asyncio.ensure_future(fetch())
+            self._in_flight[key] = (future, priority)
+            future.add_done_callback(lambda done: self._fetch_done(key, done))
+        # one caller giving up must not cancel the fetch the others wait for
+        return await asyncio.shield(future)
+
+    def _fetch_done(self, key: _Key, future: asyncio.Future):
+        running = self._in_flight.get(key)
+        if running is not None and running[0] is future:
+            del self._in_flight[key]
+        if future.cancelled():
+            return
+        # retrieved here so an error nobody waits for any more is not reported as unhandled
+        if future.exception() is None and self._ttl > 0 and running is not None and running[0] is future:
+            self._cache[key] = (self._clock(), future.result())
+
+    def invalidate(self, device_id: str):
+        """Forget running fetches and cached responses of a device, e.g. after a command."""
+        for key in [key for key in self._in_flight if key[1] == device_id]:
+            del self._in_flight[key]
+        for key in [key for key in self._cache if key[1] == device_id]:
+            del self._cache[key]
+
+    def cancel(self):
+        """Cancel the running fetches and drop the cache, when the client closes."""
+        for future, _ in self._in_flight.values():
+            future.cancel()
+        self._in_flight.clear()
+        self._cache.clear()
@@ -0,0 +1,147 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from enum import IntEnum
+from typing import AsyncIterator, Callable, Optional, Sequence
+
+from .const import SCHEDULER_DEADLINES_SECONDS, SCHEDULER_MAX_IN_FLIGHT, SCHEDULER_WEIGHTS
+from .metrics import QueueMetrics
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class RequestPriority(IntEnum):
+    # commands sent by the user or an automation
+    INTERACTIVE = 0
+    # refreshes confirming a command
+    CONFIRMATION = 1
+    # background polling
+    POLL = 2
+
+
+class RequestExpiredError(Exception):
+    """A queued request was dropped because its deadline passed before it could be sent."""
+
+    def __init__(self, priority: RequestPriority, waited: float):
+        super().__init__(f"{priority.name.lower()} request dropped after waiting {waited:.1f} seconds to be sent")
+        self.priority = priority
+        self.waited = waited
+
+
+class RequestScheduler:
+    """Decides which of an account's requests is sent next, with at most `max_in_flight` running.
+
+    Requests that find no free slot wait in one queue per priority. Freed slots are handed
+    out by smooth weighted round robin over the non-empty queues, so commands overtake a
+    poll backlog while polls still make progress under a burst of commands. A request still
+    queued when the deadline of its priority passes is dropped with `RequestExpiredError`:
+    a stale poll is better skipped than sent late, the next one fetches fresh state anyway.
+    """
+
+    def __init__(
+            self,
+            max_in_flight: int = SCHEDULER_MAX_IN_FLIGHT,
+            weights: Sequence[int] = SCHEDULER_WEIGHTS,
+            deadlines: Sequence[Optional[float]] = SCHEDULER_DEADLINES_SECONDS,
+            clock: Callable[[], float] = time.monotonic,
+    ):
+        self._max_in_flight = max(1, max_in_flight)
+        self._weights = {priority: max(1, weights[priority]) for priority in RequestPriority}
+        self._deadlines = {priority: deadlines[priority] for priority in RequestPriority}
+        self._clock = clock
+        self._queues: dict[RequestPriority, deque[asyncio.Future]] = {priority: deque() for priority in RequestPriority}
+        # smooth weighted round robin state
+        self._current = {priority: 0 for priority in RequestPriority}
+        self._in_flight = 0
+        self._waiting = 0
+        self._metrics = {priority: QueueMetrics() for priority in RequestPriority}
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @asynccontextmanager
+    async def slot(self, priority: RequestPriority) -> AsyncIterator[None]:
+        """Hold one of the in-flight slots for a request of `priority`."""
+        await self._acquire(priority)
+        try:
+            yield
+        finally:
+            self._in_flight -= 1
+            self._dispatch()
+
+    async def _acquire(self, priority: RequestPriority):
+        metrics = self._metrics[priority]
+        if self._in_flight < self._max_in_flight and not self._waiting:
+            self._in_flight += 1
+            metrics.record_wait(0.0)
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        queue = self._queues[priority]
+        queue.append(future)
+        self._waiting += 1
+        metrics.waiting += 1
+        started = self._clock()
+        try:
+            await asyncio.wait((future,), timeout=self._deadlines[priority])
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # the slot was handed over as the caller gave up: pass it on
+                self._in_flight -= 1
+                self._dispatch()
+            else:
+                self._drop(queue, future)
+            metrics.cancelled += 1
+            raise
+        finally:
+            metrics.waiting -= 1
+
+        waited = self._clock() - started
+        # a slot may have been handed over between the timeout and this task resuming
+        if not future.done():
+            self._drop(queue, future)
+            metrics.expired += 1
+            _LOGGER.debug("%s request expired after %.1fs in the queue", priority.name.lower(), waited)
+            raise RequestExpiredError(priority, waited)
+        metrics.record_wait(waited * 1000)
+
+    def _drop(self, queue: deque, future: asyncio.Future):
+        future.cancel()
+        try:
+            queue.remove(future)
+        except ValueError:
+            return
+        self._waiting -= 1
+
+    def _dispatch(self):
+        while self._in_flight < self._max_in_flight and self._waiting:
+            future = self._next_queue().popleft()
+            self._waiting -= 1
+            if future.done():
+                continue
+            self._in_flight += 1
+            future.set_result(None)
+
+    def _next_queue(self) -> deque:
+        # smooth weighted round robin (as in nginx) over the queues that have waiters
+        total = 0
+        chosen: Optional[RequestPriority] = None
+        for priority, queue in self._queues.items():
+            if not queue:
+                continue
+            weight = self._weights[priority]
+            self._current[priority] += weight
+            total += weight
+            if chosen is None or self._current[priority] > self._current[chosen]:
+                chosen = priority
+        self._current[chosen] -= total
+        return self._queues[chosen]
+
+    def as_dict(self) -> dict:
+        return {
+            "in_flight": self._in_flight,
+            "queues": {priority.name.lower(): metrics.as_dict() for priority, metrics in self._metrics.items()},
+        }
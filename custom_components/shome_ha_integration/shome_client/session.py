@@ -0,0 +1,25 @@
+from aiohttp import ClientSession, TCPConnector
+from homeassistant.util.ssl import get_default_context
+
+from .const import CONNECTION_LIMIT_PER_HOST, DNS_CACHE_TTL_SECONDS, KEEPALIVE_TIMEOUT_SECONDS
+
+
+def create_session(
+        limit_per_host: int = CONNECTION_LIMIT_PER_HOST,
+        keepalive_timeout: float = KEEPALIVE_TIMEOUT_SECONDS,
+        **kwargs,
+) -> ClientSession:
+    """aiohttp session with its own connection pool for the SHome API host.
+
+    Idle connections are kept long enough to be reused by the next poll, so a refresh
+    fan-out does not pay TCP and TLS handshakes again. HA's shared SSL context is used,
+    which avoids loading the CA bundle in the event loop.
+    """
+    connector = TCPConnector(
+        limit_per_host=limit_per_host,
+        keepalive_timeout=keepalive_timeout,
+        ttl_dns_cache=DNS_CACHE_TTL_SECONDS,
+        ssl=get_default_context(),
+        enable_cleanup_closed=True,
+    )
+    return ClientSession(connector=connector, **kwargs)
@@ -1,12 +1,19 @@
 import asyncio
 import logging
+import time
 from enum import Enum
-from typing import Optional, Tuple
-
-from aiohttp import ClientResponseError
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
-
+from typing import AsyncIterator, Callable, Optional, Tuple
+
+from aiohttp import ClientError, ClientResponseError, ClientSession
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import Event, HomeAssistant
+
+from .circuit_breaker import CircuitBreaker, RetryPolicy
+from .const import (
+    DEVICE_PAGE_CONCURRENCY, DEVICE_PAGE_SIZE, RESPONSE_CACHE_TTL_SECONDS, TOKEN_EARLY_EXPIRY_THRESHOLD,
+    TOKEN_LIFETIME_GROWTH, TOKEN_LIFETIME_SECONDS,
+    TOKEN_MIN_LIFETIME_SECONDS, TOKEN_REFRESH_RATIO, TRANSIENT_STATUS_CODES
+)
 from .dto.aircon import SHomeAirconInfo
 from .dto.cookie import Cookie
 from .dto.device import SHomeDevice
@@ -17,9 +24,16 @@ from .dto.status import OnOffStatus
 from .dto.login import Login, CheckAppVersionResponse
 from .dto.sensor import SHomeSensorInfo
 from .dto.ventilation import SHomeVentilationInfo, VentilationSpeed
-from .dto.pagination import Pagination
+from .json_decoder import json_loads
+from .metrics import RequestMetrics
+from .rate_limiter import RequestGovernor
+from .request_coalescer import RequestCoalescer
+from .scheduler import RequestExpiredError, RequestPriority, RequestScheduler
 from .shome_header_maker import SHomeHeaderMaker
 from .shome_param_maker import SHomeParamMaker
+from .shome_signer import SHomeSigner
+from .shome_url_maker import SHomeUrlMaker
+from .session import create_session
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -31,14 +45,53 @@ class DeviceRequestType(Enum):
 
 class SHomeClient:
 
-    def __init__(self, hass: HomeAssistant):
+    def __init__(
+            self,
+            hass: HomeAssistant,
+            base_url: str = SHomeUrlMaker.BASE_URL,
+            retry_policy: RetryPolicy = RetryPolicy(),
+            session: Optional[ClientSession] = None,
+            signer: Optional[SHomeSigner] = None,
+            governor: Optional[RequestGovernor] = None,
+            response_cache_ttl: float = RESPONSE_CACHE_TTL_SECONDS,
+    ):
+        """`session` and `signer` can be shared between clients; without a session the client owns a pool.
+
+        `governor` rate-limits the account's requests, a default one is created per client.
+        `response_cache_ttl` is how long device info responses are reused, 0 to only share
+        identical requests in flight.
+        """
         self._credential: dict = {}
-        self._session = async_get_clientsession(hass)
+        self._owns_session = session is None
+        self._session = session if session is not None else create_session()
+        self._unsub_close = (
+            hass.bus.async_listen_once(EVENT_HOMEASSISTANT_CLOSE, self._async_close_on_stop)
+            if self._owns_session else None
+        )
         self._cookie: Optional[Cookie] = None
         self._login: Optional[Login] = None
         self._home_info: Optional[SHomeInfo] = None
         self._header_maker = SHomeHeaderMaker()
-        self._param_maker = SHomeParamMaker()
+        self._param_maker = SHomeParamMaker(signer)
+        self._url_maker = SHomeUrlMaker(base_url)
+        self._metrics = RequestMetrics()
+        self._retry_policy = retry_policy
+        # endpoint family -> circuit breaker
+        self._breakers: dict[str, CircuitBreaker] = {}
+        self._governor = governor if governor is not None else RequestGovernor()
+        self._scheduler = RequestScheduler()
+        self._coalescer = RequestCoalescer(response_cache_ttl)
+
+        # single-flight login state
+        self._login_task: Optional[asyncio.Task] = None
+        self._login_generation: int = 0
+        self._logged_in_at: Optional[float] = None
+        self._token_lifetime: float = TOKEN_LIFETIME_SECONDS
+        # tokens in a row that got a 401 before the expected lifetime
+        self._early_expiries: int = 0
+        # generation of a token restored with `restore_session`; its age is only an estimate
+        self._restored_generation: Optional[int] = None
+        self._session_listener: Optional[Callable[[dict], None]] = None
 
 
     def set_credential(self, credential: dict):
@@ -47,73 +100,156 @@ class SHomeClient:
         _LOGGER.debug("Credentials set for user: %s", credential['username'])
 
 
-    def close(self):
-        return None
+    def set_session_listener(self, listener: Optional[Callable[[dict], None]]):
+        """Call `listener` with `export_session()` after every successful login."""
+        self._session_listener = listener
+
+
+    def export_session(self) -> Optional[dict]:
+        """Session cookies and access token, for `restore_session` after a restart. None before the first login."""
+        if self._cookie is None or self._login is None:
+            return None
+        return {
+            "cookie": self._cookie.to_dict(),
+            "login": self._login.to_dict(),
+            # wall clock, the monotonic clock does not survive a restart
+            "issued_at": time.time() - self.token_age,
+        }
+
+
+    def restore_session(self, session: dict) -> bool:
+        """Reuse a session saved with `export_session` instead of logging in.
+
+        A token the server no longer accepts is replaced by a regular login on the first 401.
+        Returns False (and keeps the client logged out) when `session` is unusable.
+        """
+        try:
+            cookie = Cookie.from_dict(session["cookie"])
+            login = Login.from_dict(session["login"])
+            token_age = max(0.0, time.time() - float(session["issued_at"]))
+        except (KeyError, TypeError, ValueError) as e:
+            _LOGGER.warning("[login] ignoring unreadable stored session - %s", e)
+            return False
+        if not login.access_token or not login.wallpad_id:
+            return False
+
+        self._cookie = cookie
+        self._login = login
+        self._logged_in_at = time.monotonic() - token_age
+        self._login_generation += 1
+        self._restored_generation = self._login_generation
+        _LOGGER.debug("[login] restored session issued %.0f seconds ago, wallpad_id: %s", token_age, login.wallpad_id)
+        return True
+
+
+    async def close(self):
+        """Cancel a running login and close the connection pool if the client owns it."""
+        if self._login_task is not None and not self._login_task.done():
+            self._login_task.cancel()
+        self._coalescer.cancel()
+        if self._unsub_close is not None:
+            self._unsub_close()
+            self._unsub_close = None
+        if self._owns_session and not self._session.closed:
+            await self._session.close()
+
+
+    async def _async_close_on_stop(self, event: Event):
+        # the listener is gone once it fired
+        self._unsub_close = None
+        await self.close()
+
+
+    @property
+    def metrics(self) -> RequestMetrics:
+        return self._metrics
+
+
+    @property
+    def rate_limits(self) -> dict:
+        return self._governor.as_dict()
+
+    @property
+    def scheduler_stats(self) -> dict:
+        return self._scheduler.as_dict()
+
+    @property
+    def circuit_states(self) -> dict[str, str]:
+        """Endpoint family -> circuit breaker state."""
+        return {family: breaker.state for family, breaker in self._breakers.items()}
+
+
+    @property
+    def token_age(self) -> Optional[float]:
+        """Seconds since the current access token was issued, None before the first login."""
+        if self._logged_in_at is None:
+            return None
+        return time.monotonic() - self._logged_in_at
+
+
+    def _start_login(self) -> asyncio.Task:
+        """Start a login unless one is already running, and return the shared task."""
+        if self._login_task is None or self._login_task.done():
+            self._login_task = asyncio.create_task(self._do_login())
+            self._login_task.add_done_callback(self._on_login_done)
+        return self._login_task
+
+
+    @staticmethod
+    def _on_login_done(task: asyncio.Task):
+        # retrieve the exception so a background login nobody awaited does not warn
+        if not task.cancelled():
+            task.exception()
+
+
+    async def _ensure_login(self):
+        """Make sure a usable token exists before sending a request."""
+        if self._login_task is not None and not self._login_task.done():
+            # a login is running; wait for it instead of starting another one
+            await asyncio.shield(self._login_task)
+        elif self._login is None:
+            await self.login()
+        elif self.token_age > self._token_lifetime * TOKEN_REFRESH_RATIO:
+            # token is still valid: renew it in the background and keep using it for this request
+            _LOGGER.debug("[login] token is %.0f seconds old, re-authenticating in background", self.token_age)
+            # it lived as long as expected: earlier 401s were not its lifetime
+            self._early_expiries = 0
+            if self._token_lifetime < TOKEN_LIFETIME_SECONDS:
+                self._token_lifetime = min(TOKEN_LIFETIME_SECONDS, self._token_lifetime * TOKEN_LIFETIME_GROWTH)
+            self._start_login()
+
+
+    async def _relogin(self, failed_generation: int):
+        """Re-authenticate after a 401, coalescing concurrent callers into one login."""
+        if failed_generation != self._login_generation:
+            # someone else already logged in again after our request was sent
+            await self._ensure_login()
+            return
+
+        # a restored token may have been dropped by the server for other reasons than its age
+        if (failed_generation != self._restored_generation
+                and (token_age := self.token_age) is not None and token_age < self._token_lifetime):
+            # one early 401 may be a forced logout (e.g. the app took over the session), not the lifetime
+            self._early_expiries += 1
+            if self._early_expiries >= TOKEN_EARLY_EXPIRY_THRESHOLD:
+                self._token_lifetime = max(TOKEN_MIN_LIFETIME_SECONDS, token_age)
+                _LOGGER.info("[login] token expired after %.0f seconds, adjusting expected lifetime", token_age)
+        await self.login()
 
 
     def _get_url(self, url_type: str, **kwargs) -> Tuple[str, str]:
-        if url_type == "check_app_version":
-            return "https://shome-api.samsung-ihp.com/v18/users/checkAppVersion", "GET"
-        elif url_type == "login":
-            return "https://shome-api.samsung-ihp.com/v18/users/login", "PUT"
-        elif url_type == "list_device":
-            return f"https://shome-api.samsung-ihp.com/v16/settings/{self._login.wallpad_id}/devices/", "GET"
-        elif url_type == "get_light_info":
-            device_id = kwargs.get("device_id")
-            return f"https://shome-api.samsung-ihp.com/v18/settings/light/{device_id}", "GET"
-        elif url_type == "toggle_all_light":
-            device_id = kwargs.get("device_id")
-            return f"https://shome-api.samsung-ihp.com/v18/settings/light/{device_id}/0/on-off", "PUT"
-        elif url_type == "toggle_single_light":
-            device_id = kwargs.get("device_id")
-            light_id = kwargs.get("light_id")
-            return f"https://shome-api.samsung-ihp.com/v18/settings/light/{device_id}/{light_id}/on-off", "PUT"
-        elif url_type == "toggle_room_light":
-            device_id = kwargs.get("device_id")
-            room_id = kwargs.get("room_id")
-            return f"https://shome-api.samsung-ihp.com/v18/settings/light/{device_id}/rooms/{room_id}/on-off", "PUT"
-        elif url_type == "sensor_info":
-            device_id = kwargs.get("device_id")
-            return f"https://shome-api.samsung-ihp.com/v18/settings/environment-sensor/{device_id}", "GET"
-        elif url_type == "ventilation_info":
-            device_id = kwargs.get("device_id")
-            return f"https://shome-api.samsung-ihp.com/v18/settings/ventilator/{device_id}", "GET"
-        elif url_type == "toggle_ventilation":
-            device_id = kwargs.get("device_id")
-            sub_device_id = kwargs.get("sub_device_id")
-            return f"https://shome-api.samsung-ihp.com/v18/settings/ventilator/{device_id}/{sub_device_id}/on-off", "PUT"
-        elif url_type == "set_ventilation_speed":
-            device_id = kwargs.get("device_id")
-            sub_device_id = kwargs.get("sub_device_id")
-            return f"https://shome-api.samsung-ihp.com/v18/settings/ventilator/{device_id}/{sub_device_id}/windspeed", "PUT"
-        elif url_type == "aircon_info":
-            device_id = kwargs.get("device_id")
-            return f"https://shome-api.samsung-ihp.com/v18/settings/aircon/{device_id}", "GET"
-        elif url_type == "toggle_aircon":
-            device_id = kwargs.get("device_id")
-            sub_device_id = kwargs.get("sub_device_id")
-            return f"https://shome-api.samsung-ihp.com/v18/settings/aircon/{device_id}/{sub_device_id}/on-off", "PUT"
-        elif url_type == "set_aircon_temp":
-            device_id = kwargs.get("device_id")
-            sub_device_id = kwargs.get("sub_device_id")
-            return f"https://shome-api.samsung-ihp.com/v18/settings/aircon/{device_id}/{sub_device_id}/temperature", "PUT"
-        elif url_type == "heater_info":
-            device_id = kwargs.get("device_id")
-            return f"https://shome-api.samsung-ihp.com/v18/settings/heater/{device_id}", "GET"
-        elif url_type == "toggle_heater":
-            device_id = kwargs.get("device_id")
-            sub_device_id = kwargs.get("sub_device_id")
-            return f"https://shome-api.samsung-ihp.com/v18/settings/heater/{device_id}/{sub_device_id}/on-off", "PUT"
-        elif url_type == "set_heater_temp":
-            device_id = kwargs.get("device_id")
-            sub_device_id = kwargs.get("sub_device_id")
-            return f"https://shome-api.samsung-ihp.com/v18/settings/heater/{device_id}/{sub_device_id}/temperature", "PUT"
-        else:
-            raise ValueError(f"Unknown URL type: {url_type}")
+        return self._url_maker.get_url(url_type, kwargs)
 
 
     async def login(self):
-        """Perform login to SHome API."""
+        """Perform login to SHome API.
+
+        Concurrent callers share one in-flight login instead of each running the handshake.
+        """
+        await asyncio.shield(self._start_login())
+
+
+    async def _do_login(self):
         _LOGGER.debug("[login] start login for user '%s'", self._credential['username'])
         
         try:
@@ -123,158 +259,292 @@ class SHomeClient:
 
             headers = self._header_maker.check_app_version_header()
             params = self._param_maker.check_app_version_params()
-            _LOGGER.debug("[login] check_app_version request URL: %s", url)
-            _LOGGER.debug("[login] check_app_version request method: %s", method)
-            _LOGGER.debug("[login] check_app_version request headers: %s", headers)
-            _LOGGER.debug("[login] check_app_version request params: %s", params)
-
-            async with self._session.request(
-                method=method, url=url,
-                headers=headers,
-                params=params
-            ) as response:
-                response.raise_for_status()
-
-                raw_body = await response.json()
-                body = CheckAppVersionResponse.from_dict(raw_body)
-
-                _LOGGER.debug(f"[login] checkAppVersionResponse body: {body}")
-                # Debug: Log all headers
-                _LOGGER.debug("[login] login response status code: %s", response.status)
-                _LOGGER.debug("[login] Response headers: %s", dict(response.headers))
-                _LOGGER.debug("[login] Response status: %s", response.status)
-                _LOGGER.debug("[login] Response body: %s", body)
-
-                # Extract cookies from response
-                jsessionid = None
-                wmonid = None
-
-                # Parse cookies from response.cookies (SimpleCookie object)
-                if response.cookies:
-                    for cookie_name, cookie_value in response.cookies.items():
-                        _LOGGER.debug("[login] Cookie found: %s = %s", cookie_name,
-                                      cookie_value.value if hasattr(cookie_value, 'value') else cookie_value)
-                        if cookie_name == "JSESSIONID":
-                            jsessionid = cookie_value.value if hasattr(cookie_value, 'value') else str(cookie_value)
-                        elif cookie_name == "WMONID":
-                            wmonid = cookie_value.value if hasattr(cookie_value, 'value') else str(cookie_value)
-
-                if jsessionid:
-                    self._cookie = Cookie(
-                        JSESSIONID=jsessionid,
-                        WMONID=wmonid
-                    )
-                    _LOGGER.debug("[login] got session cookies - JSESSIONID: %s, WMONID: %s", self._cookie.JSESSIONID,
-                                  self._cookie.WMONID)
-                elif self._cookie is None:
-                    raise RuntimeError("[login] Cookie not found in response and no existing cookie available")
-                else:
-                    _LOGGER.warning("[login] Cookie not found in response, using existing cookie value")
+            _LOGGER.debug("[login] check_app_version request: [%s] %s", method, url)
+
+            endpoint = self._metrics.endpoint("check_app_version")
+            status = None
+            started = endpoint.start()
+            try:
+                async with self._session.request(
+                    method=method, url=url,
+                    headers=headers,
+                    params=params
+                ) as response:
+                    status = response.status
+                    response.raise_for_status()
+
+                    raw_body = json_loads(await response.read())
+                    body = CheckAppVersionResponse.from_dict(raw_body)
+                    _LOGGER.debug("[login] check_app_version response status: %s, body: %s", response.status, body)
+
+                    # Extract cookies from response
+                    jsessionid = None
+                    wmonid = None
+
+                    # Parse cookies from response.cookies (SimpleCookie object)
+                    if response.cookies:
+                        for cookie_name, cookie_value in response.cookies.items():
+                            # cookie values are session secrets, never log them
+                            _LOGGER.debug("[login] Cookie found: %s", cookie_name)
+                            if cookie_name == "JSESSIONID":
+                                jsessionid = cookie_value.value if hasattr(cookie_value, 'value') else str(cookie_value)
+                            elif cookie_name == "WMONID":
+                                wmonid = cookie_value.value if hasattr(cookie_value, 'value') else str(cookie_value)
+
+                    if jsessionid:
+                        self._cookie = Cookie(
+                            JSESSIONID=jsessionid,
+                            WMONID=wmonid
+                        )
+                    elif self._cookie is None:
+                        raise RuntimeError("[login] Cookie not found in response and no existing cookie available")
+                    else:
+                        _LOGGER.warning("[login] Cookie not found in response, using existing cookie value")
+            finally:
+                endpoint.finish(started, status)
 
             await asyncio.sleep(0.5)  # Sleep to ensure cookies are set before next request
 
             # Step 2: Perform actual login
             _LOGGER.debug("[login] Performing login")
             url, method = self._get_url("login")
-            async with self._session.request(
-                method=method, url=url,
-                headers=self._header_maker.login_header(self._cookie),
-                params= self._param_maker.login_params(self._credential)
-            ) as response:
-                response.raise_for_status()
-                login_data = await response.json()
-                self._login = Login.from_dict(login_data)
-                _LOGGER.debug("[login] login response Headers: %s", dict(response.headers))
-                _LOGGER.debug("[login] login response status: %s", response.status)
-                _LOGGER.debug("[login] login response data: %s", login_data)
-                _LOGGER.debug("[login] login result : %s", self._login)
-                _LOGGER.info("[login] login successful, wallpad_id: %s", self._login.wallpad_id)
+            endpoint = self._metrics.endpoint("login")
+            status = None
+            started = endpoint.start()
+            try:
+                async with self._session.request(
+                    method=method, url=url,
+                    headers=self._header_maker.login_header(self._cookie),
+                    params= self._param_maker.login_params(self._credential)
+                ) as response:
+                    status = response.status
+                    response.raise_for_status()
+                    login_data = json_loads(await response.read())
+                    self._login = Login.from_dict(login_data)
+                    self._logged_in_at = time.monotonic()
+                    self._login_generation += 1
+                    _LOGGER.info("[login] login successful, wallpad_id: %s", self._login.wallpad_id)
+            finally:
+                endpoint.finish(started, status)
+
+            if self._session_listener is not None:
+                self._session_listener(self.export_session())
                 
         except Exception as e:
             _LOGGER.error("[login] login failed - %s", str(e))
             raise
 
 
-    async def get_devices(self, retry_on_401=True) -> SHomeInfo:
-        """Fetch list of devices from SHome API."""
+    async def get_devices(self) -> SHomeInfo:
+        """Fetch the whole device list from SHome API, every page of it."""
         _LOGGER.info("[get_devices] fetching device list")
-        
+        self._home_info = SHomeInfo.from_pages([page async for page in self._device_pages()])
+        _LOGGER.info("[get_devices] found %d devices", len(self._home_info.devices))
+        return self._home_info
+
+    async def iter_devices(self) -> AsyncIterator[SHomeDevice]:
+        """Yield the devices of the device list as their pages arrive.
+
+        Lets callers work on the first devices while later pages are still downloading.
+        Every device is yielded once; the pages after the first may arrive out of order.
+        """
+        seen: set[str] = set()
+        async for page in self._device_pages():
+            for device in page.devices:
+                if device.id not in seen:
+                    seen.add(device.id)
+                    yield device
+
+    async def _device_pages(self) -> AsyncIterator[SHomeInfo]:
+        """Pages of the device list: the first one, then the rest concurrently once `total` is known."""
+        first_page = await self._get_device_page(0, DEVICE_PAGE_SIZE)
+        yield first_page
+
+        pagination = first_page.pagination
+        # the API may cap the page size below what was asked for
+        limit = pagination.limit or len(first_page.devices)
+        if not limit or pagination.total <= limit:
+            return
+        _LOGGER.debug("[get_devices] %d devices in pages of %d", pagination.total, limit)
+
+        semaphore = asyncio.Semaphore(DEVICE_PAGE_CONCURRENCY)
+
+        async def fetch_page(offset: int) -> SHomeInfo:
+            async with semaphore:
+                return await self._get_device_page(offset, limit)
+
+        tasks = [asyncio.ensure_future(fetch_page(offset)) for offset in range(limit, pagination.total, limit)]
         try:
-            if self._login is None:
-                await self.login()
-
-            url, method = self._get_url("list_device")
-            _LOGGER.debug("[get_devices] request URL: %s", url)
-            async with self._session.request(
-                method=method, url=url,
-                headers=self._header_maker.device_header(self._cookie, self._login),
-                params=self._param_maker.basic_params(self._login.wallpad_id)
-            ) as response:
-                response.raise_for_status()
-                data = await response.json()
-                self._home_info = SHomeInfo(
-                    pagination=Pagination.from_dict(data["pagination"]),
-                    devices=[SHomeDevice.from_dict(device) for device in data.get("deviceList", [])]
-                )
-                _LOGGER.info("[get_devices] found %d devices", len(self._home_info.devices))
-
-            return self._home_info
-            
-        except ClientResponseError as e:
-            if e.status == 401 and retry_on_401:
-                _LOGGER.warning("[get_devices] request 401 - attempting to re-login")
-                await self.login()
-                return await self.get_devices(retry_on_401=False)
-            else:
-                _LOGGER.error("[get_devices] request sent successful, but throw error.\n\tstatus: %s\n\theader: %s\n\tbody: %s", e.status, e.headers, e.message)
-                _LOGGER.debug("[get_devices] detailed stack-trace", exc_info=True)
-                raise
-        except Exception as e:
-            _LOGGER.error("[get_devices] failed to get devices - %s", e)
-            raise
-
-
-    async def _device_request(self, url_key: str, params: dict, url_params=None, retry_on_401=True) -> dict:
-        """Make a generic request to the SHome API."""
+            for next_page in asyncio.as_completed(tasks):
+                yield await next_page
+        finally:
+            # a failed page or a caller that stopped iterating leaves the other pages unneeded
+            for task in tasks:
+                task.cancel()
+
+    async def _get_device_page(self, offset: int, limit: int) -> SHomeInfo:
+        await self._ensure_login()
+        data = await self._device_request(
+            url_key="list_device",
+            params=self._param_maker.page_params(self._login.wallpad_id, offset, limit),
+            url_params={"wallpad_id": self._login.wallpad_id}
+        )
+        return SHomeInfo.from_dict(data)
+
+    async def _device_request(
+            self,
+            url_key: str,
+            params: dict,
+            url_params=None,
+            retry_on_401=True,
+            priority: Optional[RequestPriority] = None,
+    ) -> dict:
+        """Make a generic request to the SHome API.
+
+        Requests pass the circuit breaker of their endpoint family and raise `CircuitOpenError`
+        without being sent while it is open. Idempotent GETs are retried on transient failures
+        (connection errors, timeouts, 5xx, 429) with jittered exponential backoff.
+
+        `priority` orders the request in the account's scheduler; by default commands are
+        interactive and GETs are polls. A request that waits past its deadline raises
+        `RequestExpiredError` without being sent.
+        """
+        await self._ensure_login()
+        login_generation = self._login_generation
         header = self._header_maker.device_header(self._cookie, self._login)
 
         if url_params is None:
             url_params = {}
-        _LOGGER.debug("[%s] request headers: %s, params: %s, url_params: %s", url_key, header, params, url_params)
-
-        try:
-            url, method = self._get_url(url_key, **url_params)
-            _LOGGER.debug("[%s] fetched URL: [%s] %s", url_key, method, url)
-
-            async with self._session.request(method=method, url=url, headers=header, params=params) as response:
-                response.raise_for_status()
-                data = await response.json()
-                _LOGGER.debug("[%s] request success.\n\tstatus: %s\n\theader: %s\n\tbody: %s", url_key, response.status, response.headers, data)
+        # headers carry the access token and session cookies, so only the parameters are logged
+        _LOGGER.debug("[%s] request params: %s, url_params: %s", url_key, params, url_params)
+
+        url, method = self._url_maker.get_url(url_key, url_params)
+        _LOGGER.debug("[%s] fetched URL: [%s] %s", url_key, method, url)
+        family = self._url_maker.family(url_key)
+        breaker = self._breaker(family)
+        attempts = self._retry_policy.attempts if method == "GET" else 1
+        if priority is None:
+            priority = RequestPriority.POLL if method == "GET" else RequestPriority.INTERACTIVE
+        # commands and their confirmations are sent before background polls when the account is rate limited
+        interactive = priority < RequestPriority.POLL
+
+        attempt = 0
+        while True:
+            breaker.before_request()
+            attempt += 1
+            try:
+                if waited := await self._governor.acquire(family, interactive):
+                    endpoint = self._metrics.endpoint(url_key)
+                    endpoint.throttled += 1
+                    endpoint.throttled_ms += waited * 1000
+                data = await self._send_request(url_key, method, url, header, params, priority)
+                breaker.record_success()
                 return data
 
+            except ClientResponseError as e:
+                if e.status not in TRANSIENT_STATUS_CODES:
+                    # the API answered, the request itself was refused
+                    breaker.record_success()
+                    if e.status == 401 and retry_on_401:
+                        _LOGGER.warning("[%s] request 401 - attempting to re-login", url_key)
+                        break
+                    _LOGGER.error("[%s] request sent successful, but throw error.\n\tstatus: %s\n\tbody: %s", url_key, e.status, e.message)
+                    _LOGGER.debug("[%s] detailed stack-trace", url_key, exc_info=True)
+                    raise
+                breaker.record_failure()
+                if attempt >= attempts or breaker.is_open:
+                    _LOGGER.error("[%s] request failed with status %s after %d attempts", url_key, e.status, attempt)
+                    raise
+                _LOGGER.debug("[%s] status %s, retrying", url_key, e.status)
+
+            except (ClientError, asyncio.TimeoutError) as e:
+                breaker.record_failure()
+                if attempt >= attempts or breaker.is_open:
+                    _LOGGER.error("[%s] failed request after %d attempts - %s", url_key, attempt, e)
+                    raise
+                _LOGGER.debug("[%s] %s, retrying", url_key, e)
+
+            except RequestExpiredError as e:
+                # never sent, so it says nothing about the API's health
+                breaker.release_probe()
+                _LOGGER.warning("[%s] %s", url_key, e)
+                raise
 
-        except ClientResponseError as e:
-            if e.status == 401 and retry_on_401:
-                _LOGGER.warning("[%s] request 401 - attempting to re-login", url_key)
-                await self.login()
-                return await self._device_request(url_key, params, url_params, retry_on_401=False)
-            else:
-                _LOGGER.error("[%s] request sent successful, but throw error.\n\tstatus: %s\n\theader: %s\n\tbody: %s", url_key, e.status, e.headers, e.message)
-                _LOGGER.debug("[%s] detailed stack-trace", url_key, exc_info=True)
+            except Exception as e:
+                breaker.record_failure()
+                _LOGGER.error("[%s] failed request - %s", url_key, e)
                 raise
 
-        except Exception as e:
-            _LOGGER.error("[%s] failed request - %s", url_key, e)
-            raise
+            except BaseException:
+                # cancelled while throttled, queued or in flight: no verdict on the API either
+                breaker.release_probe()
+                raise
+
+            finally:
+                if method != "GET" and "device_id" in url_params:
+                    # a command changes the device: info fetched before it completed is outdated
+                    self._coalescer.invalidate(url_params["device_id"])
+
+            self._metrics.endpoint(url_key).retries += 1
+            await asyncio.sleep(self._retry_policy.delay(attempt))
+
+        # 401: log in again and retry once, outside of the failed request's timing
+        endpoint = self._metrics.endpoint(url_key)
+        endpoint.relogins += 1
+        await self._relogin(login_generation)
+        endpoint.retries += 1
+        return await self._device_request(url_key, params, url_params, retry_on_401=False, priority=priority)
+
+    async def _send_request(
+            self, url_key: str, method: str, url: str, header: dict, params: dict, priority: RequestPriority
+    ) -> dict:
+        endpoint = self._metrics.endpoint(url_key)
+        async with self._scheduler.slot(priority):
+            status = None
+            bytes_received = 0
+            started = endpoint.start()
+            try:
+                async with self._session.request(method=method, url=url, headers=header, params=params) as response:
+                    status = response.status
+                    response.raise_for_status()
+                    body = await response.read()
+                    bytes_received = len(body)
+                    # commands may answer with an empty body
+                    data = json_loads(body) if body.strip() else None
+                    _LOGGER.debug("[%s] request success.\n\tstatus: %s\n\tbody: %s", url_key, response.status, data)
+                    return data
+            finally:
+                endpoint.finish(started, status, bytes_received)
+
+    def _breaker(self, family: str) -> CircuitBreaker:
+        breaker = self._breakers.get(family)
+        if breaker is None:
+            breaker = self._breakers[family] = CircuitBreaker(family)
+        return breaker
+
+    async def get_device_payload(
+            self, url_key: str, device_id: str, priority: RequestPriority = RequestPriority.POLL
+    ) -> dict:
+        """Decoded JSON of a device info endpoint (`get_light_info`, `sensor_info`, ...), without DTOs.
+
+        Lets the coordinators build their state records straight from the response. Identical
+        concurrent calls share one request (see `RequestCoalescer`), so the payload must not
+        be modified.
+        """
+        return await self._coalescer.get(
+            url_key, device_id, priority,
+            lambda: self._device_request(
+                url_key=url_key,
+                params=self._param_maker.basic_params(device_id),
+                url_params={"device_id": device_id},
+                priority=priority
+            ),
+            self._metrics.endpoint(url_key),
+        )
 
     async def get_light_info(self, device_id: str) -> SHomeLightInfo:
         """Fetch light information from SHome API."""
-        data = await self._device_request(
-            url_key="get_light_info",
-            params=self._param_maker.basic_params(device_id),
-            url_params={"device_id": device_id}
-        )
-        return SHomeLightInfo.from_dict(data)
+        return SHomeLightInfo.from_dict(await self.get_device_payload("get_light_info", device_id))
 
     async def toggle_all_light(self, device_id: str, state: OnOffStatus):
         await self._device_request(
@@ -298,20 +568,10 @@ class SHomeClient:
         )
 
     async def get_sensor_info(self, device_id: str) -> list[SHomeSensorInfo]:
-        data = await self._device_request(
-            url_key="sensor_info",
-            params=self._param_maker.basic_params(device_id),
-            url_params={"device_id": device_id}
-        )
-        return SHomeSensorInfo.from_dict(data)
+        return SHomeSensorInfo.from_dict(await self.get_device_payload("sensor_info", device_id))
     
     async def get_ventilation_info(self, device_id: str) -> list[SHomeVentilationInfo]:
-        data = await self._device_request(
-            url_key="ventilation_info",
-            params=self._param_maker.basic_params(device_id),
-            url_params={"device_id": device_id}
-        )
-        result = SHomeVentilationInfo.from_dict(data)
+        result = SHomeVentilationInfo.from_dict(await self.get_device_payload("ventilation_info", device_id))
         _LOGGER.debug("[get_ventilation_info] fetched ventilation info for device %s: %s", device_id, result)
         return result
 
@@ -330,12 +590,7 @@ class SHomeClient:
         )
 
     async def get_aircon_info(self, device_id: str) -> list[SHomeAirconInfo]:
-        data = await self._device_request(
-            url_key="aircon_info",
-            params=self._param_maker.basic_params(device_id),
-            url_params={"device_id": device_id}
-        )
-        return SHomeAirconInfo.from_dict(data)
+        return SHomeAirconInfo.from_dict(await self.get_device_payload("aircon_info", device_id))
 
     async def toggle_aircon(self, device_id: str, sub_device_id: str, state: OnOffStatus):
         await self._device_request(
@@ -352,12 +607,7 @@ class SHomeClient:
         )
 
     async def get_heater_info(self, device_id: str) -> list[SHomeHeaterInfo]:
-        data = await self._device_request(
-            url_key="heater_info",
-            params=self._param_maker.basic_params(device_id),
-            url_params={"device_id": device_id}
-        )
-        return SHomeHeaterInfo.from_dict(data)
+        return SHomeHeaterInfo.from_dict(await self.get_device_payload("heater_info", device_id))
 
     async def toggle_heater(self, device_id: str, sub_device_id: str, state: OnOffStatus):
         await self._device_request(
@@ -1,4 +1,6 @@
 import logging
+from types import MappingProxyType
+from typing import Mapping, Optional
 
 from .const import VERSION_HEADER, OS_TYPE
 from .dto.login import Login
@@ -15,7 +17,6 @@ class SHomeHeaderMaker:
     OS_VERSION = "11"
 
     # Other headers
-    CONNECTION = "Keep-Alive"
     USER_AGENT = "okhttp/3.12.0"
     ACCEPT_LANGUAGE = "en"
     ACCEPT_ENCODING = "gzip"
@@ -23,6 +24,16 @@ class SHomeHeaderMaker:
     # Host headers
     HOST = "shome-api.samsung-ihp.com"
 
+    def __init__(self):
+        self._check_app_version_header: Mapping[str, str] = MappingProxyType({
+            **self._build_default_headers(),
+            "Authorization": "Bearer",
+        })
+        # device headers only change on re-login, so keep the last (cookie, login) generation
+        self._device_header_cookie: Optional[Cookie] = None
+        self._device_header_login: Optional[Login] = None
+        self._device_header: Optional[Mapping[str, str]] = None
+
     def _build_default_headers(self):
         return {
             "User-Agent": self.USER_AGENT,
@@ -30,16 +41,13 @@ class SHomeHeaderMaker:
             "X-DEVICE-MODEL": self.DEVICE_MODEL,
             "X-OS-TYPE": self.OS_TYPE,
             "X-OS-VERSION": self.OS_VERSION,
-            "Connection": self.CONNECTION,
             "Host": self.HOST,
             "Accept-Encoding": self.ACCEPT_ENCODING,
             "Accept-Language": self.ACCEPT_LANGUAGE,
         }
 
-    def check_app_version_header(self):
-        default_headers = self._build_default_headers()
-        default_headers["Authorization"] = "Bearer"
-        return default_headers
+    def check_app_version_header(self) -> Mapping[str, str]:
+        return self._check_app_version_header
 
     def login_header(self, cookie: Cookie):
         default_headers = self._build_default_headers()
@@ -47,9 +55,16 @@ class SHomeHeaderMaker:
         default_headers["Cookie"] = cookie.to_header_value()
         return default_headers
 
-    def device_header(self, cookie: Cookie, login: Login):
-        default_headers = self._build_default_headers()
-        default_headers["Authorization"] = f"Bearer {login.access_token}"
-        default_headers["Cookie"] = cookie.to_header_value()
-        return default_headers
+    def device_header(self, cookie: Cookie, login: Login) -> Mapping[str, str]:
+        """Return the read-only header set for this (cookie, login) generation."""
+        if (self._device_header is None
+                or cookie is not self._device_header_cookie
+                or login is not self._device_header_login):
+            default_headers = self._build_default_headers()
+            default_headers["Authorization"] = f"Bearer {login.access_token}"
+            default_headers["Cookie"] = cookie.to_header_value()
+            self._device_header = MappingProxyType(default_headers)
+            self._device_header_cookie = cookie
+            self._device_header_login = login
+        return self._device_header
 
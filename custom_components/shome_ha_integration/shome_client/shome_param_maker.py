@@ -1,11 +1,10 @@
-import hashlib
 import logging
-
-from datetime import datetime, timezone
+from typing import Optional
 
 from .const import APP_NAME, OS_TYPE, VERSION_PARAM
 from .dto.status import OnOffStatus
 from .dto.ventilation import VentilationSpeed
+from .shome_signer import SHomeSigner
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -16,13 +15,14 @@ class SHomeParamMaker:
     VERSION = VERSION_PARAM
     LANGUAGE = "ENG"
 
+    def __init__(self, signer: Optional[SHomeSigner] = None):
+        self._signer = signer or SHomeSigner()
+
     def _get_hash(self, data: list[str]) -> str:
-        data_str = "".join(data)
-        msg = f"IHRESTAPI{data_str}".encode("utf-8")
-        return hashlib.sha512(msg).hexdigest()
+        return self._signer.sign(*data)
 
     def check_app_version_params(self):
-        current_date = datetime.now(tz=timezone.utc).strftime("%Y%m%d%H%M%S")
+        current_date = self._signer.create_date()
         hash_data = self._get_hash([self.APP_NAME, self.OS_TYPE,  self.VERSION, current_date])
         return {
             "appName": self.APP_NAME,
@@ -33,7 +33,7 @@ class SHomeParamMaker:
         }
 
     def login_params(self, credential: dict):
-        current_date = datetime.now(tz=timezone.utc).strftime("%Y%m%d%H%M%S")
+        current_date = self._signer.create_date()
 
         hash_data = self._get_hash([credential['username'], credential['password'], credential['device_id'], self.LANGUAGE, current_date])
         return {
@@ -47,15 +47,22 @@ class SHomeParamMaker:
         }
 
     def basic_params(self, device_id: str):
-        current_date = datetime.now(tz=timezone.utc).strftime("%Y%m%d%H%M%S")
+        current_date = self._signer.create_date()
         hash_data = self._get_hash([device_id, current_date])
         return {
             "createDate": current_date,
             "hashData": hash_data
         }
 
+    def page_params(self, device_id: str, offset: int, limit: int):
+        return {
+            **self.basic_params(device_id),
+            "offset": offset,
+            "limit": limit
+        }
+
     def on_off_params(self, device_id: str, sub_device_id: str, state: OnOffStatus):
-        create_date = datetime.now(tz=timezone.utc).strftime("%Y%m%d%H%M%S")
+        create_date = self._signer.create_date()
         hash_data = self._get_hash([device_id, sub_device_id, state.name, create_date])
         return {
             "state": state.name,
@@ -64,7 +71,7 @@ class SHomeParamMaker:
         }
     
     def mode_params(self, device_id: str, sub_device_id: str, speed: VentilationSpeed):
-        create_date = datetime.now(tz=timezone.utc).strftime("%Y%m%d%H%M%S")
+        create_date = self._signer.create_date()
         hash_data = self._get_hash([device_id, sub_device_id, str(speed.value), create_date])
         return {
             "mode": speed.value,
@@ -73,7 +80,7 @@ class SHomeParamMaker:
         }
 
     def temperature_params(self, device_id: str, sub_device_id: str, temperature: int):
-        create_date = datetime.now(tz=timezone.utc).strftime("%Y%m%d%H%M%S")
+        create_date = self._signer.create_date()
         hash_data = self._get_hash([device_id, sub_device_id, str(temperature), create_date])
         return {
             "state": str(temperature),
@@ -0,0 +1,44 @@
+import hashlib
+import logging
+import time
+from functools import lru_cache
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class SHomeSigner:
+    """Builds the `createDate` / `hashData` pair every SHome request carries.
+
+    `hashData` is sha512("IHRESTAPI" + fields...). createDate only has one second
+    resolution, so the formatted date is cached per second and signatures are
+    memoized in a small LRU keyed by the signed fields.
+    """
+
+    HASH_PREFIX = "IHRESTAPI"
+    DATE_FORMAT = "%Y%m%d%H%M%S"
+    DEFAULT_CACHE_SIZE = 256
+
+    def __init__(self, cache_size: int = DEFAULT_CACHE_SIZE):
+        self._prefix_state = hashlib.sha512(self.HASH_PREFIX.encode("utf-8"))
+        self._date_second: int = -1
+        self._date: str = ""
+        self._cached_sign = lru_cache(maxsize=cache_size)(self._sign)
+
+    def create_date(self) -> str:
+        """UTC timestamp in SHome format, formatted at most once per second."""
+        now = int(time.time())
+        if now != self._date_second:
+            self._date = time.strftime(self.DATE_FORMAT, time.gmtime(now))
+            self._date_second = now
+        return self._date
+
+    def sign(self, *fields: str) -> str:
+        return self._cached_sign(fields)
+
+    def _sign(self, fields: tuple[str, ...]) -> str:
+        digest = self._prefix_state.copy()
+        digest.update("".join(fields).encode("utf-8"))
+        return digest.hexdigest()
+
+    def cache_info(self):
+        return self._cached_sign.cache_info()
@@ -0,0 +1,76 @@
+import logging
+from operator import itemgetter
+from string import Formatter
+from typing import Callable, Optional, Tuple
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class SHomeUrlMaker:
+
+    BASE_URL = "https://shome-api.samsung-ihp.com"
+
+    # url_type -> (path template, HTTP method)
+    ROUTES: dict[str, Tuple[str, str]] = {
+        "check_app_version": ("/v18/users/checkAppVersion", "GET"),
+        "login": ("/v18/users/login", "PUT"),
+        "list_device": ("/v16/settings/{wallpad_id}/devices/", "GET"),
+        "get_light_info": ("/v18/settings/light/{device_id}", "GET"),
+        "toggle_all_light": ("/v18/settings/light/{device_id}/0/on-off", "PUT"),
+        "toggle_single_light": ("/v18/settings/light/{device_id}/{light_id}/on-off", "PUT"),
+        "toggle_room_light": ("/v18/settings/light/{device_id}/rooms/{room_id}/on-off", "PUT"),
+        "sensor_info": ("/v18/settings/environment-sensor/{device_id}", "GET"),
+        "ventilation_info": ("/v18/settings/ventilator/{device_id}", "GET"),
+        "toggle_ventilation": ("/v18/settings/ventilator/{device_id}/{sub_device_id}/on-off", "PUT"),
+        "set_ventilation_speed": ("/v18/settings/ventilator/{device_id}/{sub_device_id}/windspeed", "PUT"),
+        "aircon_info": ("/v18/settings/aircon/{device_id}", "GET"),
+        "toggle_aircon": ("/v18/settings/aircon/{device_id}/{sub_device_id}/on-off", "PUT"),
+        "set_aircon_temp": ("/v18/settings/aircon/{device_id}/{sub_device_id}/temperature", "PUT"),
+        "heater_info": ("/v18/settings/heater/{device_id}", "GET"),
+        "toggle_heater": ("/v18/settings/heater/{device_id}/{sub_device_id}/on-off", "PUT"),
+        "set_heater_temp": ("/v18/settings/heater/{device_id}/{sub_device_id}/temperature", "PUT"),
+    }
+
+    def __init__(self, base_url: str = BASE_URL):
+        # compile every route once into a %-template plus a getter for its path parameters
+        self._routes: dict[str, Tuple[str, str, Optional[Callable[[dict], object]]]] = {
+            url_type: self._compile(f"{base_url}{path}", method)
+            for url_type, (path, method) in self.ROUTES.items()
+        }
+        self._families: dict[str, str] = {url_type: self._family(path) for url_type, (path, _) in self.ROUTES.items()}
+
+    @staticmethod
+    def _family(path: str) -> str:
+        # /v18/settings/light/{device_id} -> "light", /v16/settings/{wallpad_id}/devices/ -> "devices",
+        # /v18/users/login -> "users"
+        parts = path.strip("/").split("/")
+        if parts[1] == "settings":
+            return "devices" if parts[2].startswith("{") else parts[2]
+        return parts[1]
+
+    @staticmethod
+    def _compile(template: str, method: str) -> Tuple[str, str, Optional[Callable[[dict], object]]]:
+        literal_parts = []
+        keys = []
+        for literal, field_name, _, _ in Formatter().parse(template):
+            literal_parts.append(literal.replace("%", "%%"))
+            if field_name is not None:
+                literal_parts.append("%s")
+                keys.append(field_name)
+        return "".join(literal_parts), method, itemgetter(*keys) if keys else None
+
+    def get_url(self, url_type: str, url_params: Optional[dict] = None) -> Tuple[str, str]:
+        route = self._routes.get(url_type)
+        if route is None:
+            raise ValueError(f"Unknown URL type: {url_type}")
+        url, method, getter = route
+        if getter is not None:
+            try:
+                url = url % getter(url_params or {})
+            except KeyError as e:
+                raise ValueError(f"Missing URL parameter {e} for URL type: {url_type}") from e
+        return url, method
+
+    def family(self, url_type: str) -> str:
+        """Endpoint family of a URL type (device class or API area), e.g. for per-family circuit breaking."""
+        return self._families.get(url_type, url_type)
@@ -1,48 +1,57 @@
 import logging
+from typing import Optional
 
 from homeassistant.core import HomeAssistant
 
+from .const import POLL_REQUEST_BUDGET_PER_HOUR
+from .client_registry import ClientRegistry
+from .coordinators.poll_scheduler import PollBudget
 from .shome_client.shome_client import SHomeClient
 
-# Store for client instances (singleton pattern)
-CLIENT_INSTANCES = "shome_client_instances"
+# Store for the client registry shared by every config entry
+CLIENT_REGISTRY = "shome_client_registry"
+# Store for the polling budget of each account
+POLL_BUDGETS = "shome_poll_budgets"
 
 _LOGGER = logging.getLogger(__name__)
 
 
+def get_client_registry(hass: HomeAssistant) -> ClientRegistry:
+    """The registry of the clients of every account, created on first use."""
+    registry = hass.data.get(CLIENT_REGISTRY)
+    if registry is None:
+        registry = hass.data[CLIENT_REGISTRY] = ClientRegistry(hass)
+    return registry
+
+
 async def get_or_create_client(hass: HomeAssistant, credential: dict) -> SHomeClient:
-    """Get existing client or create new one (singleton pattern)."""
+    """Get the client of this account, creating and logging it in once if there is none."""
     if not credential or "username" not in credential:
         raise ValueError("Missing credential or username for SHome client setup")
+    return await get_client_registry(hass).get_or_create(credential)
+
+
+def get_client(hass: HomeAssistant, credential: dict) -> Optional[SHomeClient]:
+    """Return the client of this account if one was created, without logging in."""
+    registry: Optional[ClientRegistry] = hass.data.get(CLIENT_REGISTRY)
+    return registry.get(credential["username"]) if registry is not None else None
+
+
+def acquire_client(hass: HomeAssistant, credential: dict):
+    """Hold a reference to the client of this account for a config entry (or flow)."""
+    get_client_registry(hass).acquire(credential["username"])
+
+
+async def release_client(hass: HomeAssistant, credential: dict):
+    """Release a reference taken with `acquire_client`; the last one closes the client."""
+    if await get_client_registry(hass).release(credential["username"]):
+        hass.data.get(POLL_BUDGETS, {}).pop(credential["username"], None)
+
 
-    # Initialize storage if needed
-    if CLIENT_INSTANCES not in hass.data:
-        hass.data[CLIENT_INSTANCES] = {}
-
-    # Check if client exists for this username
-    existing_client = hass.data[CLIENT_INSTANCES].get(credential["username"])
-    if existing_client is not None:
-        _LOGGER.info("Returning existing SHomeClient for user: %s", credential["username"])
-        return existing_client
-
-    _LOGGER.info("Creating new SHomeClient for user: %s", credential['username'])
-    client = SHomeClient(hass)
-    client.set_credential(credential)
-    await client.login()
-
-    # Store client for reuse
-    hass.data[CLIENT_INSTANCES][credential['username']] = client
-    return client
-
-async def unload_client(hass: HomeAssistant, credential: dict):
-    """Unload SHome client for a specific credential."""
-    if CLIENT_INSTANCES not in hass.data:
-        return
-
-    if credential["username"] in hass.data[CLIENT_INSTANCES]:
-        _LOGGER.info("Unloading SHomeClient for user: %s", credential["username"])
-        hass.data[CLIENT_INSTANCES].pop(credential["username"], None)
-    else:
-        _LOGGER.warning("No SHomeClient found for user: %s", credential['username'])
-
-    return
+def get_poll_budget(hass: HomeAssistant, credential: dict) -> PollBudget:
+    """Get the polling budget shared by every coordinator of this account."""
+    budgets: dict[str, PollBudget] = hass.data.setdefault(POLL_BUDGETS, {})
+    budget = budgets.get(credential["username"])
+    if budget is None:
+        budget = budgets[credential["username"]] = PollBudget(POLL_REQUEST_BUDGET_PER_HOUR)
+    return budget
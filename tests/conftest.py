@@ -0,0 +1,2 @@
+"""Tests run against Home Assistant through pytest-homeassistant-custom-component (the `hass` fixture)."""
+pytest_plugins = "pytest_homeassistant_custom_component"
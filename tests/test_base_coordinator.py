@@ -0,0 +1,98 @@
+import asyncio
+from datetime import datetime
+from typing import AsyncIterator
+
+import pytest
+
+from custom_components.shome_ha_integration.coordinators.base_coordinator import SHomeCoordinator, device_context
+from custom_components.shome_ha_integration.coordinators.state_store import (
+    DeviceMeta,
+    DeviceState,
+    LightState,
+)
+
+DEVICE_ID = "LT00000000000001"
+CREDENTIAL = {"username": "user", "password": "hash", "device_id": "0123456789abcdef"}
+META = DeviceMeta(
+    shome_id=DEVICE_ID,
+    unique_num="1",
+    name="Lights",
+    model="light",
+    model_id="light",
+    created_at=datetime(2024, 1, 1),
+    root_device_id="root",
+    type="light",
+)
+
+
+@pytest.fixture
+async def coordinator(hass) -> AsyncIterator[SHomeCoordinator]:
+    coordinator = SHomeCoordinator(hass, CREDENTIAL, [], name="test_coordinator")
+    coordinator.store.merge_all({DEVICE_ID: DeviceState(meta=META, sub_devices={
+        "1": LightState(sub_id="1", name="living", on=False),
+        "2": LightState(sub_id="2", name="kitchen", on=False),
+    })})
+    coordinator.async_set_updated_data(coordinator.store)
+    yield coordinator
+    # drops the confirmation refresh timer
+    await coordinator.async_shutdown()
+
+
+def lights_on(coordinator: SHomeCoordinator) -> list[bool]:
+    return [coordinator.store.sub_device(DEVICE_ID, light_id).on for light_id in ("1", "2")]
+
+
+def record_updates(coordinator: SHomeCoordinator) -> list[list[bool]]:
+    """States the entity of both lights was notified with."""
+    updates = []
+    coordinator.async_add_listener(lambda: updates.append(lights_on(coordinator)), device_context(DEVICE_ID, ["1", "2"]))
+    return updates
+
+
+async def test_failed_command_is_rolled_back(coordinator):
+    updates = record_updates(coordinator)
+
+    async def send():
+        assert lights_on(coordinator) == [True, True]
+        raise RuntimeError("wallpad unreachable")
+
+    with pytest.raises(RuntimeError):
+        await coordinator.async_send_command(DEVICE_ID, ["1", "2"], send(), confirm_delay=3, on=True)
+
+    assert lights_on(coordinator) == [False, False]
+    assert updates == [[True, True], [False, False]]
+    assert coordinator.optimistic_stats["pending"] == 0
+
+
+async def test_cancelled_command_is_rolled_back(coordinator, hass):
+    updates = record_updates(coordinator)
+    sending = asyncio.Event()
+
+    async def send():
+        sending.set()
+        await asyncio.sleep(3600)
+
+    task = hass.async_create_task(
+        coordinator.async_send_command(DEVICE_ID, ["1"], send(), confirm_delay=3, on=True)
+    )
+    await sending.wait()
+    assert lights_on(coordinator) == [True, False]
+
+    task.cancel()
+    await asyncio.wait([task], timeout=1)
+    assert task.cancelled()
+    assert lights_on(coordinator) == [False, False]
+    assert updates == [[True, False], [False, False]]
+
+
+async def test_sent_command_keeps_values_and_schedules_confirmation(coordinator):
+    updates = record_updates(coordinator)
+
+    async def send():
+        pass
+
+    await coordinator.async_send_command(DEVICE_ID, ["1"], send(), confirm_delay=3, on=True)
+
+    assert lights_on(coordinator) == [True, False]
+    assert updates == [[True, False]]
+    assert coordinator.optimistic_stats["pending"] == 1
@@ -0,0 +1,58 @@
+import asyncio
+
+from custom_components.shome_ha_integration.coordinators.command_queue import DeviceCommandQueue
+
+KEY = ("TH00000000000001", "1")
+
+
+async def test_burst_sends_in_flight_value_and_latest_value(hass):
+    queue = DeviceCommandQueue(hass, "test")
+    sent = []
+    release = asyncio.Event()
+
+    sending = asyncio.Event()
+
+    async def send(value):
+        sent.append(value)
+        sending.set()
+        await release.wait()
+
+    callers = [hass.async_create_task(queue.submit(KEY, "temperature", 20, send))]
+    await sending.wait()
+    # slider moves while the first value is being sent
+    callers += [hass.async_create_task(queue.submit(KEY, "temperature", value, send)) for value in (21, 22, 23)]
+    await asyncio.sleep(0)
+    release.set()
+    await asyncio.gather(*callers)
+    assert sent == [20, 23]
+
+
+async def test_failure_is_raised_to_every_caller_of_the_command(hass):
+    queue = DeviceCommandQueue(hass, "test")
+
+    async def send(value):
+        raise RuntimeError("wallpad unreachable")
+
+    results = await asyncio.gather(
+        queue.submit(KEY, "on", True, send), queue.submit(KEY, "on", False, send), return_exceptions=True
+    )
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+async def test_cancel_while_sending_resolves_every_caller(hass):
+    queue = DeviceCommandQueue(hass, "test")
+    sending = asyncio.Event()
+
+    async def send(value):
+        sending.set()
+        await asyncio.sleep(3600)
+
+    in_flight = hass.async_create_task(queue.submit(KEY, "on", True, send))
+    await sending.wait()
+    queued = hass.async_create_task(queue.submit(KEY, "temperature", 22, send))
+    await asyncio.sleep(0)
+
+    queue.cancel()
+    done, pending = await asyncio.wait([in_flight, queued], timeout=1)
+    assert not pending
+    assert in_flight.cancelled() and queued.cancelled()
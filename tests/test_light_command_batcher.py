@@ -0,0 +1,54 @@
+import asyncio
+
+from custom_components.shome_ha_integration.coordinators.light_command_batcher import (
+    LightCommandBatcher,
+    LightCommandPlan,
+    plan_light_commands,
+)
+
+GROUPS = {"living": ["1", "2"], "bedroom": ["3", "4"]}
+
+
+def test_all_call_when_every_light_changes():
+    current = {"1": False, "2": False, "3": False, "4": False}
+    plan = plan_light_commands(current, GROUPS, {"1": True, "2": True, "3": True, "4": True})
+    assert plan == LightCommandPlan(all_on=True)
+
+
+def test_room_call_keeps_unrequested_lights():
+    current = {"1": False, "2": False, "3": False, "4": True}
+    plan = plan_light_commands(current, GROUPS, {"1": True, "2": True})
+    assert plan == LightCommandPlan(rooms=[("living", True)])
+
+
+def test_unknown_panel_falls_back_to_single_toggles():
+    # the device is not in the store yet: nothing is known about the lights that were not requested
+    plan = plan_light_commands({}, {}, {"1": True, "2": True})
+    assert plan.all_on is None
+    assert sorted(plan.singles) == [("1", True), ("2", True)]
+
+
+def test_light_missing_from_state_disables_all_and_room_calls():
+    current = {"1": False, "3": False, "4": False}
+    plan = plan_light_commands(current, GROUPS, {"1": True, "2": True, "3": True, "4": True})
+    assert plan.all_on is None
+    # the living room has a light without a known state, the bedroom is complete
+    assert plan.rooms == [("bedroom", True)]
+    assert sorted(plan.singles) == [("1", True), ("2", True)]
+
+
+async def test_cancel_while_executing_settles_submitters(hass):
+    executing = asyncio.Event()
+
+    async def execute(device_id: str, plan: LightCommandPlan):
+        executing.set()
+        await asyncio.sleep(3600)
+
+    batcher = LightCommandBatcher(hass, "test", lambda device_id: ({"1": False}, {}), execute, window=0)
+    caller = hass.async_create_task(batcher.submit("LT00000000000001", "1", True))
+    await executing.wait()
+
+    batcher.cancel()
+    done, pending = await asyncio.wait([caller], timeout=1)
+    assert not pending
+    assert caller.cancelled()
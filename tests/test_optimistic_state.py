@@ -0,0 +1,161 @@
+from datetime import datetime
+
+from custom_components.shome_ha_integration.coordinators.optimistic_state import OptimisticState
+from custom_components.shome_ha_integration.coordinators.state_store import (
+    ClimateState,
+    DeviceMeta,
+    DeviceState,
+    LightState,
+    StateStore,
+)
+
+DEVICE_ID = "LT00000000000001"
+META = DeviceMeta(
+    shome_id=DEVICE_ID,
+    unique_num="1",
+    name="Lights",
+    model="light",
+    model_id="light",
+    created_at=datetime(2024, 1, 1),
+    root_device_id="root",
+    type="light",
+)
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def polled(**lights: bool) -> dict[str, DeviceState]:
+    return {DEVICE_ID: DeviceState(meta=META, sub_devices={
+        light_id: LightState(sub_id=light_id, name=light_id, on=on) for light_id, on in lights.items()
+    })}
+
+
+def make_store(**lights: bool) -> StateStore:
+    store = StateStore()
+    store.merge_all(polled(**lights))
+    return store
+
+
+def is_on(store: StateStore, light_id: str) -> bool:
+    return store.sub_device(DEVICE_ID, light_id).on
+
+
+def test_expect_sets_records_at_once():
+    store = make_store(a=False, b=True)
+    optimistic = OptimisticState(timeout=15, clock=FakeClock())
+
+    command = optimistic.expect(store, DEVICE_ID, ["a", "b"], {"on": True})
+
+    assert is_on(store, "a") and is_on(store, "b")
+    assert command.changed == {"a"}
+    # planning still sees what the wallpad has
+    assert optimistic.known_value(DEVICE_ID, "a", "on", True) is False
+
+
+def test_expect_on_unknown_device_is_a_no_op():
+    optimistic = OptimisticState(timeout=15, clock=FakeClock())
+    command = optimistic.expect(StateStore(), DEVICE_ID, ["a"], {"on": True})
+    assert not command.keys and not command.changed
+
+
+def test_rollback_restores_last_known_value():
+    store = make_store(a=False)
+    optimistic = OptimisticState(timeout=15, clock=FakeClock())
+    command = optimistic.expect(store, DEVICE_ID, ["a"], {"on": True})
+
+    assert optimistic.rollback(store, command) == {"a"}
+    assert not is_on(store, "a")
+    assert optimistic.as_dict()["pending"] == 0
+    assert optimistic.as_dict()["rolled_back"] == 1
+
+
+def test_rollback_keeps_newer_command():
+    store = make_store(a=False, b=False)
+    optimistic = OptimisticState(timeout=15, clock=FakeClock())
+    first = optimistic.expect(store, DEVICE_ID, ["a"], {"on": True})
+    optimistic.expect(store, DEVICE_ID, ["b"], {"on": True})
+    optimistic.expect(store, DEVICE_ID, ["a"], {"on": True})
+
+    # the field belongs to the newer command now; it decides what is shown
+    assert optimistic.rollback(store, first) == set()
+    assert is_on(store, "a")
+
+
+def test_rollback_after_delivered_command_restores_delivered_value():
+    store = make_store(a=False)
+    optimistic = OptimisticState(timeout=15, clock=FakeClock())
+    optimistic.sent(optimistic.expect(store, DEVICE_ID, ["a"], {"on": True}))
+    failed = optimistic.expect(store, DEVICE_ID, ["a"], {"on": False})
+
+    optimistic.rollback(store, failed)
+    assert is_on(store, "a")
+
+
+def test_stale_poll_is_overridden_until_confirmed():
+    store = make_store(a=False)
+    clock = FakeClock()
+    optimistic = OptimisticState(timeout=15, clock=clock)
+    optimistic.sent(optimistic.expect(store, DEVICE_ID, ["a"], {"on": True}))
+
+    clock.now = 3
+    stale = polled(a=False)
+    assert optimistic.overlay(stale) == {DEVICE_ID: {"a"}}
+    assert stale[DEVICE_ID].sub_devices["a"].on is True
+    assert optimistic.next_expiry(DEVICE_ID) == 12
+
+    clock.now = 6
+    fresh = polled(a=True)
+    assert optimistic.overlay(fresh) == {}
+    assert optimistic.next_expiry(DEVICE_ID) is None
+    stats = optimistic.as_dict()
+    assert (stats["suppressed"], stats["confirmed"], stats["pending"]) == (1, 1, 0)
+
+
+def test_expired_expectation_lets_the_poll_win():
+    store = make_store(a=False)
+    clock = FakeClock()
+    optimistic = OptimisticState(timeout=15, clock=clock)
+    optimistic.sent(optimistic.expect(store, DEVICE_ID, ["a"], {"on": True}))
+
+    clock.now = 15
+    fresh = polled(a=False)
+    assert optimistic.overlay(fresh) == {}
+    assert fresh[DEVICE_ID].sub_devices["a"].on is False
+    assert optimistic.as_dict()["expired"] == 1
+
+
+def test_timeout_restarts_when_the_command_is_sent():
+    store = make_store(a=False)
+    clock = FakeClock()
+    optimistic = OptimisticState(timeout=15, clock=clock)
+    command = optimistic.expect(store, DEVICE_ID, ["a"], {"on": True})
+
+    # the command waited in the queues for a while before it went out
+    clock.now = 10
+    optimistic.sent(command)
+    clock.now = 20
+    stale = polled(a=False)
+    assert optimistic.overlay(stale) == {DEVICE_ID: {"a"}}
+
+
+def test_poll_before_delivery_updates_known_value():
+    store = StateStore()
+    store.merge_all({DEVICE_ID: DeviceState(meta=META, sub_devices={
+        "1": ClimateState(sub_id="1", name="room", on=True, target_temperature=20),
+    })})
+    optimistic = OptimisticState(timeout=15, clock=FakeClock())
+    command = optimistic.expect(store, DEVICE_ID, ["1"], {"target_temperature": 24})
+
+    # changed at the wallpad while the command was still queued
+    optimistic.overlay({DEVICE_ID: DeviceState(meta=META, sub_devices={
+        "1": ClimateState(sub_id="1", name="room", on=True, target_temperature=22),
+    })})
+    optimistic.rollback(store, command)
+    assert store.sub_device(DEVICE_ID, "1").target_temperature == 22